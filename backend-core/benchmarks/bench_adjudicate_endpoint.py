@@ -0,0 +1,189 @@
+"""
+Prueba de carga de POST /adjudicate con tamaños mezclados: muchas sesiones
+pequeñas y, de vez en cuando, una enorme.
+
+Compara, en el mismo proceso (httpx.ASGITransport, sin red):
+- "sync": el handler anterior (def síncrono: FastAPI lo ejecuta en su pool de
+  hilos, que comparte el GIL con el bucle de eventos);
+- "offload": el router de src/adjudicator/api.py (pequeñas en línea,
+  grandes en el pool de procesos con control de admisión).
+
+Las peticiones llegan como un proceso de Poisson de --rate por segundo
+durante --duration segundos (carga abierta: no se espera a la respuesta
+anterior para lanzar la siguiente). Informa p50/p99 de latencia por tamaño
+y cuántas se rechazaron con 429.
+
+Con --url se lanza la misma carga contra un servidor ya arrancado
+(uvicorn main:app desde src/).
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_adjudicate_endpoint
+    python -m benchmarks.bench_adjudicate_endpoint --large 300000 --large-ratio 0.02 --rate 50
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from src.adjudicator.api import create_router
+from src.adjudicator.engine import adjudicate_session
+from src.adjudicator.models import AdjudicationInput
+from src.adjudicator.offload import AdjudicationOffloader
+
+
+def make_body(session_id: str, participants: int) -> bytes:
+    return json.dumps({
+        "session_id": session_id,
+        "product_id": "bench-product",
+        "group_id": "bench-group",
+        "public_seed": "beacon",
+        "participants": [
+            {"participant_id": f"user-{i:07d}", "ticket_number": participants - i}
+            for i in range(participants)
+        ],
+    }).encode()
+
+
+def sync_app() -> FastAPI:
+    """
+    El endpoint tal como estaba: valida con el modelo y adjudica en el hilo
+    de la petición.
+    """
+    app = FastAPI()
+
+    @app.post("/adjudicate")
+    def adjudicate(input_data: AdjudicationInput):
+        try:
+            return adjudicate_session(input_data)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return app
+
+
+def offload_app(offloader: AdjudicationOffloader) -> FastAPI:
+    app = FastAPI()
+    app.include_router(create_router(offloader))
+    return app
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    bodies: Dict[str, bytes],
+    rate: float,
+    duration: float,
+    large_ratio: float,
+    seed: int = 0,
+) -> dict:
+    rng = random.Random(seed)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Counter = Counter()
+
+    async def one(kind: str):
+        start = time.perf_counter()
+        response = await client.post(
+            "/adjudicate", content=bodies[kind], headers={"Content-Type": "application/json"}
+        )
+        statuses[(kind, response.status_code)] += 1
+        if response.status_code == 200:
+            latencies[kind].append(time.perf_counter() - start)
+
+    tasks = []
+    begin = time.perf_counter()
+    next_at = 0.0
+    while True:
+        next_at += rng.expovariate(rate)
+        if next_at > duration:
+            break
+        delay = begin + next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        kind = "large" if rng.random() < large_ratio else "small"
+        tasks.append(asyncio.create_task(one(kind)))
+    await asyncio.gather(*tasks)
+
+    return {
+        "elapsed": time.perf_counter() - begin,
+        "statuses": statuses,
+        "latency": {
+            kind: (len(values), _percentile(values, 50), _percentile(values, 99))
+            for kind, values in latencies.items()
+        },
+    }
+
+
+def _print_report(name: str, report: dict):
+    print(f"{name}: {report['elapsed']:.1f} s")
+    for kind in ("small", "large"):
+        if kind in report["latency"]:
+            n, p50, p99 = report["latency"][kind]
+            print(f"  {kind:<6} ok {n:5d}  p50 {p50 * 1000:8.1f} ms  p99 {p99 * 1000:8.1f} ms")
+    errors = {f"{kind} {status}": n for (kind, status), n in report["statuses"].items() if status != 200}
+    if errors:
+        print(f"  errores: {errors}")
+
+
+async def _run(args, bodies: Dict[str, bytes], url: Optional[str]):
+    load = dict(rate=args.rate, duration=args.duration, large_ratio=args.large_ratio, seed=args.seed)
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=None) as client:
+            _print_report(url, await run_load(client, bodies, **load))
+        return
+
+    transport = httpx.ASGITransport(app=sync_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        _print_report("sync", await run_load(client, bodies, **load))
+
+    offloader = AdjudicationOffloader(
+        max_workers=args.workers, max_in_flight=args.max_in_flight, max_queue=args.max_queue
+    )
+    offloader.start()
+    try:
+        transport = httpx.ASGITransport(app=offload_app(offloader))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            _print_report("offload", await run_load(client, bodies, **load))
+        print(f"  en línea {offloader.inline}, al pool {offloader.offloaded}, rechazadas {offloader.rejected}")
+    finally:
+        offloader.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--small", type=int, default=50, help="participantes de una sesión pequeña")
+    parser.add_argument("--large", type=int, default=200_000, help="participantes de una sesión grande")
+    parser.add_argument("--large-ratio", type=float, default=0.02)
+    parser.add_argument("--rate", type=float, default=40.0, help="peticiones por segundo")
+    parser.add_argument("--duration", type=float, default=10.0, help="segundos de carga")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    parser.add_argument("--max-queue", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", default=None, help="servidor ya arrancado (si no, en proceso)")
+    args = parser.parse_args()
+
+    bodies = {"small": make_body("bench-small", args.small), "large": make_body("bench-large", args.large)}
+    print(
+        f"{args.rate:g} peticiones/s durante {args.duration:g} s; "
+        f"{args.large_ratio:.0%} de {args.large} participantes "
+        f"({len(bodies['large']) / 2**20:.1f} MiB), el resto de {args.small}"
+    )
+    asyncio.run(_run(args, bodies, args.url))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Throughput de adjudicación por lotes: bucle por sesión vs adjudicate_many.
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_adjudicate_many
+    python -m benchmarks.bench_adjudicate_many --workers 8 --sessions 2000,200,4
+
+Para cada tamaño de sesión (10, 1k y 100k participantes) mide sesiones/seg con:
+- el bucle actual (una llamada a adjudicate_session por sesión)
+- adjudicate_many (pool de procesos para lotes grandes)
+y comprueba que ambos producen resultados idénticos.
+"""
+
+import argparse
+import time
+
+from engine import AdjudicationEngine
+from benchmarks.synthetic import make_inputs
+
+PARTICIPANT_SIZES = (10, 1_000, 100_000)
+DEFAULT_SESSION_COUNTS = (2_000, 200, 40)
+
+
+def run(session_counts, workers):
+    engine = AdjudicationEngine()
+    print(f"{'participantes':>13} {'sesiones':>8} {'bucle ses/s':>12} {'lote ses/s':>11} {'speedup':>8}")
+
+    for participants, sessions in zip(PARTICIPANT_SIZES, session_counts):
+        inputs = make_inputs(sessions, participants)
+
+        start = time.perf_counter()
+        serial = [engine.adjudicate_session(i) for i in inputs]
+        serial_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = list(engine.adjudicate_many(inputs, max_workers=workers, parallel_threshold=2))
+        batch_elapsed = time.perf_counter() - start
+
+        if [r.model_dump_json() for r in serial] != [r.model_dump_json() for r in batched]:
+            raise AssertionError("adjudicate_many no coincide con el bucle por sesión")
+
+        print(
+            f"{participants:>13} {sessions:>8} {sessions / serial_elapsed:>12.1f} "
+            f"{sessions / batch_elapsed:>11.1f} {serial_elapsed / batch_elapsed:>7.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=None, help="procesos del pool (por defecto: CPUs)")
+    parser.add_argument(
+        "--sessions",
+        default=",".join(str(n) for n in DEFAULT_SESSION_COUNTS),
+        help="sesiones por tamaño, separadas por comas (10, 1k, 100k participantes)",
+    )
+    args = parser.parse_args()
+    run([int(n) for n in args.sessions.split(",")], args.workers)
+
+
+if __name__ == "__main__":
+    main()
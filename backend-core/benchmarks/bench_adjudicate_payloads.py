@@ -0,0 +1,147 @@
+"""
+Coste de parseo, adjudicación y serialización de POST /adjudicate por
+formato de entrada, para sesiones grandes.
+
+Rutas comparadas (una petición cada vez, en proceso con httpx.ASGITransport
+y sin pool de procesos, para medir solo el trabajo de la petición):
+- "antes": el handler anterior (AdjudicationInput como parámetro de FastAPI:
+  json.loads + validación de cada Participant; respuesta con
+  jsonable_encoder + json.dumps);
+- "json": /adjudicate actual (bytes → modelo y modelo → bytes con
+  pydantic-core, sin dicts intermedios);
+- "columnar": /adjudicate/columnar (ColumnarAdjudicationInput: tres listas
+  de escalares y ParticipantRow en lugar de un modelo por participante).
+
+Además, por separado, el desglose de la ruta columnar frente a la de
+objetos (parseo, construcción de participantes, adjudicación,
+serialización) y trusted_input para llamantes internos con las columnas ya
+en memoria.
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_adjudicate_payloads
+    python -m benchmarks.bench_adjudicate_payloads --participants 10000 100000 300000 --algorithm 1.0-closing-seed
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Callable, List
+
+import httpx
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.bench_adjudicate_endpoint import offload_app, sync_app
+from src.adjudicator.engine import adjudicate_session
+from src.adjudicator.models import AdjudicationInput, ColumnarAdjudicationInput, trusted_input
+from src.adjudicator.offload import AdjudicationOffloader
+
+
+def make_columns(participants: int) -> dict:
+    return {
+        "participant_ids": [f"user-{i:07d}" for i in range(participants)],
+        "ticket_numbers": list(range(participants, 0, -1)),
+        "join_timestamps": [f"2025-01-01T10:{(i // 60) % 60:02d}:{i % 60:02d}Z" for i in range(participants)],
+    }
+
+
+def make_fields(algorithm: str) -> dict:
+    return {
+        "session_id": "bench-session",
+        "product_id": "bench-product",
+        "group_id": "bench-group",
+        "public_seed": "beacon",
+        "closing_timestamp": "2025-01-02T00:00:00+00:00",
+        "algorithm_version": algorithm,
+    }
+
+
+def row_body(fields: dict, columns: dict) -> bytes:
+    participants = [
+        {"participant_id": pid, "ticket_number": ticket, "join_timestamp": ts}
+        for pid, ticket, ts in zip(columns["participant_ids"], columns["ticket_numbers"], columns["join_timestamps"])
+    ]
+    return json.dumps({**fields, "participants": participants}).encode()
+
+
+def columnar_body(fields: dict, columns: dict) -> bytes:
+    return json.dumps({**fields, **columns}).encode()
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+async def _requests(bodies: dict, repeat: int) -> dict:
+    # Sin pool: todo en línea, para medir el trabajo de la petición.
+    offloader = AdjudicationOffloader(inline_max_bytes=2**62)
+    routes = [
+        ("antes", sync_app(), "/adjudicate", bodies["rows"]),
+        ("json", offload_app(offloader), "/adjudicate", bodies["rows"]),
+        ("columnar", offload_app(offloader), "/adjudicate/columnar", bodies["columnar"]),
+    ]
+    timings, winners = {}, set()
+    for name, app, path, body in routes:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                response = await client.post(path, content=body, headers={"Content-Type": "application/json"})
+                best = min(best, time.perf_counter() - start)
+                response.raise_for_status()
+            timings[name] = best * 1000
+            winners.add((response.json()["winner_participant_id"], response.json()["result_hash"]))
+    # Las tres rutas tienen que dar exactamente el mismo resultado.
+    assert len(winners) == 1, winners
+    return timings
+
+
+def run(participants: int, algorithm: str, repeat: int) -> None:
+    fields, columns = make_fields(algorithm), make_columns(participants)
+    bodies = {"rows": row_body(fields, columns), "columnar": columnar_body(fields, columns)}
+    print(
+        f"{participants} participantes, algoritmo {algorithm}: JSON por filas "
+        f"{len(bodies['rows']) / 2**20:.1f} MiB, columnar {len(bodies['columnar']) / 2**20:.1f} MiB"
+    )
+
+    timings = asyncio.run(_requests(bodies, repeat))
+    print("  petición completa: " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in timings.items()))
+
+    rows_input = AdjudicationInput.model_validate_json(bodies["rows"])
+    columnar = ColumnarAdjudicationInput.model_validate_json(bodies["columnar"])
+    columnar_input = columnar.to_input()
+    result = adjudicate_session(rows_input)
+    stages: List[tuple] = [
+        ("parseo filas (validate_json)", lambda: AdjudicationInput.model_validate_json(bodies["rows"])),
+        ("parseo filas (json.loads + modelo)", lambda: AdjudicationInput(**json.loads(bodies["rows"]))),
+        ("parseo columnar (validate_json)", lambda: ColumnarAdjudicationInput.model_validate_json(bodies["columnar"])),
+        ("columnas → ParticipantRow", columnar.to_input),
+        ("trusted_input (columnas en memoria)", lambda: trusted_input(**columns, **fields)),
+        ("adjudicar (modelos Participant)", lambda: adjudicate_session(rows_input)),
+        ("adjudicar (ParticipantRow)", lambda: adjudicate_session(columnar_input)),
+        ("serializar (model_dump_json)", result.model_dump_json),
+        ("serializar (jsonable_encoder + json.dumps)", lambda: json.dumps(jsonable_encoder(result))),
+    ]
+    for label, fn in stages:
+        print(f"  {label:<44}{best_of(repeat, fn):9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--algorithm", default="1.0-public-seed", help="1.0-closing-seed lleva traza O(N) en la respuesta")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for n in args.participants:
+        run(n, args.algorithm, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Rendimiento por versión del algoritmo y por motor (worker vs API).
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_algorithms
+    python -m benchmarks.bench_algorithms --participants 1000,100000 --repeat 5
+
+Para cada versión registrada en src/adjudicator/registry.py mide la latencia
+de una adjudicación (trace_level="none") a través de:
+- engine.AdjudicationEngine (worker)
+- src/adjudicator/engine.adjudicate_session (API)
+- la implementación registrada directamente (sin construir modelos)
+y comprueba que los tres caminos dan el mismo result_hash.
+"""
+
+import argparse
+import timeit
+
+from engine import AdjudicationEngine
+from benchmarks.synthetic import make_participants
+from models.adjudication import AdjudicationInput
+from src.adjudicator import engine as api_engine
+from src.adjudicator import models as api_models
+from src.adjudicator.registry import ALGORITHMS, get_algorithm
+
+
+def _inputs(version, participants):
+    worker_input = AdjudicationInput(
+        session_id="bench-algorithms",
+        product_id="bench-product",
+        group_id="bench-group",
+        algorithm_version=version,
+        closing_timestamp="2025-01-02T00:00:00+00:00",
+        public_seed="bench-public-seed",
+        participants=participants,
+    )
+    api_input = api_models.AdjudicationInput(
+        **worker_input.model_dump(exclude={"participants"}),
+        participants=[api_models.Participant(**p.model_dump()) for p in participants],
+    )
+    return worker_input, api_input
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", default="1000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = AdjudicationEngine(trace_level="none")
+    print(f"{'versión':<18} {'participantes':>13} {'worker ms':>10} {'api ms':>8} {'registro ms':>12}")
+    for count in (int(n) for n in args.participants.split(",")):
+        participants = make_participants(count)
+        for version in sorted(ALGORITHMS):
+            worker_input, api_input = _inputs(version, participants)
+            algorithm = get_algorithm(version)
+
+            hashes = {
+                engine.adjudicate_session(worker_input).result_hash,
+                api_engine.adjudicate_session(api_input, trace_level="none").result_hash,
+                algorithm.adjudicate(worker_input).result_hash,
+            }
+            if len(hashes) != 1:
+                raise AssertionError(f"result_hash distinto entre caminos para la versión {version}")
+
+            timings = [
+                min(timeit.repeat(fn, number=1, repeat=args.repeat)) * 1000
+                for fn in (
+                    lambda: engine.adjudicate_session(worker_input),
+                    lambda: api_engine.adjudicate_session(api_input, trace_level="none"),
+                    lambda: algorithm.adjudicate(worker_input),
+                )
+            ]
+            print(f"{version:<18} {count:>13} {timings[0]:>10.2f} {timings[1]:>8.2f} {timings[2]:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
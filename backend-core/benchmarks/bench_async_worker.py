@@ -0,0 +1,112 @@
+"""
+Duración de un tick del worker: versión síncrona (run_tick sobre
+DatabaseService) vs asíncrona (run_tick_async sobre AsyncDatabaseService),
+ambas con el cliente postgrest-py real contra un PostgREST falso local
+(benchmarks/fake_postgrest_server.py) con --latency-ms por petición.
+
+La adjudicación se sustituye por una espera de --adjudication-ms (el motor
+real hace sus propias consultas), que en el worker síncrono se paga en serie
+por cada sesión llena y en el asíncrono en paralelo, hasta --concurrency.
+Se comprueba que ambas versiones dejan las mismas sesiones en cada estado.
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_async_worker
+    python -m benchmarks.bench_async_worker --sessions 5000 --latency-ms 10 --adjudication-ms 50
+"""
+
+import argparse
+import asyncio
+import time
+from collections import Counter
+
+from postgrest import AsyncPostgrestClient, SyncPostgrestClient
+
+from services.async_database import AsyncDatabaseService
+from services.async_session_pool_service import AsyncSessionPoolService
+from services.async_session_service import AsyncSessionService
+from services.database import DatabaseService
+from services.session_pool_service import SessionPoolService
+from services.session_service import SessionService
+from session_worker import run_tick, run_tick_async
+from benchmarks.fake_postgrest_server import FakePostgrestServer
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_session_tables
+
+
+class _SlowAdjudication:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.adjudicated = set()
+
+    def adjudicate(self, session_id: str):
+        time.sleep(self.seconds)
+        self.adjudicated.add(session_id)
+
+
+def _statuses(client: FakeSupabaseClient) -> Counter:
+    return Counter(row["status"] for row in client.tables["sessions"])
+
+
+def _run_sync(tables, args):
+    client = FakeSupabaseClient(tables)
+    adjudication = _SlowAdjudication(args.adjudication_ms / 1000)
+    with FakePostgrestServer(client, latency_ms=args.latency_ms) as url:
+        db = DatabaseService(client=SyncPostgrestClient(url))
+        pool = SessionPoolService(db=db)
+        service = SessionService(db=db, adjudication_service=adjudication, pool=pool)
+        start = time.perf_counter()
+        run_tick(service, pool)
+        elapsed = time.perf_counter() - start
+    return elapsed, client, adjudication
+
+
+async def _run_async(tables, args):
+    client = FakeSupabaseClient(tables)
+    adjudication = _SlowAdjudication(args.adjudication_ms / 1000)
+    with FakePostgrestServer(client, latency_ms=args.latency_ms) as url:
+        postgrest = AsyncPostgrestClient(url)
+        db = AsyncDatabaseService(postgrest, max_in_flight=args.max_in_flight)
+        pool = AsyncSessionPoolService(db=db)
+        service = AsyncSessionService(
+            db=db, adjudication_service=adjudication, pool=pool, max_concurrent_adjudications=args.concurrency
+        )
+        timings = await run_tick_async(service, pool)
+        await postgrest.aclose()
+    return timings, client, adjudication
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--full-ratio", type=float, default=0.05)
+    parser.add_argument("--expired-ratio", type=float, default=0.1)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="latencia por petición del PostgREST falso")
+    parser.add_argument("--adjudication-ms", type=float, default=20.0, help="duración simulada de cada adjudicación")
+    parser.add_argument("--concurrency", type=int, default=8, help="adjudicaciones simultáneas (asíncrono)")
+    parser.add_argument("--max-in-flight", type=int, default=16, help="peticiones simultáneas (asíncrono)")
+    args = parser.parse_args()
+
+    tables = make_session_tables(args.sessions, full_ratio=args.full_ratio, expired_ratio=args.expired_ratio)
+    print(
+        f"{args.sessions} sesiones abiertas, latencia {args.latency_ms} ms/petición, "
+        f"adjudicación {args.adjudication_ms} ms"
+    )
+
+    sync_elapsed, sync_client, sync_adjudication = _run_sync(tables, args)
+    print(f"  síncrono:  {sync_elapsed * 1000:8.1f} ms/tick  ({sync_client.round_trips} consultas)")
+
+    timings, async_client, async_adjudication = asyncio.run(_run_async(tables, args))
+    phases = ", ".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in timings.items() if phase != "total")
+    print(
+        f"  asíncrono: {timings['total'] * 1000:8.1f} ms/tick  ({async_client.round_trips} consultas; {phases})"
+    )
+    print(f"  mejora: x{sync_elapsed / timings['total']:.1f}")
+
+    assert _statuses(sync_client) == _statuses(async_client), (_statuses(sync_client), _statuses(async_client))
+    assert sync_adjudication.adjudicated == async_adjudication.adjudicated
+    print(f"  mismo resultado: {dict(_statuses(async_client))}, {len(async_adjudication.adjudicated)} adjudicadas")
+
+
+if __name__ == "__main__":
+    main()
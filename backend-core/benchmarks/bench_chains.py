@@ -0,0 +1,81 @@
+"""
+Coste por tick del encadenado de sesiones (process_chains_for_adjudicated_sessions):
+la ruta anterior (todas las sesiones adjudicadas del histórico y, por cada
+una, todas las sesiones y plantillas de su cadena) vs el índice de cadenas
+en memoria + la marca chain_advanced.
+
+Se ejecuta contra el cliente en memoria de benchmarks/fake_supabase.py, que
+cuenta consultas y filas transferidas. Se miden dos ticks: el primero
+incluye la carga inicial del índice; el segundo es el régimen estable.
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_chains
+    python -m benchmarks.bench_chains --chains 2000 --length 10 --new 20
+"""
+
+import argparse
+import time
+
+from services.database import DatabaseService
+from services.session_pool_service import SessionPoolService
+from services.session_service import SessionService
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_chain_tables
+
+
+def _legacy_tick(service: SessionService):
+    """
+    Ruta anterior: todas las sesiones 'adjudicated' y, para cada una, todas
+    las sesiones de su cadena y todas las plantillas de su chain_group_id.
+    """
+    db = service.db
+    for session in db.fetch_by_field("sessions", "status", "adjudicated").data or []:
+        chain_group_id = session.get("chain_group_id")
+        chain_index = session.get("chain_index")
+        if not chain_group_id or chain_index is None:
+            continue
+        existing = db.fetch_by_field("sessions", "chain_group_id", chain_group_id).data or []
+        if any(s.get("chain_index") == chain_index + 1 for s in existing):
+            continue
+        templates = db.fetch_by_field("sessions_pool", "chain_group_id", chain_group_id).data or []
+        pool_row = next((r for r in templates if r.get("chain_index") == chain_index + 1), None)
+        if pool_row:
+            service.pool._create_session_from_pool(pool_row, auto_generated=True)
+
+
+def _measure(client, tick, service):
+    client.reset_counters()
+    start = time.perf_counter()
+    tick(service)
+    return client.round_trips, client.rows_transferred, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chains", type=int, default=2000)
+    parser.add_argument("--length", type=int, default=10)
+    parser.add_argument("--new", type=int, default=20, help="adjudicaciones nuevas desde el último tick")
+    args = parser.parse_args()
+
+    tables = make_chain_tables(args.chains, args.length, args.new)
+    created = {}
+    print(f"{args.chains} cadenas x {args.length} eslabones, {args.new} adjudicaciones nuevas")
+    print(f"{'ruta':<8} {'tick':>4} {'consultas':>9} {'filas':>8} {'ms en memoria':>14}")
+    for label, tick in (("anterior", _legacy_tick), ("índice", SessionService.process_chains_for_adjudicated_sessions)):
+        client = FakeSupabaseClient(tables)
+        db = DatabaseService(client=client)
+        service = SessionService(db=db, adjudication_service=object(), pool=SessionPoolService(db=db))
+        before = {s["id"] for s in client.tables["sessions"]}
+        for tick_number in (1, 2):
+            queries, rows, elapsed = _measure(client, tick, service)
+            print(f"{label:<8} {tick_number:>4} {queries:>9} {rows:>8} {elapsed * 1000:>14.1f}")
+        created[label] = sorted(s["pool_id"] for s in client.tables["sessions"] if s["id"] not in before)
+
+    if created["anterior"] != created["índice"]:
+        raise AssertionError("las dos rutas no crean las mismas sesiones sucesoras")
+    print(f"sucesoras creadas: {len(created['índice'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Carga de una página del dashboard de sesiones activas con un sessions
+grande: descargar la tabla y filtrar en Python, y luego descargar los
+participantes de cada sesión mostrada (ruta anterior), frente a filtros,
+orden y paginación resueltos en base de datos
+(DatabaseService.fetch_filtered), solo las columnas que se pintan y la
+ocupación de toda la página en un conteo agrupado.
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_dashboard_queries
+    python -m benchmarks.bench_dashboard_queries --sessions 500000 --latency-ms 2
+
+Con --latency-ms se suma esa latencia por consulta y un coste de red por
+fila transferida (--ms-per-1k-rows), para aproximar lo que ve el operador
+contra Supabase. El cliente falso recorre la tabla en Python, así que el
+tiempo de la ruta nueva es una cota alta: la base de datos usa los índices
+de sql/007_dashboard_queries.sql.
+"""
+
+import argparse
+import time
+from collections import Counter
+
+from benchmarks.fake_supabase import FakeSupabaseClient
+from services.database import DatabaseService
+
+# Como en dashboard/views/active_sessions.py (que importa streamlit).
+PAGE_SIZE = 50
+SESSION_COLUMNS = (
+    "id,product_id,operator_code,chain_group_id,chain_index,status,ou_status,settlement_status,"
+    "max_participants,amount,created_at,expiry_timestamp,closing_timestamp"
+)
+
+STATUSES = ("open", "complete", "adjudicated", "expired", "closed")
+OPERATORS = ("ES", "PT", "FR")
+
+
+def make_sessions(count: int):
+    return [
+        {
+            "id": f"session-{i:08d}",
+            "product_id": f"product-{i % 50}",
+            "operator_code": OPERATORS[i % 3],
+            "chain_group_id": f"X{i % 1000}",
+            "chain_index": i % 5 + 1,
+            "status": STATUSES[i % len(STATUSES)],
+            "ou_status": None,
+            "settlement_status": None,
+            "max_participants": 10,
+            "amount": 25.0,
+            "created_at": f"2025-01-01T00:00:00.{i:08d}",
+            "expiry_timestamp": "2025-01-06T00:00:00+00:00",
+            "closing_timestamp": None,
+            "is_auto_generated": True,
+            "pool_id": f"pool-{i:08d}",
+            "chain_advanced": False,
+        }
+        for i in range(count)
+    ]
+
+
+def make_participants(sessions, per_session: int):
+    return [
+        {"id": f"{s['id']}-p{j}", "session_id": s["id"], "ticket_number": j + 1}
+        for s in sessions
+        for j in range(per_session)
+    ]
+
+
+def page_in_python(db: DatabaseService, operator: str, status: str):
+    rows = db.fetch_all("sessions").data
+    filtered = [r for r in rows if r["operator_code"] == operator and r["status"] == status]
+    totals = Counter(r["status"] for r in rows)
+    page = filtered[:PAGE_SIZE]
+    occupancy = {r["id"]: len(db.fetch_by_field("participants", "session_id", r["id"]).data) for r in page}
+    return page, totals["open"], occupancy
+
+
+def page_in_database(db: DatabaseService, operator: str, status: str):
+    result = db.fetch_filtered(
+        "sessions",
+        [("eq", "operator_code", operator), ("eq", "status", status)],
+        columns=SESSION_COLUMNS,
+        order=("-created_at",),
+        limit=PAGE_SIZE,
+        count=True,
+    )
+    totals = db.count_by_field_many("sessions", "status", ["open", "adjudicated", "expired"])
+    occupancy = db.count_by_field_many("participants", "session_id", [r["id"] for r in result.data])
+    return result.data, totals["open"], occupancy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=500_000)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--ms-per-1k-rows", type=float, default=5.0)
+    parser.add_argument("--participants", type=int, default=8, help="participantes por sesión")
+    args = parser.parse_args()
+
+    sessions = make_sessions(args.sessions)
+    # Solo las sesiones que salen en la página tienen participantes (basta
+    # para medir): las primeras en Python (sin orden), las más recientes en base.
+    matching = [s for s in sessions if s["operator_code"] == "ES" and s["status"] == "open"]
+    shown = matching[:PAGE_SIZE] + matching[-PAGE_SIZE:]
+    client = FakeSupabaseClient({"sessions": sessions, "participants": make_participants(shown, args.participants)})
+    db = DatabaseService(client=client)
+
+    print(f"{args.sessions} sesiones, página de {PAGE_SIZE}, filtro operador=ES estado=open")
+    print(f"{'ruta':<12} {'consultas':>10} {'filas':>10} {'tiempo ms':>10} {'estimado ms':>12}")
+    for name, fn in (("python", page_in_python), ("en base", page_in_database)):
+        client.reset_counters()
+        start = time.perf_counter()
+        page, total_open, occupancy = fn(db, "ES", "open")
+        elapsed = (time.perf_counter() - start) * 1000
+        network = client.round_trips * args.latency_ms + client.rows_transferred / 1000 * args.ms_per_1k_rows
+        print(
+            f"{name:<12} {client.round_trips:>10} {client.rows_transferred:>10} "
+            f"{elapsed:>10.0f} {elapsed + network:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Latencia por operación de los dos backends de DatabaseService contra la
+misma base de datos: PostgREST (API REST de Supabase) vs conexión directa a
+Postgres (services/postgres_database.py).
+
+Solo lectura sobre sessions/participants, más una carga COPY vs INSERT fila
+a fila en una tabla temporal (solo backend Postgres, dentro de una
+transacción que se deshace).
+
+Requiere SUPABASE_URL, SUPABASE_KEY y DATABASE_URL apuntando al mismo
+proyecto, y psycopg[binary,pool].
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_db_backends
+    python -m benchmarks.bench_db_backends --repeat 50
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import time
+
+from services.database import DatabaseService
+from services.postgres_database import PostgresDatabaseService
+
+
+def _median_ms(fn, repeat: int) -> float:
+    fn()  # calentamiento (conexión, caché de tipos)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _operations(db, session_ids):
+    sid = session_ids[0]
+    return {
+        "fetch_by_id": lambda: db.fetch_by_id("sessions", sid),
+        "fetch_filtered (open, 2 cols)": lambda: db.fetch_filtered(
+            "sessions", [("eq", "status", "open")], columns="id,max_participants"
+        ),
+        "count_by_field": lambda: db.count_by_field("participants", "session_id", sid),
+        f"count_by_field_many ({len(session_ids)})": lambda: db.count_by_field_many(
+            "participants", "session_id", session_ids
+        ),
+        f"fetch_in ({len(session_ids)})": lambda: db.fetch_in("sessions", "id", session_ids, columns="id,status"),
+    }
+
+
+def _copy_vs_insert(db: PostgresDatabaseService, rows: int):
+    data = [{"n": i, "label": f"row-{i}"} for i in range(rows)]
+    with db.transaction():
+        db._execute("create temp table bench_load (n int, label text) on commit drop")
+        start = time.perf_counter()
+        for row in data:
+            db.insert("bench_load", row)
+        inserts = time.perf_counter() - start
+        start = time.perf_counter()
+        db.copy_rows("bench_load", data)
+        copy = time.perf_counter() - start
+    return inserts, copy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=200, help="ids para las operaciones en bloque")
+    parser.add_argument("--load-rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    rest = DatabaseService()
+    direct = PostgresDatabaseService(os.environ["DATABASE_URL"])
+    rows = direct.iter_rows("sessions", columns="id", page_size=args.sessions)
+    session_ids = [row["id"] for row in itertools.islice(rows, args.sessions)]
+    rows.close()
+    if not session_ids:
+        raise SystemExit("No hay sesiones en la base de datos.")
+
+    print(f"mediana de {args.repeat} repeticiones (ms)")
+    print(f"  {'operación':36s} {'PostgREST':>10s} {'Postgres':>10s}")
+    rest_ops, direct_ops = _operations(rest, session_ids), _operations(direct, session_ids)
+    for name in rest_ops:
+        print(f"  {name:36s} {_median_ms(rest_ops[name], args.repeat):10.2f} {_median_ms(direct_ops[name], args.repeat):10.2f}")
+
+    inserts, copy = _copy_vs_insert(direct, args.load_rows)
+    print(f"  carga de {args.load_rows} filas: INSERT fila a fila {inserts * 1000:.0f} ms, COPY {copy * 1000:.0f} ms")
+    direct.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Coste por tick de decidir qué sesiones han caducado: parsear el
+expiry_timestamp ISO de todas las sesiones abiertas en cada tick (ruta
+anterior de SessionService._is_expired) vs sacar solo las vencidas de un
+DeadlineScheduler cargado una vez.
+
+Las caducidades se reparten en --horizon-hours; cada tick avanza el reloj
+--tick-seconds, así que en cada tick vence solo una pequeña parte.
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_deadlines
+    python -m benchmarks.bench_deadlines --sessions 100000 --ticks 200
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from services.deadline_scheduler import DeadlineScheduler
+
+
+def _legacy_expired(rows, now_dt):
+    expired = []
+    for row in rows:
+        expiry_ts = row.get("expiry_timestamp")
+        if not expiry_ts:
+            continue
+        if now_dt > datetime.fromisoformat(expiry_ts.replace("Z", "+00:00")):
+            expired.append(row["id"])
+    return expired
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--horizon-hours", type=float, default=24.0)
+    parser.add_argument("--tick-seconds", type=float, default=5.0)
+    parser.add_argument("--ticks", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    start_dt = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    horizon = args.horizon_hours * 3600
+    rows = [
+        {"id": f"session-{i:07d}", "expiry_timestamp": (start_dt + timedelta(seconds=rng.uniform(0, horizon))).isoformat()}
+        for i in range(args.sessions)
+    ]
+
+    scheduler = DeadlineScheduler()
+    t0 = time.perf_counter()
+    for row in rows:
+        scheduler.schedule(row["id"], row["expiry_timestamp"])
+    load = time.perf_counter() - t0
+
+    legacy_total = scheduler_total = 0.0
+    due_total = 0
+    open_rows = rows
+    for tick in range(1, args.ticks + 1):
+        now_dt = start_dt + timedelta(seconds=tick * args.tick_seconds)
+
+        t0 = time.perf_counter()
+        legacy = _legacy_expired(open_rows, now_dt)
+        legacy_total += time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        due = scheduler.pop_due(now_dt.timestamp())
+        scheduler_total += time.perf_counter() - t0
+
+        if sorted(due) != sorted(legacy):
+            raise AssertionError(f"tick {tick}: sesiones caducadas distintas")
+        due_total += len(due)
+        expired = set(due)
+        open_rows = [r for r in open_rows if r["id"] not in expired]
+
+    print(f"{args.sessions} sesiones abiertas, {args.ticks} ticks, {due_total / args.ticks:.1f} caducadas/tick")
+    print(f"carga inicial del planificador : {load * 1000:>9.1f} ms (una vez)")
+    print(f"parseo de todas por tick       : {legacy_total / args.ticks * 1000:>9.3f} ms/tick")
+    print(f"DeadlineScheduler.pop_due      : {scheduler_total / args.ticks * 1000:>9.3f} ms/tick "
+          f"({legacy_total / max(scheduler_total, 1e-9):.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Latencia de adjudicación y carga en reposo: worker en modo poll (tick
+completo cada --poll-interval segundos) vs modo eventos (EventDrivenWorker
+sobre un LocalChangeFeed).
+
+Un hilo productor va dando de alta participantes en sesiones abiertas; se
+mide el tiempo desde el alta que llena una sesión hasta su adjudicación, y
+las consultas que hace cada worker durante --idle segundos sin cambios.
+
+Se ejecuta contra el cliente en memoria de benchmarks/fake_supabase.py, que
+publica cada INSERT/UPDATE en el feed como harían los triggers de
+sql/004_change_notifications.sql.
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_event_worker
+    python -m benchmarks.bench_event_worker --poll-interval 5 --sessions 200
+"""
+
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from services.change_feed import LocalChangeFeed
+from services.database import DatabaseService
+from services.event_worker import EventDrivenWorker
+from services.session_pool_service import SessionPoolService
+from services.session_service import SessionService
+from session_worker import run_tick
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_session_tables
+
+
+class _TimedAdjudication:
+    def __init__(self):
+        self.adjudicated_at = {}
+
+    def adjudicate(self, session_id: str):
+        self.adjudicated_at[session_id] = time.perf_counter()
+
+
+def _produce(db, sessions, max_participants, duration, filled_at, seed=0):
+    """
+    Da de alta, repartidos en `duration` segundos, los participantes que
+    faltan para llenar todas las sesiones.
+    """
+    rng = random.Random(seed)
+    pending = [s["id"] for s in sessions for _ in range(max_participants)]
+    rng.shuffle(pending)
+    joined = dict.fromkeys((s["id"] for s in sessions), 0)
+    delay = duration / max(1, len(pending))
+    for session_id in pending:
+        time.sleep(delay)
+        db.insert("participants", {"session_id": session_id, "ticket_number": joined[session_id] + 1})
+        joined[session_id] += 1
+        if joined[session_id] == max_participants:
+            filled_at[session_id] = time.perf_counter()
+
+
+def _run(mode, args):
+    feed = LocalChangeFeed()
+    tables = make_session_tables(args.sessions, args.max_participants, full_ratio=0, expired_ratio=0)
+    tables["participants"] = []
+    client = FakeSupabaseClient(tables, listener=feed.publish)
+    db = DatabaseService(client=client)
+    adjudication = _TimedAdjudication()
+    pool = SessionPoolService(db=db)
+    service = SessionService(db=db, adjudication_service=adjudication, pool=pool)
+    worker = EventDrivenWorker(service, pool, feed, resync_interval_seconds=3600)
+
+    filled_at = {}
+    stop = threading.Event()
+
+    def work():
+        while not stop.is_set():
+            if mode == "poll":
+                run_tick(service, pool)
+                stop.wait(args.poll_interval)
+            else:
+                worker.run_once()
+
+    producer = threading.Thread(
+        target=_produce,
+        args=(db, tables["sessions"], args.max_participants, args.duration, filled_at),
+    )
+    consumer = threading.Thread(target=work)
+    consumer.start()
+    producer.start()
+    producer.join()
+
+    # Espera a que se adjudiquen todas las sesiones llenas.
+    deadline = time.perf_counter() + args.poll_interval * 2 + 5
+    while len(adjudication.adjudicated_at) < len(filled_at) and time.perf_counter() < deadline:
+        time.sleep(0.01)
+
+    # Carga en reposo: consultas durante --idle segundos sin cambios.
+    client.reset_counters()
+    time.sleep(args.idle)
+    idle_queries = client.round_trips
+
+    stop.set()
+    feed.publish("bench", "STOP", {})  # despierta al worker en modo eventos
+    consumer.join()
+
+    latencies = [(adjudication.adjudicated_at[s] - filled_at[s]) * 1000 for s in filled_at if s in adjudication.adjudicated_at]
+    return latencies, len(filled_at), idle_queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--max-participants", type=int, default=5)
+    parser.add_argument("--duration", type=float, default=3.0, help="segundos en los que se llenan las sesiones")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--idle", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{args.sessions} sesiones x {args.max_participants} participantes, poll cada {args.poll_interval} s")
+    print(f"{'modo':<8} {'adjudicadas':>11} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'consultas en reposo':>20}")
+    for mode in ("poll", "events"):
+        latencies, filled, idle_queries = _run(mode, args)
+        if len(latencies) != filled:
+            raise AssertionError(f"{mode}: {filled - len(latencies)} sesiones llenas sin adjudicar")
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else latencies[0]
+        print(
+            f"{mode:<8} {len(latencies):>11} {statistics.median(latencies):>9.1f} "
+            f"{p95:>9.1f} {max(latencies):>9.1f} {idle_queries:>20}"
+        )
+
+
+if __name__ == "__main__":
+    main()
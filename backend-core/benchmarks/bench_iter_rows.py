@@ -0,0 +1,89 @@
+"""
+Memoria del recorrido de una tabla grande: una sola consulta select("*")
+(el fetch_all anterior) frente a DatabaseService.iter_rows (paginación por
+clave y solo las columnas que se usan).
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_iter_rows
+    python -m benchmarks.bench_iter_rows --rows 1000000 --page-size 1000
+
+Cada ruta cuenta las sesiones por estado (lo que hacen los KPIs del
+dashboard). El pico de memoria se mide con tracemalloc y excluye la propia
+tabla en memoria del cliente falso; con iter_rows debe quedarse plano al
+crecer --rows. Los tiempos son los del cliente falso (con tracemalloc
+activo), no los de la red.
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections import Counter
+
+from benchmarks.fake_supabase import FakeSupabaseClient
+from services.database import DatabaseService
+
+STATUSES = ("open", "complete", "adjudicated", "expired")
+
+
+def make_sessions(count: int):
+    # Filas anchas, como las de sessions: la vista solo usa unas pocas columnas.
+    return [
+        {
+            "id": f"session-{i:08d}",
+            "status": STATUSES[i % len(STATUSES)],
+            "operator_code": ("ES", "PT", "FR")[i % 3],
+            "product_id": f"product-{i % 50}",
+            "max_participants": 10,
+            "amount": 25.0,
+            "notes": "x" * 200,
+        }
+        for i in range(count)
+    ]
+
+
+def single_select(db: DatabaseService):
+    rows = db.client.table("sessions").select("*").execute().data
+    return Counter(r["status"] for r in rows)
+
+
+def paginated(db: DatabaseService, page_size: int):
+    return Counter(r["status"] for r in db.iter_rows("sessions", columns="status", page_size=page_size))
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    client = FakeSupabaseClient({"sessions": make_sessions(args.rows)})
+    db = DatabaseService(client=client)
+    client.ordered("sessions", "id")  # el "índice" de la clave primaria, fuera de la medida
+
+    print(f"{args.rows} sesiones, páginas de {args.page_size}")
+    print(f"{'ruta':<22} {'tiempo ms':>10} {'pico MiB':>10} {'consultas':>10}")
+    results = []
+    for name, fn in (
+        ("select(*) completo", lambda: single_select(db)),
+        ("iter_rows proyectado", lambda: paginated(db, args.page_size)),
+    ):
+        client.reset_counters()
+        value, elapsed, peak = _measure(fn)
+        results.append(value)
+        print(f"{name:<22} {elapsed * 1000:>10.1f} {peak / 2**20:>10.2f} {client.round_trips:>10}")
+    assert results[0] == results[1], "las dos rutas deben contar lo mismo"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Benchmark de extremo a extremo del ciclo de vida de las sesiones: parque de
+cadenas → activación → llegada de participantes → cierre → adjudicación
+(motor real) → siguiente eslabón, con ticks del worker (session_worker.run_tick)
+sobre el cliente en memoria (benchmarks/fake_supabase.py). Sin red ni
+credenciales: corre igual en CI.
+
+- N operadores x M cadenas de chain_length eslabones (plantillas de
+  seed_sessions_pool.chain_rows), con el primer eslabón ya vencido.
+- Los participantes llegan como un proceso de Poisson de --arrival-rate por
+  segundo (tiempo simulado) a sesiones abiertas al azar.
+- Entre ticks pasan --tick-seconds simulados; el tick se ejecuta de verdad y
+  su duración real se suma al reloj simulado.
+
+Informa:
+- latencia llenado → adjudicación (p50/p99, segundos simulados): espera hasta
+  el siguiente tick más lo que tarda el tick en llegar a esa sesión;
+- duración real de cada tick (p50/p99);
+- consultas por tick del worker, sin contar las de la adjudicación (deben
+  depender de lo que cambia en el tick, no del tamaño del parque), y
+  consultas por adjudicación;
+- pico de memoria del proceso (RSS).
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_lifecycle
+    python -m benchmarks.bench_lifecycle --operators 10 --chains 200 --arrival-rate 2000 --ticks 120
+"""
+
+import argparse
+import random
+import resource
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from benchmarks.fake_supabase import FakeSupabaseClient
+from seed_sessions_pool import PRODUCTS, chain_rows
+from services.adjudication_service import AdjudicationService
+from services.database import DatabaseService
+from services.session_service import SessionService
+from session_worker import run_tick
+
+
+def make_park(operators: int, chains: int, chain_length: int, max_participants: int) -> List[dict]:
+    """
+    Plantillas de operators x chains cadenas, con el primer eslabón vencido
+    hace un minuto (se activa en el primer tick).
+    """
+    start = datetime.now(timezone.utc) - timedelta(minutes=1)
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    pool = []
+    for o in range(operators):
+        operator_code = f"OP{o:03d}"
+        for c in range(chains):
+            product = dict(PRODUCTS[c % len(PRODUCTS)], max_participants=max_participants)
+            group = f"{product['chain_group_id']}-{c:05d}"
+            for row in chain_rows(product, operator_code, group, start, chain_length):
+                pool.append({
+                    **row,
+                    "id": f"pool-{row['template_key']}",
+                    "created_at": (created + timedelta(microseconds=len(pool))).isoformat(),
+                })
+    return pool
+
+
+class _TimedAdjudication:
+    """
+    AdjudicationService real que anota en qué instante (simulado) termina
+    cada adjudicación y cuántas consultas le cuesta.
+    """
+
+    def __init__(self, service: AdjudicationService, client: FakeSupabaseClient):
+        self.service = service
+        self.client = client
+        self.tick_sim_start = 0.0
+        self.tick_wall_start = 0.0
+        self.adjudicated_at: Dict[str, float] = {}
+        self.round_trips = 0
+
+    def adjudicate(self, session_id: str):
+        before = self.client.round_trips
+        self.service.adjudicate(session_id)
+        self.round_trips += self.client.round_trips - before
+        self.adjudicated_at[session_id] = self.tick_sim_start + time.perf_counter() - self.tick_wall_start
+
+
+class LoadGenerator:
+    """
+    Llegada de participantes: en cada intervalo, tiempos de llegada de un
+    proceso de Poisson, cada uno a una sesión abierta y con plazas al azar.
+    Anota el instante en que cada sesión se llena.
+    """
+
+    def __init__(self, client: FakeSupabaseClient, arrival_rate: float, seed: int = 0):
+        self.client = client
+        self.arrival_rate = arrival_rate
+        self.rng = random.Random(seed)
+        self.joined: Counter = Counter()
+        self.filled_at: Dict[str, float] = {}
+        self.arrivals = 0
+        self.turned_away = 0
+        self._clock = 0.0
+
+    def advance(self, until: float):
+        # Las sesiones se leen directamente de la tabla: no cuentan como consultas.
+        open_sessions = {
+            s["id"]: s["max_participants"]
+            for s in self.client.tables["sessions"]
+            if s["status"] == "open" and self.joined[s["id"]] < s["max_participants"]
+        }
+        candidates = list(open_sessions)
+        participants = []
+        while True:
+            self._clock += self.rng.expovariate(self.arrival_rate)
+            if self._clock > until:
+                self._clock = until
+                break
+            self.arrivals += 1
+            if not candidates:
+                self.turned_away += 1
+                continue
+            position = self.rng.randrange(len(candidates))
+            session_id = candidates[position]
+            self.joined[session_id] += 1
+            participants.append({
+                "session_id": session_id,
+                "ticket_number": self.joined[session_id],
+            })
+            if self.joined[session_id] == open_sessions[session_id]:
+                self.filled_at[session_id] = self._clock
+                candidates[position] = candidates[-1]
+                candidates.pop()
+        if participants:
+            self.client.table("participants").insert(participants).execute()
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def _peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss va en KiB en Linux y en bytes en macOS.
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def simulate(
+    operators: int = 3,
+    chains: int = 20,
+    chain_length: int = 5,
+    max_participants: int = 10,
+    arrival_rate: float = 50.0,
+    tick_seconds: float = 5.0,
+    ticks: int = 60,
+    seed: int = 0,
+) -> dict:
+    client = FakeSupabaseClient({"sessions_pool": make_park(operators, chains, chain_length, max_participants)})
+    db = DatabaseService(client=client)
+    adjudication = _TimedAdjudication(AdjudicationService(db=db), client)
+    session_service = SessionService(db=db, adjudication_service=adjudication)
+    generator = LoadGenerator(client, arrival_rate, seed)
+
+    tick_wall: List[float] = []
+    worker_calls: List[int] = []
+    calls_by_kind: Counter = Counter()
+    for tick in range(ticks):
+        sim_now = tick * tick_seconds
+        generator.advance(sim_now)
+
+        before, before_adjudication = client.round_trips, adjudication.round_trips
+        calls_before = Counter(client.calls)
+        adjudication.tick_sim_start = sim_now
+        adjudication.tick_wall_start = time.perf_counter()
+        run_tick(session_service, session_service.pool)
+        tick_wall.append(time.perf_counter() - adjudication.tick_wall_start)
+        worker_calls.append(client.round_trips - before - (adjudication.round_trips - before_adjudication))
+        calls_by_kind.update(Counter(client.calls) - calls_before)
+
+    latencies = [
+        adjudication.adjudicated_at[session_id] - filled_at
+        for session_id, filled_at in generator.filled_at.items()
+        if session_id in adjudication.adjudicated_at
+    ]
+    statuses = Counter(s["status"] for s in client.tables["sessions"])
+    return {
+        "sessions": len(client.tables["sessions"]),
+        "statuses": dict(statuses),
+        "arrivals": generator.arrivals,
+        "turned_away": generator.turned_away,
+        "filled": len(generator.filled_at),
+        "adjudicated": len(adjudication.adjudicated_at),
+        "pending": sorted(set(generator.filled_at) - set(adjudication.adjudicated_at)),
+        "latency_p50": _percentile(latencies, 50),
+        "latency_p99": _percentile(latencies, 99),
+        "tick_ms_p50": _percentile(tick_wall, 50) * 1000,
+        "tick_ms_p99": _percentile(tick_wall, 99) * 1000,
+        "worker_calls_per_tick": sum(worker_calls) / len(worker_calls),
+        "worker_calls_max": max(worker_calls),
+        "calls_per_adjudication": adjudication.round_trips / max(1, len(adjudication.adjudicated_at)),
+        "calls_by_kind": calls_by_kind,
+        "peak_rss_mib": _peak_rss_mib(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--operators", type=int, default=3)
+    parser.add_argument("--chains", type=int, default=50, help="cadenas por operador")
+    parser.add_argument("--chain-length", type=int, default=5)
+    parser.add_argument("--max-participants", type=int, default=10)
+    parser.add_argument("--arrival-rate", type=float, default=20.0, help="participantes por segundo simulado")
+    parser.add_argument("--tick-seconds", type=float, default=5.0)
+    parser.add_argument("--ticks", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = simulate(
+        args.operators, args.chains, args.chain_length, args.max_participants,
+        args.arrival_rate, args.tick_seconds, args.ticks, args.seed,
+    )
+    print(
+        f"{args.operators} operadores x {args.chains} cadenas de {args.chain_length}, "
+        f"{args.arrival_rate:g} participantes/s, tick cada {args.tick_seconds:g} s, {args.ticks} ticks"
+    )
+    print(f"  sesiones: {report['sessions']} {report['statuses']}")
+    print(
+        f"  participantes: {report['arrivals']} ({report['turned_away']} sin sesión con plazas); "
+        f"llenas {report['filled']}, adjudicadas {report['adjudicated']}"
+    )
+    print(
+        f"  llenado → adjudicación: p50 {report['latency_p50']:.2f} s, p99 {report['latency_p99']:.2f} s"
+    )
+    print(f"  tick: p50 {report['tick_ms_p50']:.1f} ms, p99 {report['tick_ms_p99']:.1f} ms")
+    print(
+        f"  consultas del worker por tick: media {report['worker_calls_per_tick']:.1f}, "
+        f"máx {report['worker_calls_max']}; por adjudicación: {report['calls_per_adjudication']:.1f}"
+    )
+    top = ", ".join(f"{action} {table}: {n}" for (action, table), n in report["calls_by_kind"].most_common(6))
+    print(f"  consultas por tipo: {top}")
+    print(f"  pico de memoria (RSS): {report['peak_rss_mib']:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
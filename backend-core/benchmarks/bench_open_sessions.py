@@ -0,0 +1,94 @@
+"""
+Consultas por tick de SessionService.process_open_sessions: un COUNT y un
+UPDATE por sesión (ruta anterior) vs un conteo agrupado y UPDATEs en bloque.
+
+Se ejecuta contra el cliente en memoria de benchmarks/fake_supabase.py, que
+cuenta cada execute() como un viaje de ida y vuelta a la base de datos. El
+tiempo estimado del tick suma a lo medido en memoria --rtt-ms por consulta
+(latencia de red + commit de cada sentencia).
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_open_sessions
+    python -m benchmarks.bench_open_sessions --sessions 5000 --no-rpc
+    # caducidad masiva (p. ej. a medianoche):
+    python -m benchmarks.bench_open_sessions --sessions 10000 --expired-ratio 1
+"""
+
+import argparse
+import time
+
+from services.database import DatabaseService
+from services.session_service import SessionService
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_session_tables
+
+
+class _RecordingAdjudication:
+    def __init__(self):
+        self.adjudicated = []
+
+    def adjudicate(self, session_id: str):
+        self.adjudicated.append(session_id)
+
+
+def _per_session_tick(service: SessionService):
+    """
+    Ruta anterior: _is_session_full sin conteo previo → un COUNT por sesión,
+    y un UPDATE por cada sesión que caduca o se cierra.
+    """
+    for session in service.db.fetch_by_field("sessions", "status", "open").data or []:
+        if service._is_expired(session):
+            service._expire_session(session)
+            continue
+        if service._is_session_full(session):
+            service._close_session(session)
+            service.adjudication_service.adjudicate(session["id"])
+
+
+def _run(tables, tick, use_rpc: bool):
+    client = FakeSupabaseClient(tables, functions=None if use_rpc else {})
+    adjudication = _RecordingAdjudication()
+    service = SessionService(db=DatabaseService(client=client), adjudication_service=adjudication, pool=object())
+    start = time.perf_counter()
+    tick(service)
+    elapsed = time.perf_counter() - start
+    statuses = sorted((s["id"], s["status"]) for s in client.tables["sessions"])
+    return client, elapsed, statuses, adjudication.adjudicated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--max-participants", type=int, default=10)
+    parser.add_argument("--full-ratio", type=float, default=0.1)
+    parser.add_argument("--expired-ratio", type=float, default=0.1)
+    parser.add_argument("--rtt-ms", type=float, default=2.0, help="coste estimado por consulta")
+    parser.add_argument("--no-rpc", action="store_true", help="simula que count_rows_grouped no está instalada")
+    args = parser.parse_args()
+
+    tables = make_session_tables(args.sessions, args.max_participants, args.full_ratio, args.expired_ratio)
+
+    old_client, old_time, old_statuses, old_adjudicated = _run(tables, _per_session_tick, not args.no_rpc)
+    new_client, new_time, new_statuses, new_adjudicated = _run(
+        tables, SessionService.process_open_sessions, not args.no_rpc
+    )
+
+    if old_statuses != new_statuses or old_adjudicated != new_adjudicated:
+        raise AssertionError("las dos rutas no producen las mismas transiciones")
+
+    print(f"{args.sessions} sesiones abiertas, {len(tables['participants'])} participantes")
+    for label, client, elapsed in (
+        ("por sesión", old_client, old_time),
+        ("en bloque ", new_client, new_time),
+    ):
+        estimated = elapsed + client.round_trips * args.rtt_ms / 1000
+        print(
+            f"{label}: {client.round_trips:>6} consultas/tick, "
+            f"{elapsed * 1000:>8.1f} ms en memoria, ~{estimated:>7.2f} s estimados"
+        )
+    print(f"  desglose en bloque: {dict(new_client.calls)}")
+
+
+if __name__ == "__main__":
+    main()
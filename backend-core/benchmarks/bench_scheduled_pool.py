@@ -0,0 +1,78 @@
+"""
+Escalado de SessionPoolService._fetch_scheduled_pool_entries con el tamaño
+del parque: la ruta anterior (todas las plantillas 'scheduled' y un
+fetch_by_field por cada plantilla vencida) vs el anti-join en una consulta
+(y su respaldo con pool_id IN (...)).
+
+Se ejecuta contra el cliente en memoria de benchmarks/fake_supabase.py, que
+cuenta consultas y filas transferidas por tick.
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_scheduled_pool
+    python -m benchmarks.bench_scheduled_pool --sizes 1000 10000 100000 --pending 50
+"""
+
+import argparse
+import time
+from datetime import datetime, timezone
+
+from services.database import DatabaseService
+from services.session_pool_service import SessionPoolService
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_pool_tables
+
+
+def _per_template_fetch(service: SessionPoolService):
+    """
+    Ruta anterior: todas las plantillas 'scheduled' y una consulta por cada
+    plantilla vencida para ver si ya tiene sesión.
+    """
+    entries = service.db.fetch_by_field("sessions_pool", "type", "scheduled").data or []
+    now_utc = datetime.now(timezone.utc)
+    eligible = []
+    for row in entries:
+        start_ts = row.get("start_timestamp")
+        if not start_ts:
+            continue
+        if datetime.fromisoformat(start_ts.replace("Z", "+00:00")) <= now_utc:
+            if not service.db.fetch_by_field("sessions", "pool_id", row["id"]).data:
+                eligible.append(row)
+    return eligible
+
+
+def _run(tables, fetch, relations=None):
+    client = FakeSupabaseClient(tables, relations=relations)
+    service = SessionPoolService(db=DatabaseService(client=client))
+    start = time.perf_counter()
+    rows = fetch(service)
+    elapsed = time.perf_counter() - start
+    return sorted(r["id"] for r in rows), client, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--pending", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'plantillas':>10} {'ruta':<14} {'consultas':>9} {'filas':>8} {'ms en memoria':>14}")
+    for size in args.sizes:
+        tables = make_pool_tables(size, pending=args.pending)
+        runs = [
+            ("por plantilla", *_run(tables, _per_template_fetch)),
+            ("anti-join", *_run(tables, SessionPoolService._fetch_scheduled_pool_entries)),
+            ("pool_id IN", *_run(tables, SessionPoolService._fetch_scheduled_pool_entries, relations={})),
+        ]
+        expected = runs[0][1]
+        for label, ids, client, elapsed in runs:
+            if ids != expected:
+                raise AssertionError(f"{label}: plantillas elegibles distintas")
+            print(
+                f"{size:>10} {label:<14} {client.round_trips:>9} "
+                f"{client.rows_transferred:>8} {elapsed * 1000:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
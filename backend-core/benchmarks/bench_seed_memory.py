@@ -0,0 +1,67 @@
+"""
+Memoria y latencia del cálculo de la semilla numérica a gran escala.
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_seed_memory
+    python -m benchmarks.bench_seed_memory --participants 1000000
+
+Compara, sobre una lista ya ordenada de IDs:
+- concatenado: "".join(ids) → build_base_seed → normalize_seed_to_int
+  (ruta anterior: tres copias completas de la semilla base)
+- streaming: stream_seed_to_int (hash incremental por bloques)
+y comprueba que el numeric_seed es idéntico. El pico de memoria se mide con
+tracemalloc y excluye la propia lista de IDs.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from utils import build_base_seed, normalize_seed_to_int, stream_seed_to_int
+
+SESSION_ID = "bench-seed-session"
+CLOSING_TS = "2025-01-02T00:00:00+00:00"
+PUBLIC_SEED = "bench-public-seed"
+
+
+def concatenated(ids):
+    base_seed = build_base_seed(SESSION_ID, CLOSING_TS, "".join([i for i in ids]), PUBLIC_SEED)
+    return normalize_seed_to_int(base_seed)
+
+
+def streaming(ids):
+    return stream_seed_to_int(SESSION_ID, CLOSING_TS, (i for i in ids), PUBLIC_SEED)
+
+
+def _measure(fn, ids):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = fn(ids)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    ids = [f"participant-{i:09d}" for i in range(args.participants)]
+
+    print(f"{args.participants} participantes")
+    print(f"{'ruta':<14} {'tiempo ms':>10} {'pico MiB':>10}")
+    seeds = set()
+    for name, fn in (("concatenado", concatenated), ("streaming", streaming)):
+        value, elapsed, peak = _measure(fn, ids)
+        seeds.add(value)
+        print(f"{name:<14} {elapsed * 1000:>10.1f} {peak / 2**20:>10.2f}")
+
+    if len(seeds) != 1:
+        raise AssertionError("numeric_seed distinto entre rutas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Coste de abrir un cliente por DatabaseService (como antes: cada servicio y
+cada rerun de Streamlit llamaba a SupabaseConnection() → create_client)
+frente al cliente compartido del proceso (supabase_client.get_shared_client).
+
+Se simulan --reruns reruns del dashboard: cada uno crea su DatabaseService y
+hace las dos lecturas de una vista. Se cuentan las conexiones TCP que acepta
+el PostgREST falso: con TLS, cada una es además un handshake completo.
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_shared_client
+    python -m benchmarks.bench_shared_client --reruns 200 --latency-ms 2
+"""
+
+import argparse
+import os
+import time
+
+from supabase import create_client
+
+from services import supabase_client
+from services.database import DatabaseService
+from benchmarks.fake_postgrest_server import FakePostgrestServer
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_pool_tables, make_session_tables
+
+# create_client valida que la clave tenga forma de JWT.
+_FAKE_KEY = "bench.bench.bench"
+
+
+def _rerun(db: DatabaseService):
+    db.fetch_filtered("sessions", [("eq", "status", "open")], columns="id,max_participants")
+    db.fetch_filtered("sessions_pool", [("eq", "type", "scheduled")])
+
+
+def _measure(server: FakePostgrestServer, reruns: int, make_db):
+    connections = server.connections
+    construct = 0.0
+    start = time.perf_counter()
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        db = make_db()
+        construct += time.perf_counter() - t0
+        _rerun(db)
+    return time.perf_counter() - start, construct, server.connections - connections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reruns", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    tables = {**make_session_tables(200), **make_pool_tables(200)}
+    server = FakePostgrestServer(FakeSupabaseClient(tables), latency_ms=args.latency_ms)
+    url = server.start()
+    os.environ["SUPABASE_URL"] = url
+    os.environ["SUPABASE_KEY"] = _FAKE_KEY
+    supabase_client._shared_client = None
+
+    print(f"{args.reruns} reruns, 2 consultas cada uno, latencia {args.latency_ms} ms/petición")
+    try:
+        for label, make_db in (
+            ("cliente por servicio", lambda: DatabaseService(client=create_client(url, _FAKE_KEY))),
+            ("cliente compartido  ", DatabaseService),
+        ):
+            elapsed, construct, connections = _measure(server, args.reruns, make_db)
+            print(
+                f"  {label}: {elapsed * 1000:8.1f} ms  (creación de clientes {construct * 1000:7.1f} ms, "
+                f"{connections} conexiones TCP)"
+            )
+        print(f"  métricas del cliente compartido: {supabase_client.get_shared_client().metrics.snapshot()}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Coste de ordenar participantes: clave zfill original vs clave precalculada
+vs contrato "pre-ordenado" (solo verificación O(N)).
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_sort
+    python -m benchmarks.bench_sort --participants 10000,100000,1000000
+
+Para cada tamaño mide la ordenación con la clave anterior
+(str(ticket_number).zfill(10) por fila), sort_participants_deterministically
+y order_participants(..., presorted=True) sobre una lista ya en orden canónico
+(mejor de 3 ejecuciones), y comprueba que producen el mismo orden.
+"""
+
+import argparse
+import timeit
+
+from benchmarks.synthetic import make_participants
+from utils import order_participants, sort_participants_deterministically
+
+
+def legacy_sort(participants):
+    return sorted(
+        participants,
+        key=lambda p: (p.join_timestamp or "", str(p.ticket_number).zfill(10), p.participant_id),
+    )
+
+
+def _timed(fn, *args, **kwargs):
+    value = fn(*args, **kwargs)
+    elapsed = min(timeit.repeat(lambda: fn(*args, **kwargs), number=1, repeat=3))
+    return value, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", default="10000,100000,1000000")
+    args = parser.parse_args()
+
+    print(f"{'participantes':>13} {'zfill ms':>10} {'clave ms':>10} {'presorted ms':>13} {'speedup':>8}")
+    for count in (int(n) for n in args.participants.split(",")):
+        participants = make_participants(count)
+        # Lista ya en orden canónico, tal y como llegaría de la base de datos.
+        canonical = make_participants(count, shuffled=False)
+
+        legacy, legacy_elapsed = _timed(legacy_sort, participants)
+        keyed, keyed_elapsed = _timed(sort_participants_deterministically, participants)
+        verified, verified_elapsed = _timed(order_participants, canonical, presorted=True)
+
+        if legacy != keyed or verified != legacy_sort(canonical) or verified != canonical:
+            raise AssertionError("el orden no coincide entre rutas")
+
+        print(
+            f"{count:>13} {legacy_elapsed * 1000:>10.1f} {keyed_elapsed * 1000:>10.1f} "
+            f"{verified_elapsed * 1000:>13.1f} {legacy_elapsed / verified_elapsed:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Coste de la traza de adjudicación: latencia y memoria por trace_level.
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_trace_levels
+    python -m benchmarks.bench_trace_levels --participants 50000 --repeat 5
+
+Mide, para ambos motores (engine.AdjudicationEngine y
+src/adjudicator/engine.adjudicate_session), la latencia media y el pico de
+memoria asignada (tracemalloc) de una adjudicación con trace_level
+"full" (comportamiento anterior), "summary" y "none".
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from engine import AdjudicationEngine
+from benchmarks.synthetic import make_input
+from src.adjudicator import engine as api_engine
+from src.adjudicator.models import AdjudicationInput as ApiInput, Participant as ApiParticipant
+
+LEVELS = ("full", "summary", "none")
+
+
+def _measure(fn, repeat):
+    fn()  # calentamiento
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    latency = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return latency, peak
+
+
+def run(participants, repeat):
+    worker_input = make_input("bench-trace", participants)
+    api_input = ApiInput(
+        session_id="bench-trace",
+        product_id="bench-product",
+        group_id="bench-group",
+        public_seed="bench-public-seed",
+        participants=[
+            ApiParticipant(participant_id=p.participant_id, ticket_number=p.ticket_number)
+            for p in worker_input.participants
+        ],
+    )
+    engine = AdjudicationEngine()
+
+    print(f"{participants} participantes, {repeat} repeticiones")
+    print(f"{'motor':<12} {'trace_level':<12} {'latencia ms':>12} {'pico KiB':>10}")
+    for level in LEVELS:
+        latency, peak = _measure(lambda: engine.adjudicate_session(worker_input, level), repeat)
+        print(f"{'worker':<12} {level:<12} {latency * 1000:>12.2f} {peak / 1024:>10.1f}")
+    for level in LEVELS:
+        latency, peak = _measure(lambda: api_engine.adjudicate_session(api_input, level), repeat)
+        print(f"{'api':<12} {level:<12} {latency * 1000:>12.2f} {peak / 1024:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.participants, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Coste de auditar adjudicaciones: re-ejecutar adjudicate_session (traza
+completa) vs verify (solo seed, índice y hash).
+
+Uso (desde backend-core/):
+
+    python -m benchmarks.bench_verify
+    python -m benchmarks.bench_verify --sessions 500 --participants 1000
+"""
+
+import argparse
+import time
+
+from engine import AdjudicationEngine
+from benchmarks.synthetic import make_inputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--participants", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    engine = AdjudicationEngine()
+    inputs = make_inputs(args.sessions, args.participants)
+    results = [engine.adjudicate_session(i) for i in inputs]
+
+    start = time.perf_counter()
+    rerun_ok = all(
+        engine.adjudicate_session(i).result_hash == r.result_hash for i, r in zip(inputs, results)
+    )
+    rerun = time.perf_counter() - start
+
+    start = time.perf_counter()
+    verify_ok = all(engine.verify(i, r) for i, r in zip(inputs, results))
+    verify = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk_ok = all(engine.verify_many(zip(inputs, results), max_workers=args.workers))
+    bulk = time.perf_counter() - start
+
+    if not (rerun_ok and verify_ok and bulk_ok):
+        raise AssertionError("alguna adjudicación no verifica")
+
+    print(f"{args.sessions} sesiones x {args.participants} participantes")
+    print(f"re-ejecución completa : {args.sessions / rerun:>10.1f} ses/s")
+    print(f"verify                : {args.sessions / verify:>10.1f} ses/s ({rerun / verify:.2f}x)")
+    print(f"verify_many (pool)    : {args.sessions / bulk:>10.1f} ses/s ({rerun / bulk:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
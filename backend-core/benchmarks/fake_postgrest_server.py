@@ -0,0 +1,244 @@
+"""
+Servidor HTTP local que habla (el subconjunto que usamos de) PostgREST sobre
+el cliente en memoria de benchmarks/fake_supabase.py, para medir los
+clientes reales (postgrest-py síncrono y asíncrono) con una latencia de red
+controlada en lugar de contra Supabase.
+
+Entiende:
+- GET/HEAD /<tabla>?select=...&<campo>=<op>.<valor>&order=...&limit=...&offset=...
+- POST /<tabla> (insert; upsert con Prefer: resolution=merge-duplicates y on_conflict)
+- PATCH y DELETE /<tabla>?<filtros>
+- POST /rpc/<función>
+- Prefer: count=exact (cabecera Content-Range) y return=minimal.
+
+Cada petición espera latency_ms antes de responder (en su propio hilo, así
+que las peticiones simultáneas se solapan como en un servidor real).
+
+    with FakePostgrestServer(FakeSupabaseClient(tables), latency_ms=5) as url:
+        db = DatabaseService(client=SyncPostgrestClient(url))
+
+También se puede lanzar suelto, con datos sintéticos de sesiones:
+
+    python -m benchmarks.fake_postgrest_server --sessions 1000 --port 8787
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from postgrest.exceptions import APIError
+
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_session_tables
+
+
+# Parámetros de la query string que no son filtros.
+_MODIFIERS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+_INTEGER = re.compile(r"^-?\d+$")
+
+
+def _coerce(raw: str) -> Any:
+    """
+    Valor de filtro de la URL → valor Python comparable con las filas.
+    """
+    if raw in ("true", "false"):
+        return raw == "true"
+    if raw == "null":
+        return None
+    if _INTEGER.match(raw):
+        return int(raw)
+    return raw
+
+
+def _parse_list(raw: str) -> List[Any]:
+    """
+    "(a,\"b,c\",d)" → ["a", "b,c", "d"] (postgrest-py entrecomilla los valores
+    con comas, dos puntos o paréntesis).
+    """
+    values, current, quoted, was_quoted = [], "", False, False
+    for char in raw.strip()[1:-1]:
+        if char == '"':
+            quoted = not quoted
+            was_quoted = True
+        elif char == "," and not quoted:
+            values.append(current if was_quoted else _coerce(current))
+            current, was_quoted = "", False
+        else:
+            current += char
+    if current or was_quoted:
+        values.append(current if was_quoted else _coerce(current))
+    return values
+
+
+def _apply_params(query, params: List[tuple]):
+    limit = offset = None
+    for key, raw in params:
+        if key == "limit":
+            limit = int(raw)
+        elif key == "offset":
+            offset = int(raw)
+        elif key == "order":
+            for term in raw.split(","):
+                column, _, direction = term.partition(".")
+                query = query.order(column, desc=direction.startswith("desc"))
+        elif key not in _MODIFIERS:
+            op, _, raw_value = raw.partition(".")
+            value = _parse_list(raw_value) if op == "in" else _coerce(raw_value)
+            query = getattr(query, {"in": "in_", "is": "is_"}.get(op, op))(key, value)
+    if offset is not None:
+        query = query.range(offset, offset + (limit if limit is not None else 10**9) - 1)
+    elif limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Cabeceras y cuerpo salen en escrituras separadas: sin TCP_NODELAY,
+    # Nagle + ACK diferido añaden ~40 ms a cada respuesta.
+    disable_nagle_algorithm = True
+    server: "FakePostgrestServer"
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.connections += 1
+
+    def _read_body(self) -> Any:
+        # Se lee siempre (postgrest-py manda "{}" incluso en los GET) para no
+        # dejar bytes en la conexión keep-alive.
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else None
+
+    def _send(self, status: int, payload: Any = None, headers: Optional[dict] = None, head: bool = False):
+        body = b"" if payload is None else json.dumps(payload, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _handle(self, method: str):
+        with self.server.stats_lock:
+            self.server.requests += 1
+        body = self._read_body()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        url = urlsplit(self.path)
+        params = parse_qsl(url.query, keep_blank_values=True)
+        options = dict(params)
+        prefer = {p.strip() for p in (self.headers.get("Prefer") or "").split(",")}
+        minimal = "return=minimal" in prefer
+        client = self.server.client
+        name = url.path.rstrip("/").rsplit("/", 1)[-1]
+
+        try:
+            if "/rpc/" in url.path:
+                response = client.rpc(name, body or {}).execute()
+                return self._send(200, response.data)
+
+            query = client.table(name)
+            if method in ("GET", "HEAD"):
+                query = query.select(options.get("select", "*"), count="exact" if "count=exact" in prefer else None)
+            elif method == "POST":
+                returning = "minimal" if minimal else "representation"
+                if "resolution=merge-duplicates" in prefer:
+                    query = query.upsert(body, on_conflict=options.get("on_conflict"), returning=returning)
+                else:
+                    query = query.insert(body, returning=returning)
+            elif method == "PATCH":
+                query = query.update(body, returning="minimal" if minimal else "representation")
+            else:
+                query = query.delete(returning="minimal" if minimal else "representation")
+            response = _apply_params(query, params).execute()
+        except APIError as e:
+            return self._send(400, {"code": e.code, "message": e.message, "details": e.details, "hint": e.hint})
+
+        if method in ("GET", "HEAD"):
+            headers = {}
+            if response.count is not None:
+                shown = f"0-{len(response.data) - 1}" if response.data else "*"
+                headers["Content-Range"] = f"{shown}/{response.count}"
+            return self._send(200, response.data, headers, head=method == "HEAD")
+        if minimal:
+            return self._send(201 if method == "POST" else 204)
+        return self._send(201 if method == "POST" else 200, response.data)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_HEAD(self):
+        self._handle("HEAD")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class FakePostgrestServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, client: FakeSupabaseClient, latency_ms: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.client = client
+        self.latency = latency_ms / 1000.0
+        # Conexiones TCP aceptadas y peticiones atendidas (para medir reutilización).
+        self.stats_lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> str:
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8787)
+    args = parser.parse_args()
+
+    server = FakePostgrestServer(
+        FakeSupabaseClient(make_session_tables(args.sessions)), latency_ms=args.latency_ms, port=args.port
+    )
+    print(f"PostgREST falso en {server.url} ({args.sessions} sesiones)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+"""
+Nombre histórico del cliente en memoria, que ahora vive en
+services/memory_database.py (backend DB_BACKEND=memory). Los benchmarks y
+los tests siguen importándolo desde aquí.
+"""
+
+from services.memory_database import InMemoryClient as FakeSupabaseClient  # noqa: F401
+from services.memory_database import MemoryResponse as FakeResponse  # noqa: F401
@@ -0,0 +1,178 @@
+"""
+Generadores de datos sintéticos para los benchmarks (motor de adjudicación y worker).
+
+Todo es determinista (random.Random con semilla fija) para que dos ejecuciones
+midan exactamente el mismo trabajo.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Sequence
+
+from models.adjudication import AdjudicationInput, Participant
+
+
+def make_participants(count: int, seed: int = 0, shuffled: bool = True) -> List[Participant]:
+    """
+    Crea `count` participantes con join_timestamp crecientes y tickets 1..N,
+    en orden barajado para que el motor tenga que ordenarlos (o, con
+    shuffled=False, ya en orden canónico).
+
+    Los objetos se crean ya en el orden final de la lista (como al leer filas
+    de la base de datos), para no medir fallos de caché artificiales.
+    """
+    order = list(range(count))
+    if shuffled:
+        random.Random(seed).shuffle(order)
+    else:
+        order.sort(key=lambda i: (f"2025-01-01T10:{(i // 60) % 60:02d}:{i % 60:02d}Z", i))
+    return [
+        Participant(
+            participant_id=f"user-{seed}-{i:07d}",
+            ticket_number=i + 1,
+            join_timestamp=f"2025-01-01T10:{(i // 60) % 60:02d}:{i % 60:02d}Z",
+        )
+        for i in order
+    ]
+
+
+def make_input(session_id: str, participant_count: int, seed: int = 0) -> AdjudicationInput:
+    return AdjudicationInput(
+        session_id=session_id,
+        product_id="bench-product",
+        group_id="bench-group",
+        closing_timestamp="2025-01-02T00:00:00+00:00",
+        public_seed=None,
+        participants=make_participants(participant_count, seed),
+    )
+
+
+def make_inputs(session_count: int, participant_count: int) -> List[AdjudicationInput]:
+    return [
+        make_input(f"bench-session-{i}", participant_count, seed=i)
+        for i in range(session_count)
+    ]
+
+
+def make_session_tables(
+    session_count: int,
+    max_participants: int = 10,
+    full_ratio: float = 0.1,
+    expired_ratio: float = 0.1,
+    seed: int = 0,
+) -> Dict[str, List[dict]]:
+    """
+    Filas de las tablas sessions y participants para simular un tick del
+    worker: session_count sesiones 'open', de las que aproximadamente
+    full_ratio tienen el aforo completo y expired_ratio ya han caducado; el
+    resto están a medio llenar.
+    """
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    sessions, participants = [], []
+    for i in range(session_count):
+        session_id = f"session-{i:07d}"
+        roll = rng.random()
+        expired = roll < expired_ratio
+        full = not expired and roll < expired_ratio + full_ratio
+        expiry = now - timedelta(hours=1) if expired else now + timedelta(days=5)
+        sessions.append({
+            "id": session_id,
+            "status": "open",
+            "max_participants": max_participants,
+            "expiry_timestamp": expiry.isoformat(),
+        })
+        joined = max_participants if full else rng.randrange(max_participants)
+        participants.extend(
+            {"id": f"{session_id}-p{j}", "session_id": session_id, "ticket_number": j + 1}
+            for j in range(joined)
+        )
+    return {"sessions": sessions, "participants": participants}
+
+
+def make_pool_tables(template_count: int, pending: int = 50, future: int = 50) -> Dict[str, List[dict]]:
+    """
+    Parque con template_count plantillas 'scheduled' ya vencidas, de las que
+    solo las `pending` últimas siguen sin sesión creada (el resto es
+    histórico ya activado), más `future` plantillas que aún no han llegado.
+    """
+    now = datetime.now(timezone.utc)
+    pool, sessions = [], []
+    for i in range(template_count + future):
+        pool_id = f"pool-{i:07d}"
+        is_future = i >= template_count
+        start = now + timedelta(hours=1) if is_future else now - timedelta(minutes=template_count - i)
+        pool.append({
+            "id": pool_id,
+            "type": "scheduled",
+            "product_id": "bench-product",
+            "operator_code": "ES",
+            "max_participants": 10,
+            "amount": 100.0,
+            "start_timestamp": start.isoformat(),
+        })
+        if not is_future and i < template_count - pending:
+            sessions.append({"id": f"session-{i:07d}", "pool_id": pool_id, "status": "adjudicated"})
+    return {"sessions_pool": pool, "sessions": sessions}
+
+
+def make_chain_tables(
+    chain_count: int,
+    chain_length: int = 10,
+    new_adjudications: int = 20,
+    operators: Sequence[str] = ("ES",),
+    seed: int = 0,
+) -> Dict[str, List[dict]]:
+    """
+    Parque de cadenas (chain_count grupos x operadores, chain_length
+    eslabones cada una) con su histórico de sesiones: en cada cadena los
+    primeros eslabones ya están adjudicados y encadenados (chain_advanced),
+    y en `new_adjudications` cadenas el último eslabón adjudicado aún no ha
+    creado su sucesora.
+    """
+    rng = random.Random(seed)
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    pool, sessions = [], []
+    chains = [(f"X{g:05d}", op) for g in range(chain_count) for op in operators]
+    pending = set(rng.sample(range(len(chains)), min(new_adjudications, len(chains))))
+
+    for c, (group, operator) in enumerate(chains):
+        template_ids = []
+        for idx in range(1, chain_length + 1):
+            template_ids.append(f"pool-{group}-{operator}-{idx}")
+            pool.append({
+                "id": template_ids[-1],
+                "type": "scheduled" if idx == 1 else "chain",
+                "product_id": "bench-product",
+                "operator_code": operator,
+                "chain_group_id": group,
+                "chain_index": idx,
+                "max_participants": 10,
+                "amount": 100.0,
+                "start_timestamp": None,
+                "created_at": (created + timedelta(seconds=len(pool))).isoformat(),
+            })
+
+        adjudicated = rng.randrange(1, chain_length)
+        for idx in range(1, adjudicated + 1):
+            last = idx == adjudicated
+            sessions.append({
+                "id": f"session-{group}-{operator}-{idx}",
+                "pool_id": template_ids[idx - 1],
+                "status": "adjudicated",
+                "operator_code": operator,
+                "chain_group_id": group,
+                "chain_index": idx,
+                "chain_advanced": not (last and c in pending),
+            })
+        if c not in pending:
+            sessions.append({
+                "id": f"session-{group}-{operator}-{adjudicated + 1}",
+                "pool_id": template_ids[adjudicated],
+                "status": "open",
+                "operator_code": operator,
+                "chain_group_id": group,
+                "chain_index": adjudicated + 1,
+                "chain_advanced": False,
+            })
+    return {"sessions_pool": pool, "sessions": sessions}
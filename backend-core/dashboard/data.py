@@ -0,0 +1,36 @@
+import os
+import threading
+from typing import Optional
+
+from services.database import create_database_service
+from services.query_cache import CachedDatabaseService, QueryCache, watch_changes
+
+
+_dashboard_db: Optional[CachedDatabaseService] = None
+_dashboard_db_lock = threading.Lock()
+
+
+def get_dashboard_db() -> CachedDatabaseService:
+    """
+    Acceso a datos de las vistas: uno por proceso, compartido por todos los
+    operadores y reruns de Streamlit (el módulo solo se importa una vez).
+
+    Las lecturas se cachean DASHBOARD_CACHE_TTL segundos (15 por defecto),
+    con DASHBOARD_CACHE_ENTRIES consultas como máximo (256). Con
+    DATABASE_URL, además, la caché se invalida en cuanto el worker cambia
+    una sesión (LISTEN de sql/004_change_notifications.sql).
+    """
+    global _dashboard_db
+    with _dashboard_db_lock:
+        if _dashboard_db is None:
+            cache = QueryCache(
+                ttl_seconds=float(os.getenv("DASHBOARD_CACHE_TTL", "15")),
+                max_entries=int(os.getenv("DASHBOARD_CACHE_ENTRIES", "256")),
+            )
+            dsn = os.getenv("DATABASE_URL")
+            if dsn:
+                from services.change_feed import PostgresChangeFeed
+
+                watch_changes(cache, PostgresChangeFeed(dsn))
+            _dashboard_db = CachedDatabaseService(create_database_service(), cache)
+        return _dashboard_db
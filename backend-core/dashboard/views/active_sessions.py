@@ -1,20 +1,24 @@
 import streamlit as st
-from services.database import DatabaseService
 from ..ui.components import kpi_card, participant_progress, status_badge
 from ..config import MUTED_TEXT_COLOR
+from ..data import get_dashboard_db
 
 
-def _count_participants_for_session(db: DatabaseService, session_id: str) -> int:
-    result = db.fetch_by_field("participants", "session_id", session_id)
-    return len(result.data or [])
+# Columnas que pinta la vista (no se descarga el resto de la fila).
+SESSION_COLUMNS = (
+    "id,product_id,operator_code,chain_group_id,chain_index,status,ou_status,settlement_status,"
+    "max_participants,amount,created_at,expiry_timestamp,closing_timestamp"
+)
+
+# Sesiones por página.
+PAGE_SIZE = 50
 
 
 def render_active_sessions():
     st.markdown("## 🔵 Sesiones Activas y en Curso (sessions)")
 
-    db = DatabaseService()
-    result = db.fetch_all("sessions")
-    rows = result.data or []
+    # Lecturas cacheadas y compartidas entre operadores (ver dashboard/data.py).
+    db = get_dashboard_db()
 
     # Filtros
     col_f1, col_f2, col_f3 = st.columns(3)
@@ -25,20 +29,33 @@ def render_active_sessions():
     with col_f3:
         chain_filter = st.text_input("Cadena (chain_group_id)", "")
 
-    filtered = []
-    for r in rows:
-        if operator_filter != "Todos" and r.get("operator_code") != operator_filter:
-            continue
-        if status_filter != "Todos" and r.get("status") != status_filter:
-            continue
-        if chain_filter and (r.get("chain_group_id") or "") != chain_filter:
-            continue
-        filtered.append(r)
-
-    # KPIs
-    total_open = sum(1 for r in rows if r.get("status") == "open")
-    total_adjudicated = sum(1 for r in rows if r.get("status") == "adjudicated")
-    total_expired = sum(1 for r in rows if r.get("status") == "expired")
+    # Los filtros y la paginación se resuelven en base de datos: solo viaja
+    # la página visible, con las columnas que se pintan.
+    filters = []
+    if operator_filter != "Todos":
+        filters.append(("eq", "operator_code", operator_filter))
+    if status_filter != "Todos":
+        filters.append(("eq", "status", status_filter))
+    if chain_filter:
+        filters.append(("eq", "chain_group_id", chain_filter))
+
+    page = st.number_input("Página", min_value=1, value=1, step=1)
+    result = db.fetch_filtered(
+        "sessions",
+        filters,
+        columns=SESSION_COLUMNS,
+        order=("-created_at",),
+        limit=PAGE_SIZE,
+        offset=(page - 1) * PAGE_SIZE,
+        count=True,
+    )
+    filtered = result.data or []
+
+    # KPIs (un único conteo agrupado por estado)
+    status_totals = db.count_by_field_many("sessions", "status", ["open", "adjudicated", "expired"])
+    total_open = status_totals["open"]
+    total_adjudicated = status_totals["adjudicated"]
+    total_expired = status_totals["expired"]
 
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -54,9 +71,16 @@ def render_active_sessions():
         st.info("No hay sesiones con los filtros actuales.")
         return
 
+    # Ocupación de toda la página en un único conteo agrupado, en lugar de
+    # descargar los participantes de cada sesión.
+    participant_counts = db.count_by_field_many("participants", "session_id", [r["id"] for r in filtered])
+
+    first = (page - 1) * PAGE_SIZE + 1
+    st.caption(f"Sesiones {first}–{first + len(filtered) - 1} de {result.count}")
+
     for row in filtered:
         session_id = row["id"]
-        current_pax = _count_participants_for_session(db, session_id)
+        current_pax = participant_counts[session_id]
         max_pax = row["max_participants"]
 
         with st.expander(f"{row['product_id']} — {row.get('chain_group_id')}.{row.get('chain_index')} — {row['operator_code']}"):
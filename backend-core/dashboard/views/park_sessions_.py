@@ -1,15 +1,25 @@
 import streamlit as st
-from services.database import DatabaseService
+from services.database import like_escape
 from ..ui.components import kpi_card, status_badge
 from ..config import MUTED_TEXT_COLOR
+from ..data import get_dashboard_db
+
+
+# Columnas que pinta la vista (no se descarga el resto de la fila).
+POOL_COLUMNS = (
+    "id,description,product_id,operator_code,chain_group_id,chain_index,type,"
+    "max_participants,amount,start_timestamp"
+)
+
+# Plantillas por página.
+PAGE_SIZE = 50
 
 
 def render_park_sessions():
     st.markdown("## 📦 Parque de Sesiones (sessions_pool)")
 
-    db = DatabaseService()
-    result = db.fetch_all("sessions_pool")
-    rows = result.data or []
+    # Lecturas cacheadas y compartidas entre operadores (ver dashboard/data.py).
+    db = get_dashboard_db()
 
     # Filtros
     col_f1, col_f2, col_f3, col_f4 = st.columns(4)
@@ -22,27 +32,38 @@ def render_park_sessions():
     with col_f4:
         product_filter = st.text_input("Producto (product_id)", "")
 
-    filtered = []
-    for r in rows:
-        if operator_filter != "Todos" and r.get("operator_code") != operator_filter:
-            continue
-        if type_filter != "Todos" and r.get("type") != type_filter:
-            continue
-        if chain_filter and (r.get("chain_group_id") or "") != chain_filter:
-            continue
-        if product_filter and product_filter not in (r.get("product_id") or ""):
-            continue
-        filtered.append(r)
+    # Los filtros y la paginación se resuelven en base de datos: solo viaja
+    # la página visible, con las columnas que se pintan.
+    filters = []
+    if operator_filter != "Todos":
+        filters.append(("eq", "operator_code", operator_filter))
+    if type_filter != "Todos":
+        filters.append(("eq", "type", type_filter))
+    if chain_filter:
+        filters.append(("eq", "chain_group_id", chain_filter))
+    if product_filter:
+        filters.append(("ilike", "product_id", f"%{like_escape(product_filter)}%"))
+
+    page = st.number_input("Página", min_value=1, value=1, step=1)
+    result = db.fetch_filtered(
+        "sessions_pool",
+        filters,
+        columns=POOL_COLUMNS,
+        order=("-created_at",),
+        limit=PAGE_SIZE,
+        offset=(page - 1) * PAGE_SIZE,
+        count=True,
+    )
+    filtered = result.data or []
 
     # KPIs
     col1, col2, col3 = st.columns(3)
     with col1:
-        kpi_card("Total plantillas en parque", str(len(rows)))
+        kpi_card("Total plantillas en parque", str(db.count_filtered("sessions_pool")))
     with col2:
-        kpi_card("Visible tras filtros", str(len(filtered)))
+        kpi_card("Visible tras filtros", str(result.count or 0))
     with col3:
-        chains = len({r.get("chain_group_id") for r in rows if r.get("chain_group_id")})
-        kpi_card("Cadenas configuradas", str(chains))
+        kpi_card("Cadenas configuradas", str(db.count_distinct("sessions_pool", "chain_group_id")))
 
     st.markdown("---")
 
@@ -50,6 +71,9 @@ def render_park_sessions():
         st.info("No hay resultados con los filtros actuales.")
         return
 
+    first = (page - 1) * PAGE_SIZE + 1
+    st.caption(f"Plantillas {first}–{first + len(filtered) - 1} de {result.count}")
+
     for row in filtered:
         with st.expander(f"{row.get('description') or row['product_id']} — {row['operator_code']}"):
             col_a, col_b, col_c, col_d = st.columns([2, 1, 1, 1])
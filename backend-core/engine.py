@@ -1,5 +1,5 @@
-from typing import List
-import hashlib
+from functools import partial
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 from models.adjudication import (
     AdjudicationInput,
@@ -8,12 +8,38 @@ from models.adjudication import (
     TraceStep,
 )
 from utils import (
-    normalize_seed_to_int,
-    build_base_seed,
-    sort_participants_deterministically,
     create_trace_step,
     current_timestamp,
 )
+from utils.parallel import DEFAULT_CHUNK_SIZE, PARALLEL_BATCH_THRESHOLD, map_chunks
+from src.adjudicator.registry import (
+    ALGORITHM_V1,
+    TRACE_FULL,
+    WORKER_ALIASES,
+    get_algorithm,
+    validate_trace_level,
+    verify_result,
+)
+
+
+def _adjudicate_chunk(
+    engine: "AdjudicationEngine",
+    chunk: List[AdjudicationInput],
+    trace_level: Optional[str] = None,
+    presorted: bool = False,
+) -> List[AdjudicationResult]:
+    """
+    Punto de entrada de los procesos del pool: adjudica un bloque de sesiones
+    con exactamente el mismo código que la ruta de una sola sesión.
+    """
+    return [engine.adjudicate_session(input_data, trace_level, presorted) for input_data in chunk]
+
+
+def _verify_chunk(
+    chunk: List[Tuple[AdjudicationInput, AdjudicationResult]],
+    presorted: bool = False,
+) -> List[bool]:
+    return [verify_result(input_data, result, presorted=presorted, aliases=WORKER_ALIASES) for input_data, result in chunk]
 
 
 class AdjudicationEngine:
@@ -25,32 +51,25 @@ class AdjudicationEngine:
     Cualquier tercero puede verificarlo con SHA-256 estándar.
     """
 
-    def __init__(self, algorithm_version: str = "1.0"):
+    def __init__(self, algorithm_version: str = ALGORITHM_V1, trace_level: str = TRACE_FULL):
+        get_algorithm(algorithm_version, WORKER_ALIASES)  # falla pronto si la versión no está registrada
         self.algorithm_version = algorithm_version
-
-    @staticmethod
-    def _compute_winner_index(numeric_seed: int, total_participants: int) -> int:
-        """
-        Dado un entero grande (numeric_seed) y el número total de participantes N,
-        el índice ganador es: numeric_seed mod N.
-        """
-        if total_participants <= 0:
-            raise ValueError("No hay participantes en la sesión de adjudicación.")
-        return numeric_seed % total_participants
-
-    @staticmethod
-    def _hash_result(session_id: str, winner_participant_id: str, numeric_seed: int) -> str:
-        """
-        Genera un hash del resultado para facilitar verificaciones y sellado.
-        """
-        base = f"{session_id}|{winner_participant_id}|{numeric_seed}"
-        return hashlib.sha256(base.encode("utf-8")).hexdigest()
-
-    def adjudicate_session(self, input_data: AdjudicationInput) -> AdjudicationResult:
+        self.trace_level = validate_trace_level(trace_level)
+
+    def adjudicate_session(
+        self,
+        input_data: AdjudicationInput,
+        trace_level: Optional[str] = None,
+        presorted: bool = False,
+    ) -> AdjudicationResult:
         """
         Ejecuta el proceso de adjudicación determinista para una sesión cerrada.
 
-        Pasos:
+        El cálculo lo hace la versión del algoritmo indicada en
+        input_data.algorithm_version (o, si falta, la del motor), a través del
+        registro compartido con la API (src/adjudicator/registry.py).
+
+        Pasos (versión 1.0):
         1) Ordenar participantes de forma determinista.
         2) Construir una semilla base combinando:
            - session_id
@@ -60,122 +79,121 @@ class AdjudicationEngine:
         3) Normalizar esa semilla base a un entero mediante SHA-256.
         4) Calcular winner_index = numeric_seed % N.
         5) Seleccionar el participante ganador.
-        6) Generar una traza explicativa.
+        6) Generar una traza explicativa (según trace_level).
         7) Devolver AdjudicationResult.
 
+        trace_level (por defecto, el del motor):
+        - "full": los 7 pasos, incluida la lista ordenada y la semilla base (O(N)).
+        - "summary": solo los pasos de tamaño constante (1, 4, 5, 6 y 7).
+        - "none": sin traza; la traza completa se puede regenerar después con
+          build_trace(input_data).
+
+        El nivel de traza no afecta a numeric_seed, winner ni result_hash.
+
+        presorted=True indica que los participantes ya llegan en orden canónico
+        (ORDER BY join_timestamp, ticket_number, participant_id): solo se
+        verifica el orden en O(N) en lugar de reordenar.
+
         Este proceso es:
         - determinista
         - reproducible
         - verificable por terceros
         - no constituye un juego de azar.
         """
+        level = validate_trace_level(trace_level or self.trace_level)
+        algorithm_version = input_data.algorithm_version or self.algorithm_version
 
-        trace: List[TraceStep] = []
+        outcome = get_algorithm(algorithm_version, WORKER_ALIASES).adjudicate(input_data, presorted=presorted)
+        winner: Participant = outcome.winner
 
-        # Paso 1: información de participantes
-        trace.append(
-            create_trace_step(
-                step=1,
-                description="Número de participantes en la sesión",
-                value=str(len(input_data.participants)),
-            )
-        )
-
-        ordered_participants: List[Participant] = sort_participants_deterministically(
-            input_data.participants
-        )
-        if not ordered_participants:
-            raise ValueError("La lista de participantes está vacía.")
-
-        trace.append(
-            create_trace_step(
-                step=2,
-                description="Participantes ordenados de forma determinista",
-                value="; ".join(
-                    f"{p.participant_id}:{p.ticket_number}" for p in ordered_participants
-                ),
-            )
-        )
-
-        # Construir la cadena de IDs concatenados
-        participant_ids_concat = "".join([p.participant_id for p in ordered_participants])
-
-        # Paso 3: construir semilla base
-        base_seed = build_base_seed(
-            session_id=input_data.session_id,
-            closing_timestamp=input_data.closing_timestamp,
-            participant_ids_concat=participant_ids_concat,
-            public_seed=input_data.public_seed,
-        )
-        trace.append(
-            create_trace_step(
-                step=3,
-                description="Semilla base (session_id | closing_timestamp | ids_concatenados | [public_seed])",
-                value=base_seed,
-            )
-        )
-
-        # Paso 4: normalizar semilla a entero
-        numeric_seed = normalize_seed_to_int(base_seed)
-        trace.append(
-            create_trace_step(
-                step=4,
-                description="Semilla numérica (SHA-256 → entero)",
-                value=str(numeric_seed),
-            )
-        )
-
-        # Paso 5: calcular índice ganador
-        winner_index = self._compute_winner_index(numeric_seed, len(ordered_participants))
-        trace.append(
-            create_trace_step(
-                step=5,
-                description="Índice ganador (numeric_seed mod N)",
-                value=f"{winner_index} (N={len(ordered_participants)})",
-            )
-        )
-
-        # Paso 6: seleccionar participante ganador
-        winner: Participant = ordered_participants[winner_index]
-        trace.append(
-            create_trace_step(
-                step=6,
-                description="Participante ganador (según índice ganador en lista ordenada)",
-                value=f"participant_id={winner.participant_id}, ticket_number={winner.ticket_number}",
-            )
-        )
-
-        # Paso 7: generar hash del resultado
-        result_hash = self._hash_result(
-            session_id=input_data.session_id,
-            winner_participant_id=winner.participant_id,
-            numeric_seed=numeric_seed,
-        )
-        trace.append(
-            create_trace_step(
-                step=7,
-                description="Hash del resultado (session_id | winner_id | numeric_seed)",
-                value=result_hash,
-            )
-        )
+        trace: List[TraceStep] = [
+            create_trace_step(step=step, description=description, value=value)
+            for step, description, value in outcome.trace_steps(level)
+        ]
 
-        # Paso 8: construir objeto resultado
         result = AdjudicationResult(
             session_id=input_data.session_id,
             product_id=input_data.product_id,
             group_id=input_data.group_id,
-            algorithm_version=input_data.algorithm_version or self.algorithm_version,
+            algorithm_version=algorithm_version,
             public_seed=input_data.public_seed,
-            numeric_seed=numeric_seed,
+            numeric_seed=outcome.numeric_seed,
             winner_participant_id=winner.participant_id,
             winner_ticket_number=winner.ticket_number,
-            winner_index=winner_index,
+            winner_index=outcome.winner_index,
             trace=trace,
-            result_hash=result_hash,
+            result_hash=outcome.result_hash,
         )
 
         return result
 
+    def build_trace(self, input_data: AdjudicationInput) -> List[TraceStep]:
+        """
+        Regenera bajo demanda la traza completa de una adjudicación a partir
+        de sus datos de entrada (p. ej. para auditoría de un resultado
+        obtenido con trace_level="none").
+        """
+        return self.adjudicate_session(input_data, trace_level=TRACE_FULL).trace
+
+    def adjudicate_many(
+        self,
+        inputs: Iterable[AdjudicationInput],
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        parallel_threshold: int = PARALLEL_BATCH_THRESHOLD,
+        trace_level: Optional[str] = None,
+        presorted: bool = False,
+    ) -> Iterator[AdjudicationResult]:
+        """
+        Adjudica un lote de sesiones cerradas.
+
+        - Los lotes pequeños (menos de parallel_threshold sesiones), o con un
+          solo worker disponible, se adjudican en el propio proceso.
+        - Los lotes grandes se reparten en bloques de chunk_size sesiones sobre
+          un pool de procesos (max_workers, por defecto os.cpu_count()).
+
+        Los resultados se devuelven en streaming y en el mismo orden que las
+        entradas, y son idénticos a los de adjudicate_session, porque cada
+        proceso ejecuta ese mismo método. Como mucho hay 2 * max_workers
+        bloques en vuelo, así que la memoria no crece con el tamaño del lote.
+
+        trace_level y presorted se aplican a todas las sesiones del lote (ver
+        adjudicate_session).
+
+        Si una sesión falla (p. ej. sin participantes), la excepción se propaga
+        en su posición, tras haber entregado los resultados anteriores.
+        """
+        worker = partial(_adjudicate_chunk, self, trace_level=trace_level, presorted=presorted)
+        return map_chunks(worker, inputs, max_workers, chunk_size, parallel_threshold)
+
+    def verify(
+        self,
+        input_data: AdjudicationInput,
+        result: AdjudicationResult,
+        presorted: bool = False,
+    ) -> bool:
+        """
+        Verifica un AdjudicationResult almacenado sin reconstruir la traza:
+        recalcula con la versión del algoritmo del resultado numeric_seed,
+        winner_index, ganador y result_hash, y los compara.
+        """
+        return verify_result(input_data, result, presorted=presorted, aliases=WORKER_ALIASES)
+
+    def verify_many(
+        self,
+        pairs: Iterable[Tuple[AdjudicationInput, AdjudicationResult]],
+        max_workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        parallel_threshold: int = PARALLEL_BATCH_THRESHOLD,
+        presorted: bool = False,
+    ) -> Iterator[bool]:
+        """
+        Verifica en lote pares (input, result), en paralelo para lotes grandes
+        (mismo reparto que adjudicate_many). Devuelve un bool por par, en orden.
+        """
+        worker = partial(_verify_chunk, presorted=presorted)
+        return map_chunks(worker, pairs, max_workers, chunk_size, parallel_threshold)
+
     def run_demo(self) -> AdjudicationResult:
         """
         Demo simple para verificar el funcionamiento del motor sin base de datos.
@@ -14,16 +14,34 @@ Crea:
 - Sesiones en cadena (chain) para Xn.2, Xn.3, etc.
 - Varias entradas standby para usar en el futuro
 
+Las plantillas se generan como un flujo y se escriben por lotes de varias
+filas (upsert sobre template_key, ver sql/008_sessions_pool_template_key.sql):
+repetir el seed actualiza las plantillas en lugar de duplicarlas. Con
+--chains N se generan N cadenas por producto y operador, para entornos de
+carga (p. ej. --chains 2000 ≈ 150.000 plantillas).
+
+    python seed_sessions_pool.py
+    python seed_sessions_pool.py --chains 2000 --batch-size 1000 --workers 4
+
 Requiere:
-- Variables de entorno SUPABASE_URL y SUPABASE_KEY
+- Variables de entorno SUPABASE_URL y SUPABASE_KEY (o DB_BACKEND=postgres y
+  DATABASE_URL: entonces cada lote se carga con COPY)
 - Que DatabaseService esté correctamente configurado
 """
 
+import argparse
+import itertools
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone
-from services.database import DatabaseService
+from typing import Iterable, Iterator, List
 
+from services.database import create_database_service
 
-db = DatabaseService()
+
+# Filas por INSERT (o COPY) y lotes escritos a la vez.
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_WORKERS = 4
 
 
 PRODUCTS = [
@@ -68,94 +86,122 @@ PRODUCTS = [
 OPERATORS = ["ES", "PT", "FR"]  # Operadores de ejemplo
 
 
-def create_chain_entries_for_product(product: dict, operator_code: str, chain_length: int = 5):
+def chain_rows(
+    product: dict,
+    operator_code: str,
+    chain_group_id: str,
+    start_ts: datetime,
+    chain_length: int = 5,
+) -> Iterator[dict]:
     """
-    Crea en sessions_pool la cadena de sesiones para un producto y operador:
-    - 1 entrada 'scheduled' (primer eslabón) con start_timestamp = ahora + offset
-    - (chain_length - 1) entradas 'chain' para los siguientes eslabones
+    Plantillas de la cadena de un producto y operador:
+    - 1 entrada 'scheduled' (primer eslabón) con start_timestamp
+      (se activará automáticamente cuando start_timestamp <= now, según worker)
+    - (chain_length - 1) entradas 'chain' para los siguientes eslabones, sin
+      start_timestamp: se usarán como plantillas Xn.2, Xn.3, etc.
     """
-
-    now_utc = datetime.now(timezone.utc)
-
-    chain_group_id = product["chain_group_id"]
-    product_id = product["product_id"]
-    amount = product["base_amount"]
-    max_participants = product["max_participants"]
-
-    # 1) Primera sesión de la cadena: 'scheduled'
-    #    Se activará automáticamente cuando start_timestamp <= now (según worker)
-    start_ts = now_utc + timedelta(minutes=1)  # ejemplo: dentro de 1 minuto
-
-    first_data = {
-        "product_id": product_id,
-        "operator_code": operator_code,
-        "type": "scheduled",
-        "chain_group_id": chain_group_id,
-        "chain_index": 1,
-        "max_participants": max_participants,
-        "amount": amount,
-        "start_timestamp": start_ts.isoformat(),
-        "description": f"{product['name']} - Cadena {chain_group_id} - Sesión 1 ({operator_code})",
-    }
-
-    res_first = db.insert("sessions_pool", first_data)
-    print(f"[OK] Primera sesión programada en cadena {chain_group_id} para operador {operator_code}: {res_first.data[0]['id']}")
-
-    # 2) Resto de sesiones de la cadena: type = 'chain'
-    #    No tienen start_timestamp, se usarán como plantillas Xn.2, Xn.3, etc.
-    for idx in range(2, chain_length + 1):
-        data = {
-            "product_id": product_id,
+    for idx in range(1, chain_length + 1):
+        yield {
+            "template_key": f"{chain_group_id}:{operator_code}:{idx}",
+            "product_id": product["product_id"],
             "operator_code": operator_code,
-            "type": "chain",
+            "type": "scheduled" if idx == 1 else "chain",
             "chain_group_id": chain_group_id,
             "chain_index": idx,
-            "max_participants": max_participants,
-            "amount": amount,
-            "start_timestamp": None,
+            "max_participants": product["max_participants"],
+            "amount": product["base_amount"],
+            "start_timestamp": start_ts.isoformat() if idx == 1 else None,
             "description": f"{product['name']} - Cadena {chain_group_id} - Sesión {idx} ({operator_code})",
         }
-        res = db.insert("sessions_pool", data)
-        print(f"[OK] Sesión cadena {chain_group_id}.{idx} para operador {operator_code}: {res.data[0]['id']}")
 
 
-def create_standby_entries(product: dict, operator_code: str, count: int = 3):
+def standby_rows(product: dict, operator_code: str, count: int = 3) -> Iterator[dict]:
     """
-    Crea algunas entradas 'standby' sin cadena ni fecha de inicio.
+    Algunas entradas 'standby' sin cadena ni fecha de inicio.
     Estas sirven como sesiones futuras que el operador puede activar cuando quiera.
     """
-
-    amount = product["base_amount"]
-    max_participants = product["max_participants"]
-
     for i in range(1, count + 1):
-        data = {
+        yield {
+            "template_key": f"{product['product_id']}:{operator_code}:standby:{i}",
             "product_id": product["product_id"],
             "operator_code": operator_code,
             "type": "standby",
             "chain_group_id": None,
             "chain_index": None,
-            "max_participants": max_participants,
-            "amount": amount,
+            "max_participants": product["max_participants"],
+            "amount": product["base_amount"],
             "start_timestamp": None,
             "description": f"{product['name']} - Standby #{i} ({operator_code})",
         }
-        res = db.insert("sessions_pool", data)
-        print(f"[OK] Sesión standby creada para {product['name']} ({operator_code}): {res.data[0]['id']}")
 
 
-def seed_sessions_pool():
-    print("=== Iniciando seed de sessions_pool ===")
+def generate_templates(chains: int = 1, chain_length: int = 5, standby: int = 2) -> Iterator[dict]:
+    """
+    Todas las plantillas del parque, una a una (no se construye la lista).
+    Con chains > 1, cada cadena lleva un sufijo: XIPH15-00001, XIPH15-00002...
+    """
+    # El primer eslabón se activa dentro de 1 minuto.
+    start_ts = datetime.now(timezone.utc) + timedelta(minutes=1)
     for product in PRODUCTS:
         for op in OPERATORS:
-            # Cadenas automáticas por producto y operador
-            create_chain_entries_for_product(product, op, chain_length=5)
+            for n in range(1, chains + 1):
+                chain_group_id = product["chain_group_id"] if chains == 1 else f"{product['chain_group_id']}-{n:05d}"
+                yield from chain_rows(product, op, chain_group_id, start_ts, chain_length)
+            yield from standby_rows(product, op, standby)
+
 
-            # Algunas sesiones standby adicionales
-            create_standby_entries(product, op, count=2)
+def _batches(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
 
+
+def bulk_seed(db, rows: Iterable[dict], batch_size: int = DEFAULT_BATCH_SIZE, workers: int = DEFAULT_WORKERS) -> int:
+    """
+    Escribe las plantillas por lotes de batch_size filas (upsert sobre
+    template_key), con hasta workers lotes en vuelo a la vez. Solo hay en
+    memoria los lotes en vuelo, no todo el parque.
+    """
+    written = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = set()
+        for batch in _batches(rows, batch_size):
+            if len(in_flight) >= workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                written += sum(f.result() for f in done)
+            in_flight.add(executor.submit(_write_batch, db, batch))
+        written += sum(f.result() for f in wait(in_flight).done)
+    elapsed = time.perf_counter() - started
+    print(f"[OK] {written} plantillas en {elapsed:.1f} s ({written / elapsed if elapsed else 0:.0f} filas/s)")
+    return written
+
+
+def _write_batch(db, batch: List[dict]) -> int:
+    db.upsert_many("sessions_pool", batch, on_conflict="template_key", chunk_size=len(batch))
+    return len(batch)
+
+
+def seed_sessions_pool(
+    db=None,
+    chains: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = DEFAULT_WORKERS,
+) -> int:
+    print("=== Iniciando seed de sessions_pool ===")
+    # Cadenas automáticas por producto y operador, y algunas sesiones standby adicionales
+    written = bulk_seed(db or create_database_service(), generate_templates(chains), batch_size, workers)
     print("=== Seed de sessions_pool completado ===")
+    return written
 
 
 if __name__ == "__main__":
-    seed_sessions_pool()
+    parser = argparse.ArgumentParser(description="Seed de sessions_pool")
+    parser.add_argument("--chains", type=int, default=1, help="cadenas por producto y operador")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    args = parser.parse_args()
+    seed_sessions_pool(chains=args.chains, batch_size=args.batch_size, workers=args.workers)
@@ -1,12 +1,57 @@
 from .database import DatabaseService
 from models.purchase import Purchase
 from models.supplier import Supplier
-from models.adjudication import AdjudicationResult
+from models.adjudication import AdjudicationInput, AdjudicationResult, Participant
 from engine import AdjudicationEngine
+from utils.helpers import canonical_timestamp
+
+# Results of session adjudications (see sql/009_session_adjudications.sql).
+SESSION_ADJUDICATIONS_TABLE = "session_adjudications"
+
+
+def session_adjudication_input(session: dict, participant_rows) -> AdjudicationInput:
+    """
+    Builds the AdjudicationInput of a closed session from its 'sessions' row
+    and its 'participants' rows (in the order they are read, by id).
+
+    Mapping (also documented in sql/009_session_adjudications.sql):
+    - session_id, product_id: the session's id and product_id.
+    - group_id: the session's chain_group_id; a session outside a chain is
+      its own group (session_id).
+    - closing_timestamp: the session's closing_timestamp, canonicalised.
+    - participant_id: the participant row id, as text.
+    - ticket_number: the row's ticket_number; rows without one (NULL) get
+      their 1-based position in the read order.
+    - join_timestamp: the row's created_at, canonicalised.
+
+    Timestamps go through canonical_timestamp: the closing seed hashes
+    closing_timestamp as a string, so the REST and Postgres backends
+    (strings vs datetimes) must produce the same text. The exact input is
+    stored next to the result, so an audit never has to rebuild it.
+    """
+    participants = [
+        Participant(
+            participant_id=str(row["id"]),
+            ticket_number=position if row.get("ticket_number") is None else row["ticket_number"],
+            join_timestamp=canonical_timestamp(row.get("created_at")),
+        )
+        for position, row in enumerate(participant_rows, start=1)
+    ]
+    if not participants:
+        raise ValueError("Session has no participants.")
+
+    return AdjudicationInput(
+        session_id=str(session["id"]),
+        product_id=session["product_id"],
+        group_id=session.get("chain_group_id") or str(session["id"]),
+        closing_timestamp=canonical_timestamp(session["closing_timestamp"]),
+        participants=participants,
+    )
+
 
 class AdjudicationService:
-    def __init__(self):
-        self.db = DatabaseService()
+    def __init__(self, db: DatabaseService = None):
+        self.db = db or DatabaseService()
         self.engine = AdjudicationEngine()
 
     def run_for_purchase(self, purchase_id: str):
@@ -37,3 +82,41 @@ class AdjudicationService:
 
         self.db.insert("adjudications", result_model.dict())
         return result_model
+
+    def adjudicate(self, session_id: str) -> AdjudicationResult:
+        """
+        Runs the deterministic adjudication of a closed session (status
+        'complete', as left by SessionService) and moves it to 'adjudicated',
+        which lets the chain advance to the next session.
+
+        The input (see session_adjudication_input) and the result are stored
+        together in session_adjudications, one row per session, so a retried
+        adjudication overwrites the same row and an auditor can verify it
+        with verify_adjudications.py (worker records). The status change
+        only applies while the session is still 'complete'.
+        """
+        session_data = self.db.fetch_by_id("sessions", session_id)
+        if not session_data.data:
+            raise ValueError("Session not found.")
+
+        input_data = session_adjudication_input(
+            session_data.data[0], self.db.iter_rows("participants", [("eq", "session_id", session_id)])
+        )
+        result = self.engine.adjudicate_session(input_data)
+
+        self.db.upsert_many(
+            SESSION_ADJUDICATIONS_TABLE,
+            [{
+                "session_id": session_id,
+                "winner_participant_id": result.winner_participant_id,
+                "winner_ticket_number": result.winner_ticket_number,
+                "result_hash": result.result_hash,
+                "input": input_data.model_dump(mode="json"),
+                "result": result.model_dump(mode="json"),
+            }],
+            on_conflict="session_id",
+        )
+        self.db.update_many(
+            "sessions", [session_id], {"status": "adjudicated"}, filters=[("eq", "status", "complete")]
+        )
+        return result
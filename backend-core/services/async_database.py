@@ -0,0 +1,188 @@
+import asyncio
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence
+
+from postgrest.base_request_builder import APIResponse
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+from .database import (
+    DEFAULT_PAGE_SIZE,
+    GROUPED_COUNT_RPC,
+    IN_FILTER_CHUNK_SIZE,
+    RPC_NOT_FOUND_CODE,
+    Filter,
+    _apply_filters,
+    _chunks,
+    _filtered_query,
+)
+from .supabase_client import create_async_supabase_client
+
+
+# Peticiones simultáneas como máximo contra PostgREST por servicio.
+DEFAULT_MAX_IN_FLIGHT = 16
+
+
+class AsyncDatabaseService:
+    """
+    Variante asíncrona de DatabaseService (mismos métodos, awaitables) sobre
+    un cliente PostgREST asíncrono: el Supabase AsyncClient, o cualquier
+    objeto con table()/rpc() cuyo execute() sea awaitable.
+
+    Todas las peticiones pasan por un semáforo de max_in_flight: es la
+    contrapresión del worker asíncrono. Por muchas tareas que se lancen a la
+    vez, a la base de datos solo llegan max_in_flight consultas simultáneas;
+    el resto espera turno sin abrir más conexiones.
+
+        db = await AsyncDatabaseService.connect()
+        rows = await db.fetch_in("sessions", "id", ids)
+    """
+
+    def __init__(self, client, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        self.client = client
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        # Se desactiva tras el primer fallo si la función SQL no está instalada.
+        self._grouped_count_rpc_available = True
+
+    @classmethod
+    async def connect(cls, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> "AsyncDatabaseService":
+        return cls(await create_async_supabase_client(), max_in_flight=max_in_flight)
+
+    async def _execute(self, query):
+        async with self._in_flight:
+            return await query.execute()
+
+    async def insert(self, table: str, data: dict):
+        return await self._execute(self.client.table(table).insert(data))
+
+    async def fetch_all(self, table: str):
+        return APIResponse(data=[row async for row in self.iter_rows(table)], count=None)
+
+    async def fetch_by_id(self, table: str, record_id: str):
+        return await self._execute(self.client.table(table).select("*").eq("id", record_id))
+
+    async def fetch_by_field(self, table: str, field: str, value):
+        return await self._execute(self.client.table(table).select("*").eq(field, value))
+
+    async def fetch_filtered(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        columns: str = "*",
+        order: Sequence[str] = (),
+        limit: Optional[int] = None,
+        offset: int = 0,
+        count: bool = False,
+    ):
+        return await self._execute(
+            _filtered_query(self.client, table, filters, columns, order, limit, offset, count)
+        )
+
+    async def fetch_in(self, table: str, field: str, values: Iterable[Any], columns: str = "*") -> List[dict]:
+        """
+        Como DatabaseService.fetch_in, pero los bloques de IN (...) se piden a
+        la vez (dentro del límite de max_in_flight).
+        """
+        values = list(dict.fromkeys(values))
+        responses = await asyncio.gather(*(
+            self._execute(self.client.table(table).select(columns).in_(field, chunk))
+            for chunk in _chunks(values, IN_FILTER_CHUNK_SIZE)
+        ))
+        return [row for response in responses for row in response.data or []]
+
+    async def iter_rows(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        columns: str = "*",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        key: str = "id",
+    ) -> AsyncIterator[dict]:
+        """
+        Ver DatabaseService.iter_rows (paginación por clave). Las páginas van
+        una tras otra: cada una depende de la última clave de la anterior.
+        """
+        selected = {c.strip() for c in columns.split(",")}
+        if "*" not in selected and key not in selected:
+            columns = f"{key},{columns}"
+        last = None
+        while True:
+            query = _apply_filters(self.client.table(table).select(columns), filters)
+            if last is not None:
+                query = query.gt(key, last)
+            response = await self._execute(query.order(key).limit(page_size))
+            rows = response.data or []
+            for row in rows:
+                yield row
+            if len(rows) < page_size:
+                return
+            last = rows[-1][key]
+
+    async def count_by_field(self, table: str, field: str, value) -> int:
+        response = await self._execute(
+            self.client.table(table).select(field, count="exact").eq(field, value).limit(1)
+        )
+        return response.count or 0
+
+    async def count_filtered(self, table: str, filters: Sequence[Filter] = ()) -> int:
+        response = await self.fetch_filtered(table, filters, columns="id", limit=1, count=True)
+        return response.count or 0
+
+    async def count_by_field_many(self, table: str, field: str, values: Iterable[Any]) -> Dict[Any, int]:
+        """
+        Ver DatabaseService.count_by_field_many (misma función SQL y mismo respaldo).
+        """
+        values = list(dict.fromkeys(values))
+        counts = {value: 0 for value in values}
+        if not values:
+            return counts
+
+        if self._grouped_count_rpc_available:
+            try:
+                response = await self._execute(self.client.rpc(
+                    GROUPED_COUNT_RPC,
+                    {"p_table": table, "p_field": field, "p_values": [str(v) for v in values]},
+                ))
+            except APIError as e:
+                if e.code != RPC_NOT_FOUND_CODE:
+                    raise
+                print(f"[DB] {GROUPED_COUNT_RPC} no instalada; se usa el conteo por bloques.")
+                self._grouped_count_rpc_available = False
+            else:
+                by_text = {str(v): v for v in values}
+                for row in response.data or []:
+                    counts[by_text[row["value"]]] = row["row_count"]
+                return counts
+
+        rows = await self.fetch_in(table, field, values, columns=field)
+        counts.update(Counter(row[field] for row in rows))
+        return counts
+
+    async def rpc(self, function: str, params: dict):
+        return await self._execute(self.client.rpc(function, params))
+
+    async def update(self, table: str, record_id: str, data: dict):
+        return await self._execute(self.client.table(table).update(data).eq("id", record_id))
+
+    async def update_many(
+        self,
+        table: str,
+        record_ids: Iterable[str],
+        data: dict,
+        filters: Sequence[Filter] = (),
+        chunk_size: int = IN_FILTER_CHUNK_SIZE,
+        returning: bool = False,
+    ) -> List[dict]:
+        """
+        Ver DatabaseService.update_many; los bloques se envían a la vez.
+        """
+        method = ReturnMethod.representation if returning else ReturnMethod.minimal
+        queries = []
+        for chunk in _chunks(list(dict.fromkeys(record_ids)), chunk_size):
+            query = self.client.table(table).update(data, returning=method).in_("id", chunk)
+            queries.append(_apply_filters(query, filters))
+        responses = await asyncio.gather(*(self._execute(q) for q in queries))
+        return [row for response in responses for row in response.data or []] if returning else []
+
+    async def delete(self, table: str, record_id: str):
+        return await self._execute(self.client.table(table).delete().eq("id", record_id))
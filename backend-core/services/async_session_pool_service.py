@@ -0,0 +1,132 @@
+import asyncio
+import time
+from typing import List
+
+from postgrest.exceptions import APIError
+
+from services.async_database import AsyncDatabaseService
+from services.chain_index import CHAIN_TEMPLATE_COLUMNS, ChainIndex
+from services.database import IN_FILTER_CHUNK_SIZE, RELATIONSHIP_NOT_FOUND_CODE, UNIQUE_VIOLATION_CODE
+from services.deadline_scheduler import DeadlineScheduler, Watermark, schedule_rows
+from services.session_pool_service import session_from_pool
+
+
+class AsyncSessionPoolService:
+    """
+    Variante asíncrona de SessionPoolService (activación de plantillas
+    programadas y avance de cadenas), sobre AsyncDatabaseService.
+
+    Misma lógica y mismas consultas que la versión síncrona; lo que cambia es
+    que las sesiones de un lote (activaciones vencidas, siguientes eslabones
+    de cadena) se crean a la vez, limitadas por el semáforo de la base de datos.
+    """
+
+    def __init__(self, db: AsyncDatabaseService):
+        self.db = db
+        # Se desactiva tras el primer fallo si falta la clave foránea sessions.pool_id.
+        self._anti_join_available = True
+        # El índice no consulta por sí mismo: se alimenta con load() (ver _refresh_chains).
+        self.chains = ChainIndex(None)
+        self.activations = DeadlineScheduler()
+        self._activations_watermark = Watermark()
+
+    async def _fetch_unactivated_scheduled(self, filters: List[tuple], columns: str = "*") -> List[dict]:
+        """
+        Ver SessionPoolService._fetch_unactivated_scheduled (anti-join con
+        sessions y respaldo pool_id IN (...)).
+        """
+        filters = [("eq", "type", "scheduled")] + list(filters)
+
+        if self._anti_join_available:
+            try:
+                entries = [
+                    row async for row in self.db.iter_rows(
+                        "sessions_pool",
+                        filters + [("is", "sessions", "null")],
+                        columns=f"{columns}, sessions(id)",
+                    )
+                ]
+            except APIError as e:
+                if e.code != RELATIONSHIP_NOT_FOUND_CODE:
+                    raise
+                print("[POOL] sin relación sessions.pool_id → sessions_pool.id; se usa pool_id IN (...).")
+                self._anti_join_available = False
+            else:
+                for row in entries:
+                    row.pop("sessions", None)
+                return entries
+
+        entries = [row async for row in self.db.iter_rows("sessions_pool", filters, columns=columns)]
+        activated = {
+            s["pool_id"]
+            for s in await self.db.fetch_in("sessions", "pool_id", [row["id"] for row in entries], columns="pool_id")
+        }
+        return [row for row in entries if row["id"] not in activated]
+
+    async def refresh_activations(self):
+        full = self._activations_watermark.full_load_due()
+        activations = DeadlineScheduler() if full else self.activations
+        rows = await self._fetch_unactivated_scheduled(
+            self._activations_watermark.filters(),
+            columns="id,start_timestamp,created_at",
+        )
+        latest = schedule_rows(activations, rows, "start_timestamp")
+        self.activations = activations
+        self._activations_watermark.advance(latest, full)
+
+    async def _create_session_from_pool(self, pool_row: dict, auto_generated: bool):
+        try:
+            await self.db.insert("sessions", session_from_pool(pool_row, auto_generated))
+        except APIError as e:
+            # Otro worker ya activó la plantilla (restricción única sessions.pool_id).
+            if e.code != UNIQUE_VIOLATION_CODE:
+                raise
+
+    async def _create_sessions_from_pool(self, pool_rows: List[dict], auto_generated: bool):
+        await asyncio.gather(*(self._create_session_from_pool(row, auto_generated) for row in pool_rows))
+
+    async def process_scheduled_sessions(self):
+        """
+        Ver SessionPoolService.process_scheduled_sessions.
+        """
+        await self.refresh_activations()
+        due = self.activations.pop_due(time.time())
+        batches = await asyncio.gather(*(
+            self._fetch_unactivated_scheduled([("in", "id", due[start:start + IN_FILTER_CHUNK_SIZE])])
+            for start in range(0, len(due), IN_FILTER_CHUNK_SIZE)
+        ))
+        await self._create_sessions_from_pool([row for batch in batches for row in batch], auto_generated=False)
+
+    async def _refresh_chains(self):
+        full = self.chains.full_load_due()
+        rows = [
+            row async for row in self.db.iter_rows(
+                "sessions_pool", self.chains.filters(), columns=CHAIN_TEMPLATE_COLUMNS
+            )
+        ]
+        self.chains.load(rows, full)
+
+    async def advance_chains(self, sessions: List[dict]):
+        """
+        Ver SessionPoolService.advance_chains.
+        """
+        if not sessions:
+            return
+
+        await self._refresh_chains()
+        successors = {}
+        for session in sessions:
+            pool_row = self.chains.next_for(session)
+            if pool_row:
+                successors[pool_row["id"]] = pool_row
+
+        existing = {
+            row["pool_id"]
+            for row in await self.db.fetch_in("sessions", "pool_id", list(successors), columns="pool_id")
+        }
+        await self._create_sessions_from_pool(
+            [pool_row for pool_id, pool_row in successors.items() if pool_id not in existing],
+            auto_generated=True,
+        )
+
+        await self.db.update_many("sessions", [s["id"] for s in sessions], {"chain_advanced": True})
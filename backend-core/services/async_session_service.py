@@ -0,0 +1,190 @@
+import asyncio
+import inspect
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from services.adjudication_service import SESSION_ADJUDICATIONS_TABLE
+from services.async_database import AsyncDatabaseService
+from services.async_session_pool_service import AsyncSessionPoolService
+from services.deadline_scheduler import DeadlineScheduler, Watermark, parse_deadline, schedule_rows
+from services.session_service import RECOVERY_GRACE_SECONDS
+
+
+# Adjudicaciones simultáneas como máximo por tick.
+DEFAULT_MAX_CONCURRENT_ADJUDICATIONS = 8
+
+
+class AsyncSessionService:
+    """
+    Variante asíncrona de SessionService (caducidad, cierre, adjudicación y
+    encadenado de sesiones), sobre AsyncDatabaseService.
+
+    Mismas transiciones y mismas consultas en bloque que la versión
+    síncrona, pero sin esperas en serie:
+    - la caducidad y la comprobación de aforo de un tick van a la vez, así
+      que una consulta lenta de una no retrasa a la otra;
+    - cada sesión llena se adjudica en su propia tarea, con como mucho
+      max_concurrent_adjudications a la vez (contrapresión: las demás
+      esperan turno en el semáforo).
+
+    adjudication_service.adjudicate(session_id) puede ser una corrutina o
+    una función bloqueante; en ese caso se ejecuta en un hilo aparte para no
+    parar el bucle de eventos.
+    """
+
+    def __init__(
+        self,
+        db: AsyncDatabaseService,
+        adjudication_service,
+        pool: AsyncSessionPoolService = None,
+        max_concurrent_adjudications: int = DEFAULT_MAX_CONCURRENT_ADJUDICATIONS,
+    ):
+        self.db = db
+        self.adjudication_service = adjudication_service
+        self.pool = pool or AsyncSessionPoolService(db=self.db)
+        self.expiries = DeadlineScheduler()
+        self._expiries_watermark = Watermark()
+        self.recovery_grace_seconds = RECOVERY_GRACE_SECONDS
+        self._adjudication_slots = asyncio.Semaphore(max_concurrent_adjudications)
+
+    async def _get_open_sessions(self) -> List[dict]:
+        return [
+            s async for s in self.db.iter_rows(
+                "sessions", [("eq", "status", "open")], columns="id,max_participants,expiry_timestamp"
+            )
+        ]
+
+    async def refresh_expiries(self):
+        """
+        Ver SessionService.refresh_expiries.
+        """
+        full = self._expiries_watermark.full_load_due()
+        expiries = DeadlineScheduler() if full else self.expiries
+        rows = [
+            row async for row in self.db.iter_rows(
+                "sessions",
+                [("eq", "status", "open")] + self._expiries_watermark.filters(),
+                columns="id,expiry_timestamp,created_at",
+            )
+        ]
+        latest = schedule_rows(expiries, rows, "expiry_timestamp")
+        self.expiries = expiries
+        self._expiries_watermark.advance(latest, full)
+
+    async def _count_participants(self, sessions: List[dict]) -> Dict[str, int]:
+        return await self.db.count_by_field_many("participants", "session_id", [s["id"] for s in sessions])
+
+    async def _close_sessions(self, sessions: List[dict]) -> List[dict]:
+        """
+        Compare-and-set, como SessionService._close_sessions: devuelve solo
+        las sesiones que ha cerrado esta llamada.
+        """
+        if not sessions:
+            return []
+        closing_ts = datetime.now(timezone.utc).isoformat()
+        for s in sessions:
+            self.expiries.cancel(s["id"])
+        return await self.db.update_many(
+            "sessions",
+            [s["id"] for s in sessions],
+            {
+                "status": "complete",
+                "closing_timestamp": closing_ts,
+            },
+            filters=[("eq", "status", "open")],
+            returning=True,
+        )
+
+    async def _expire_sessions(self, session_ids: List[str]):
+        if not session_ids:
+            return
+        for session_id in session_ids:
+            self.expiries.cancel(session_id)
+        await self.db.update_many(
+            "sessions",
+            session_ids,
+            {"status": "expired"},
+            filters=[("eq", "status", "open")],
+        )
+
+    async def _adjudicate(self, session_id: str):
+        async with self._adjudication_slots:
+            adjudicate = self.adjudication_service.adjudicate
+            if inspect.iscoroutinefunction(adjudicate):
+                return await adjudicate(session_id)
+            return await asyncio.to_thread(adjudicate, session_id)
+
+    async def process_open_sessions(self):
+        """
+        Ver SessionService.process_open_sessions. La lectura de plazos y la
+        de sesiones abiertas salen a la vez; después se caducan las vencidas
+        y, a la vez, se cierran y adjudican las llenas del resto.
+
+        Las vencidas que el planificador no tenía se detectan por su
+        expiry_timestamp y también se caducan (nunca se cierran).
+        """
+        _, _, open_sessions = await asyncio.gather(
+            self.recover_unadjudicated_sessions(), self.refresh_expiries(), self._get_open_sessions()
+        )
+        now = time.time()
+        expired = set(self.expiries.pop_due(now))
+        in_time = []
+        for session in open_sessions:
+            if session["id"] in expired:
+                continue
+            deadline = parse_deadline(session.get("expiry_timestamp"))
+            if deadline is not None and deadline <= now:
+                expired.add(session["id"])
+            else:
+                in_time.append(session)
+        await asyncio.gather(
+            self._expire_sessions(list(expired)),
+            self._close_full_sessions(in_time),
+        )
+
+    async def _close_full_sessions(self, in_time: List[dict]):
+        counts = await self._count_participants(in_time)
+        full = [s for s in in_time if counts[s["id"]] >= s["max_participants"]]
+        # Los cierres se escriben antes de adjudicar, como en la versión síncrona.
+        closed = await self._close_sessions(full)
+        await self._adjudicate_sessions([s["id"] for s in closed])
+
+    async def _adjudicate_sessions(self, session_ids: List[str]):
+        results = await asyncio.gather(
+            *(self._adjudicate(session_id) for session_id in session_ids), return_exceptions=True
+        )
+        for session_id, result in zip(session_ids, results):
+            # Un fallo en una adjudicación no cancela las demás.
+            if isinstance(result, Exception):
+                print(f"[WORKER ERROR] adjudicación de {session_id}: {result}")
+
+    def _stuck_filters(self) -> list:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.recovery_grace_seconds)
+        return [("eq", "status", "complete"), ("lt", "closing_timestamp", cutoff.isoformat())]
+
+    async def recover_unadjudicated_sessions(self):
+        """
+        Ver SessionService.recover_unadjudicated_sessions.
+        """
+        complete = [
+            s["id"] async for s in self.db.iter_rows("sessions", self._stuck_filters(), columns="id")
+        ]
+        if not complete:
+            return
+        stored = {
+            row["session_id"]
+            for row in await self.db.fetch_in(SESSION_ADJUDICATIONS_TABLE, "session_id", complete, columns="session_id")
+        }
+        if stored:
+            await self.db.update_many(
+                "sessions", sorted(stored), {"status": "adjudicated"}, filters=[("eq", "status", "complete")]
+            )
+        await self._adjudicate_sessions([session_id for session_id in complete if session_id not in stored])
+
+    async def process_chains_for_adjudicated_sessions(self):
+        result = await self.db.fetch_filtered(
+            "sessions",
+            [("eq", "status", "adjudicated"), ("eq", "chain_advanced", False)],
+        )
+        await self.pool.advance_chains(result.data or [])
@@ -0,0 +1,82 @@
+from typing import Dict, Optional, Tuple
+
+from services.database import DatabaseService
+from services.deadline_scheduler import Watermark
+
+
+ChainKey = Tuple[str, Optional[str], int]
+
+# Columnas de sessions_pool que necesitan el índice y session_from_pool.
+CHAIN_TEMPLATE_COLUMNS = "id,product_id,operator_code,max_participants,amount,chain_group_id,chain_index,created_at"
+
+
+class ChainIndex:
+    """
+    Índice en memoria de las plantillas de cadena de sessions_pool, por
+    (chain_group_id, operator_code, chain_index).
+
+    - La primera llamada a refresh() carga todas las plantillas, página a
+      página (iter_rows) y solo con CHAIN_TEMPLATE_COLUMNS; la marca de
+      agua se fija al terminar.
+    - Las siguientes solo piden las filas creadas desde la marca de agua
+      (ver Watermark: con solape para las filas confirmadas tarde y una
+      recarga completa periódica), así que cuestan lo que las plantillas
+      nuevas, no lo que el parque entero.
+
+    La siguiente plantilla de una sesión X23.n se resuelve en O(1) y respeta
+    el operador: cada operador tiene su propia cadena con el mismo
+    chain_group_id (ver seed_sessions_pool.py).
+    """
+
+    def __init__(self, db: Optional[DatabaseService]):
+        self.db = db
+        self._templates: Dict[ChainKey, dict] = {}
+        self._watermark = Watermark()
+
+    def refresh(self):
+        full = self.full_load_due()
+        self.load(self.db.iter_rows("sessions_pool", self.filters(), columns=CHAIN_TEMPLATE_COLUMNS), full)
+
+    def full_load_due(self) -> bool:
+        return self._watermark.full_load_due()
+
+    def filters(self) -> list:
+        return self._watermark.filters()
+
+    def load(self, rows, full: bool):
+        """
+        Incorpora filas de sessions_pool al índice y avanza la marca de agua.
+        full indica si rows es una carga completa (el índice se rehace y
+        sustituye al anterior al terminar). Lo usa también la variante
+        asíncrona, que hace la consulta por su cuenta con full_load_due() y
+        filters().
+        """
+        templates = {} if full else self._templates
+        latest = None
+        for row in rows:
+            created_at = row.get("created_at")
+            if created_at and (latest is None or created_at > latest):
+                latest = created_at
+            if not row.get("chain_group_id") or row.get("chain_index") is None:
+                continue
+            # Si hubiera dos plantillas con la misma clave, gana la primera vista.
+            templates.setdefault((row["chain_group_id"], row.get("operator_code"), row["chain_index"]), row)
+        self._templates = templates
+        self._watermark.advance(latest, full)
+
+    def get(self, chain_group_id: str, operator_code: Optional[str], chain_index: int) -> Optional[dict]:
+        return self._templates.get((chain_group_id, operator_code, chain_index))
+
+    def next_for(self, session: dict) -> Optional[dict]:
+        """
+        Plantilla del siguiente eslabón de la cadena de una sesión, o None si
+        la sesión no pertenece a una cadena o la cadena se ha terminado.
+        """
+        chain_group_id = session.get("chain_group_id")
+        chain_index = session.get("chain_index")
+        if not chain_group_id or chain_index is None:
+            return None
+        return self.get(chain_group_id, session.get("operator_code"), chain_index + 1)
+
+    def __len__(self) -> int:
+        return len(self._templates)
@@ -0,0 +1,116 @@
+"""
+Feeds de cambios de la base de datos para el worker en modo eventos.
+
+- PostgresChangeFeed: LISTEN sobre el canal que alimentan los triggers de
+  sql/004_change_notifications.sql (requiere psycopg y DATABASE_URL).
+- LocalChangeFeed: cola en proceso con la misma interfaz, para tests,
+  benchmarks y desarrollo sin Postgres.
+
+Un evento es un ChangeEvent(table, op, row), donde row solo lleva las
+columnas que necesita el worker (id, session_id, status, timestamps...).
+RESYNC avisa de que se han podido perder eventos (p. ej. tras reconectar):
+quien lo reciba debe releer todo en lugar de fiarse de los eventos.
+"""
+
+import json
+import queue
+from abc import ABC, abstractmethod
+from typing import List, NamedTuple, Optional
+
+
+CHANGE_CHANNEL = "platform_changes"
+
+
+class ChangeEvent(NamedTuple):
+    table: str
+    op: str  # "INSERT" | "UPDATE" | "DELETE"
+    row: dict
+
+
+RESYNC = ChangeEvent("*", "RESYNC", {})
+
+
+class ChangeFeed(ABC):
+    @abstractmethod
+    def wait(self, timeout: Optional[float]) -> List[ChangeEvent]:
+        """
+        Bloquea hasta que llegue al menos un evento o venza timeout (segundos;
+        None = sin límite) y devuelve todos los eventos disponibles.
+        """
+
+    def close(self):
+        pass
+
+
+class LocalChangeFeed(ChangeFeed):
+    def __init__(self):
+        self._events: "queue.Queue[ChangeEvent]" = queue.Queue()
+
+    def publish(self, table: str, op: str, row: dict):
+        self._events.put(ChangeEvent(table, op, dict(row)))
+
+    def wait(self, timeout: Optional[float]) -> List[ChangeEvent]:
+        try:
+            events = [self._events.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+
+class PostgresChangeFeed(ChangeFeed):
+    """
+    LISTEN platform_changes sobre una conexión directa a Postgres (la API
+    REST de Supabase no entrega notificaciones).
+
+    Si la conexión se pierde, wait() reconecta, vuelve a hacer LISTEN y
+    devuelve [RESYNC]: las notificaciones de ese intervalo se han perdido.
+    Si no consigue reconectar, la excepción sale de wait() y la siguiente
+    llamada lo vuelve a intentar.
+    """
+
+    def __init__(self, dsn: str, channel: str = CHANGE_CHANNEL):
+        try:
+            import psycopg
+        except ImportError as e:
+            raise ImportError("El modo eventos con Postgres requiere psycopg (pip install 'psycopg[binary]').") from e
+
+        self._psycopg = psycopg
+        self._dsn = dsn
+        self._channel = channel
+        self._conn = None
+        self._connect()
+
+    def _connect(self):
+        conn = self._psycopg.connect(self._dsn, autocommit=True)
+        conn.execute(f"LISTEN {self._channel}")
+        self._conn = conn
+
+    def wait(self, timeout: Optional[float]) -> List[ChangeEvent]:
+        try:
+            if self._conn is None:
+                raise self._psycopg.OperationalError("sin conexión")
+            # Se espera a la primera notificación y luego se recoge, sin
+            # esperar, lo que ya esté encolado en la conexión.
+            notifies = list(self._conn.notifies(timeout=timeout, stop_after=1))
+            if notifies:
+                notifies += self._conn.notifies(timeout=0)
+        except self._psycopg.OperationalError:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._connect()
+            return [RESYNC]
+        return [_parse_payload(n.payload) for n in notifies]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+
+
+def _parse_payload(payload: str) -> ChangeEvent:
+    data = json.loads(payload)
+    return ChangeEvent(data["table"], data["op"], data.get("row") or {})
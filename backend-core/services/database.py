@@ -1,15 +1,138 @@
-from .supabase_client import SupabaseConnection
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from postgrest.base_request_builder import APIResponse
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+from .supabase_client import get_shared_client
+
+
+# Función SQL de conteo agrupado (ver sql/001_count_rows_grouped.sql).
+GROUPED_COUNT_RPC = "count_rows_grouped"
+# Código de PostgREST para "función no encontrada en la caché de esquema".
+RPC_NOT_FOUND_CODE = "PGRST202"
+# Código de PostgREST para "no hay relación (clave foránea) entre las tablas".
+RELATIONSHIP_NOT_FOUND_CODE = "PGRST200"
+# Código SQLSTATE de Postgres para "valor duplicado en una restricción única".
+UNIQUE_VIOLATION_CODE = "23505"
+
+# Valores por filtro in_() en las consultas de respaldo: la lista viaja en la
+# URL, así que se trocea para no superar el límite de longitud del proxy.
+IN_FILTER_CHUNK_SIZE = 200
+
+# Filas por página en iter_rows. Es el max-rows por defecto de Supabase: una
+# página mayor llegaría recortada por el servidor y se tomaría por la última.
+DEFAULT_PAGE_SIZE = 1000
+
+# Función SQL de conteo de valores distintos (ver sql/007_dashboard_queries.sql).
+COUNT_DISTINCT_RPC = "count_distinct_values"
+
+# Filtro de consulta: (operador, campo, valor), p. ej. ("lte", "start_timestamp", ahora).
+# Operadores: los del query builder de postgrest (eq, neq, lt, lte, gt, gte,
+# in, is, ilike), más range: valor (desde, hasta), ambos inclusive; un
+# extremo None no se aplica.
+#   ("ilike", "product_id", "%cafe%")
+#   ("range", "created_at", (desde_iso, None))
+Filter = Tuple[str, str, Any]
+
+# Operadores cuyo método en el query builder lleva guion bajo (palabras reservadas).
+_FILTER_METHODS = {"in": "in_", "is": "is_"}
+
+
+def like_escape(text: str) -> str:
+    """
+    Texto que el usuario escribe, para buscarlo literalmente dentro de un
+    patrón ilike: escapa \\, % y _ con \\ (el escape por defecto de LIKE).
+        ("ilike", "product_id", f"%{like_escape(texto)}%")
+    """
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _chunks(values: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _apply_filters(query, filters: Sequence[Filter]):
+    for op, field, value in filters:
+        if op == "range":
+            low, high = value
+            if low is not None:
+                query = query.gte(field, low)
+            if high is not None:
+                query = query.lte(field, high)
+            continue
+        query = getattr(query, _FILTER_METHODS.get(op, op))(field, value)
+    return query
+
+
+def _filtered_query(
+    client,
+    table: str,
+    filters: Sequence[Filter] = (),
+    columns: str = "*",
+    order: Sequence[str] = (),
+    limit: Optional[int] = None,
+    offset: int = 0,
+    count: bool = False,
+):
+    """
+    Query builder de fetch_filtered (compartido con la variante asíncrona).
+    order: columnas de ordenación, con "-" delante para descendente.
+    """
+    query = _apply_filters(client.table(table).select(columns, count="exact" if count else None), filters)
+    for column in order:
+        query = query.order(column.lstrip("-"), desc=column.startswith("-"))
+    if limit is not None:
+        query = query.range(offset, offset + limit - 1)
+    return query
 
 
 class DatabaseService:
-    def __init__(self):
-        self.client = SupabaseConnection().get_client()
+    def __init__(self, client=None):
+        # Sin cliente explícito se usa el del proceso (un único pool de
+        # conexiones compartido, ver supabase_client.get_shared_client).
+        self.client = client or get_shared_client()
+        # Se desactivan tras el primer fallo si la función SQL no está instalada.
+        self._grouped_count_rpc_available = True
+        self._count_distinct_rpc_available = True
 
     def insert(self, table: str, data: dict):
         return self.client.table(table).insert(data).execute()
 
+    def upsert_many(
+        self,
+        table: str,
+        rows: Sequence[dict],
+        on_conflict: str,
+        chunk_size: int = DEFAULT_PAGE_SIZE,
+        returning: bool = False,
+    ) -> List[dict]:
+        """
+        INSERT ... ON CONFLICT (on_conflict) DO UPDATE de varias filas, con un
+        INSERT de varias filas por bloque de chunk_size en lugar de uno por
+        fila. on_conflict es la columna de una restricción única (clave
+        natural), así que repetir la carga no duplica filas.
+
+        Por defecto no descarga las filas escritas (return=minimal).
+        """
+        method = ReturnMethod.representation if returning else ReturnMethod.minimal
+        written: List[dict] = []
+        for chunk in _chunks(list(rows), chunk_size):
+            response = self.client.table(table).upsert(chunk, on_conflict=on_conflict, returning=method).execute()
+            if returning:
+                written.extend(response.data or [])
+        return written
+
     def fetch_all(self, table: str):
-        return self.client.table(table).select("*").execute()
+        """
+        Todas las filas de la tabla, paginadas con iter_rows: un select("*")
+        sin más se queda en las primeras max-rows filas sin avisar.
+        Para tablas grandes es mejor recorrer iter_rows directamente.
+        """
+        return APIResponse(data=list(self.iter_rows(table)), count=None)
 
     def fetch_by_id(self, table: str, record_id: str):
         return self.client.table(table).select("*").eq("id", record_id).execute()
@@ -20,17 +143,226 @@ class DatabaseService:
         """
         return self.client.table(table).select("*").eq(field, value).execute()
 
+    def fetch_filtered(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        columns: str = "*",
+        order: Sequence[str] = (),
+        limit: Optional[int] = None,
+        offset: int = 0,
+        count: bool = False,
+    ):
+        """
+        Búsqueda con varios filtros resueltos en base de datos, y solo las
+        columnas indicadas.
+
+            db.fetch_filtered(
+                "sessions_pool",
+                [("eq", "type", "scheduled"), ("lte", "start_timestamp", now_iso)],
+            )
+
+        Para paginar (p. ej. en el dashboard): order ("-created_at" =
+        descendente), limit/offset, y count=True para recibir en .count el
+        total de filas que cumplen los filtros, no solo las de la página.
+        """
+        return _filtered_query(self.client, table, filters, columns, order, limit, offset, count).execute()
+
+    def fetch_in(self, table: str, field: str, values: Iterable[Any], columns: str = "*") -> List[dict]:
+        """
+        Filas cuyo field está en values (WHERE field IN (...)), en una consulta
+        por bloque de IN_FILTER_CHUNK_SIZE valores en lugar de una por valor.
+        """
+        values = list(dict.fromkeys(values))
+        rows: List[dict] = []
+        for chunk in _chunks(values, IN_FILTER_CHUNK_SIZE):
+            response = self.client.table(table).select(columns).in_(field, chunk).execute()
+            rows.extend(response.data or [])
+        return rows
+
+    def iter_rows(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        columns: str = "*",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        key: str = "id",
+    ) -> Iterator[dict]:
+        """
+        Recorre las filas página a página con paginación por clave (keyset):
+        ... WHERE key > última_vista ORDER BY key LIMIT page_size. Cada página
+        cuesta lo mismo aunque la tabla crezca (a diferencia de OFFSET) y en
+        memoria solo hay una página a la vez.
+
+        key debe ser única y estar indexada (por defecto la clave primaria);
+        si no está en columns, se pide también.
+
+            for row in db.iter_rows("sessions", [("eq", "status", "open")], columns="id,status"):
+                ...
+        """
+        selected = {c.strip() for c in columns.split(",")}
+        if "*" not in selected and key not in selected:
+            columns = f"{key},{columns}"
+        last = None
+        while True:
+            query = _apply_filters(self.client.table(table).select(columns), filters)
+            if last is not None:
+                query = query.gt(key, last)
+            rows = query.order(key).limit(page_size).execute().data or []
+            yield from rows
+            if len(rows) < page_size:
+                return
+            last = rows[-1][key]
+
     def count_by_field(self, table: str, field: str, value) -> int:
         """
         Cuenta filas por campo (usa count='exact' del cliente Supabase).
+
+        Solo se pide la columna del filtro y limit(1): el total llega en la
+        cabecera Content-Range, sin descargar las filas. (Una petición HEAD
+        pura no sirve: postgrest-py descarta el count al no poder parsear
+        un cuerpo vacío.)
         """
-        response = self.client.table(table).select("*", count="exact").eq(field, value).execute()
-        # En la librería oficial, response.count contiene el número de filas si se usa count="exact"
+        response = (
+            self.client.table(table)
+            .select(field, count="exact")
+            .eq(field, value)
+            .limit(1)
+            .execute()
+        )
         return response.count or 0
 
+    def count_filtered(self, table: str, filters: Sequence[Filter] = ()) -> int:
+        """
+        Filas que cumplen los filtros (count='exact' y limit(1), como
+        count_by_field).
+        """
+        return self.fetch_filtered(table, filters, columns="id", limit=1, count=True).count or 0
+
+    def count_distinct(self, table: str, field: str) -> int:
+        """
+        Número de valores distintos (no nulos) de una columna, p. ej. cadenas
+        configuradas en sessions_pool.
+
+        Usa la función SQL count_distinct_values; si no está instalada,
+        recorre solo esa columna con iter_rows y cuenta aquí.
+        """
+        if self._count_distinct_rpc_available:
+            try:
+                response = self.client.rpc(COUNT_DISTINCT_RPC, {"p_table": table, "p_field": field}).execute()
+            except APIError as e:
+                if e.code != RPC_NOT_FOUND_CODE:
+                    raise
+                print(f"[DB] {COUNT_DISTINCT_RPC} no instalada; se cuentan los valores aquí.")
+                self._count_distinct_rpc_available = False
+            else:
+                return response.data or 0
+        return len({row[field] for row in self.iter_rows(table, columns=field) if row.get(field) is not None})
+
+    def count_by_field_many(self, table: str, field: str, values: Iterable[Any]) -> Dict[Any, int]:
+        """
+        Cuenta filas agrupadas por campo para un conjunto de valores, p. ej.
+        participantes por sesión: {session_id: número_de_participantes}.
+
+        Todos los valores pedidos aparecen en el resultado (0 si no hay filas).
+
+        Usa la función SQL count_rows_grouped (un GROUP BY en base de datos,
+        una sola llamada para todos los valores). Si la función no está
+        instalada, cae a pedir solo la columna field con filtros in_() por
+        bloques y contar aquí: sigue siendo una consulta por bloque, no una
+        por valor, aunque transfiere una fila por registro contado.
+        """
+        values = list(dict.fromkeys(values))
+        counts = {value: 0 for value in values}
+        if not values:
+            return counts
+
+        if self._grouped_count_rpc_available:
+            try:
+                response = self.client.rpc(
+                    GROUPED_COUNT_RPC,
+                    {"p_table": table, "p_field": field, "p_values": [str(v) for v in values]},
+                ).execute()
+            except APIError as e:
+                if e.code != RPC_NOT_FOUND_CODE:
+                    raise
+                print(f"[DB] {GROUPED_COUNT_RPC} no instalada; se usa el conteo por bloques.")
+                self._grouped_count_rpc_available = False
+            else:
+                # La función devuelve los valores como texto.
+                by_text = {str(v): v for v in values}
+                for row in response.data or []:
+                    counts[by_text[row["value"]]] = row["row_count"]
+                return counts
+
+        counts.update(Counter(row[field] for row in self.fetch_in(table, field, values, columns=field)))
+        return counts
+
+    def rpc(self, function: str, params: dict):
+        """
+        Llama a una función SQL expuesta por PostgREST (POST /rpc/<función>).
+        """
+        return self.client.rpc(function, params).execute()
+
     def update(self, table: str, record_id: str, data: dict):
         return self.client.table(table).update(data).eq("id", record_id).execute()
 
+    def update_many(
+        self,
+        table: str,
+        record_ids: Iterable[str],
+        data: dict,
+        filters: Sequence[Filter] = (),
+        chunk_size: int = IN_FILTER_CHUNK_SIZE,
+        returning: bool = False,
+    ) -> List[dict]:
+        """
+        Aplica el mismo cambio a varias filas por id: un UPDATE ... WHERE id IN (...)
+        por bloque de chunk_size ids, en lugar de uno por fila.
+
+        filters añade condiciones al WHERE (p. ej. [("eq", "status", "open")]),
+        de modo que las filas que ya no las cumplen no se tocan.
+
+        Por defecto usa return=minimal: no se descargan las filas
+        actualizadas. Con returning=True devuelve las filas que de verdad se
+        han actualizado; junto con filters es un compare-and-set: si otro
+        worker ya hizo la transición, su fila no aparece.
+        """
+        record_ids = list(dict.fromkeys(record_ids))
+        method = ReturnMethod.representation if returning else ReturnMethod.minimal
+        updated: List[dict] = []
+        for chunk in _chunks(record_ids, chunk_size):
+            query = self.client.table(table).update(data, returning=method).in_("id", chunk)
+            response = _apply_filters(query, filters).execute()
+            if returning:
+                updated.extend(response.data or [])
+        return updated
+
     def delete(self, table: str, record_id: str):
         return self.client.table(table).delete().eq("id", record_id).execute()
 
+
+def create_database_service():
+    """
+    Backend de base de datos según DB_BACKEND:
+    - "postgrest" (por defecto): DatabaseService sobre la API REST de Supabase.
+    - "postgres": PostgresDatabaseService con conexión directa (DATABASE_URL),
+      para el worker y los procesos masivos (ver services/postgres_database.py).
+    - "memory": InMemoryDatabaseService, sin red ni credenciales (tests,
+      benchmarks y simulaciones locales; los datos viven en el proceso).
+    """
+    backend = os.getenv("DB_BACKEND", "postgrest")
+    if backend == "postgres":
+        from .postgres_database import PostgresDatabaseService
+
+        dsn = os.getenv("DATABASE_URL")
+        if not dsn:
+            raise ValueError("DB_BACKEND=postgres requiere DATABASE_URL (conexión directa a Postgres).")
+        return PostgresDatabaseService(dsn, max_size=int(os.getenv("DATABASE_POOL_SIZE", "10")))
+    if backend == "memory":
+        from .memory_database import InMemoryDatabaseService
+
+        return InMemoryDatabaseService()
+    if backend != "postgrest":
+        raise ValueError(f"DB_BACKEND desconocido: {backend} (postgrest | postgres | memory).")
+    return DatabaseService()
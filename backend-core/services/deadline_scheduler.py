@@ -0,0 +1,167 @@
+import heapq
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+
+# Las cargas incrementales piden también las filas de este margen anterior a
+# la marca de agua: una fila confirmada tarde, con una created_at algo
+# anterior a la última vista, sigue entrando (volver a ver una fila no
+# cambia nada).
+WATERMARK_OVERLAP_SECONDS = 60
+
+# Cada tanto se recarga todo igualmente, por si alguna fila se confirmó
+# todavía más tarde.
+FULL_RELOAD_SECONDS = 600
+
+
+def parse_deadline(ts) -> Optional[float]:
+    """
+    ISO 8601 (con "Z" o desfase) o datetime → segundos epoch; None si no hay plazo.
+    """
+    if not ts:
+        return None
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    return ts.timestamp()
+
+
+class DeadlineScheduler:
+    """
+    Plazos pendientes (caducidad de sesiones, activación de plantillas) en un
+    montículo de (epoch, clave), con las fechas ya convertidas a epoch una
+    sola vez al programarlas.
+
+    - schedule / cancel: O(log n). Reprogramar una clave deja la entrada
+      antigua en el montículo; se descarta al salir (borrado perezoso) y el
+      montículo se compacta si la basura supera a las entradas vivas.
+    - pop_due(now): O(k log n) para los k plazos vencidos; no toca el resto.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, Hashable]] = []
+        self._when: Dict[Hashable, float] = {}
+
+    def schedule(self, key: Hashable, ts) -> bool:
+        """
+        Programa (o reprograma) el plazo de key. ts puede ser ISO 8601,
+        datetime o epoch. Devuelve False si no hay plazo (ts vacío).
+        """
+        when = ts if isinstance(ts, (int, float)) else parse_deadline(ts)
+        if when is None:
+            self.cancel(key)
+            return False
+        if self._when.get(key) == when:
+            return True
+        self._when[key] = when
+        heapq.heappush(self._heap, (when, key))
+        if len(self._heap) > 2 * len(self._when) + 64:
+            self._compact()
+        return True
+
+    def cancel(self, key: Hashable):
+        self._when.pop(key, None)
+
+    def pop_due(self, now: float) -> List[Hashable]:
+        """
+        Saca y devuelve las claves cuyo plazo es <= now, en orden de plazo.
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, key = heapq.heappop(self._heap)
+            if self._when.get(key) == when:
+                del self._when[key]
+                due.append(key)
+        return due
+
+    def next_deadline(self) -> Optional[float]:
+        while self._heap and self._when.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _compact(self):
+        self._heap = [(when, key) for key, when in self._when.items()]
+        heapq.heapify(self._heap)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._when
+
+    def __len__(self) -> int:
+        return len(self._when)
+
+
+def schedule_rows(scheduler: DeadlineScheduler, rows, field: str, watermark=None):
+    """
+    Programa en scheduler el plazo row[field] de cada fila (clave row["id"])
+    y devuelve la marca de agua actualizada: la mayor created_at vista.
+    """
+    for row in rows:
+        scheduler.schedule(row["id"], row.get(field))
+        created_at = row.get("created_at")
+        if created_at and (watermark is None or created_at > watermark):
+            watermark = created_at
+    return watermark
+
+
+def since_watermark(watermark, overlap_seconds: float = 0) -> List[tuple]:
+    """
+    Filtro para pedir solo las filas creadas desde la marca de agua, menos
+    overlap_seconds (ninguno si aún no hay marca: carga completa).
+    """
+    if not watermark:
+        return []
+    if overlap_seconds:
+        since = datetime.fromtimestamp(parse_deadline(watermark) - overlap_seconds, timezone.utc)
+        return [("gte", "created_at", since.isoformat())]
+    return [("gte", "created_at", watermark)]
+
+
+class Watermark:
+    """
+    Marca de agua (la mayor created_at vista) de una carga incremental.
+
+    La carga completa se recorre entera (iter_rows) antes de fijar la marca,
+    y se repite cada full_reload_seconds; entre medias, filters() pide solo
+    las filas nuevas, con overlap_seconds de solape.
+
+        full = watermark.full_load_due()
+        rows = db.iter_rows(table, base_filters + watermark.filters(), ...)
+        watermark.advance(max_created_at_de(rows), full)
+    """
+
+    def __init__(
+        self,
+        overlap_seconds: float = WATERMARK_OVERLAP_SECONDS,
+        full_reload_seconds: float = FULL_RELOAD_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.overlap_seconds = overlap_seconds
+        self.full_reload_seconds = full_reload_seconds
+        self._clock = clock
+        self.value = None
+        self._full_load_at: Optional[float] = None
+
+    def full_load_due(self) -> bool:
+        return self.value is None or self._clock() - self._full_load_at >= self.full_reload_seconds
+
+    def filters(self) -> List[tuple]:
+        if self.full_load_due():
+            return []
+        return since_watermark(self.value, self.overlap_seconds)
+
+    def advance(self, latest, full: bool):
+        """
+        Anota el final de una carga: latest es la mayor created_at leída
+        (None si no hubo filas) y full si era una carga completa.
+        """
+        if full:
+            self._full_load_at = self._clock()
+            self.value = latest
+        elif latest is not None and (self.value is None or latest > self.value):
+            self.value = latest
+
+    def reset(self):
+        """
+        Fuerza una carga completa en la próxima llamada.
+        """
+        self.value = None
@@ -0,0 +1,116 @@
+import time
+from typing import Callable, List
+
+from services.change_feed import RESYNC, ChangeEvent, ChangeFeed
+from services.session_pool_service import SessionPoolService
+from services.session_service import SessionService
+from utils.logger import log
+
+
+def _is_due(scheduler, now: float) -> bool:
+    deadline = scheduler.next_deadline()
+    return deadline is not None and deadline <= now
+
+
+class EventDrivenWorker:
+    """
+    Worker en modo eventos: en lugar de releer todas las tablas cada
+    poll_interval_seconds, reacciona a las notificaciones de cambios
+    (ChangeFeed) y a los plazos conocidos.
+
+    - Alta de participante → se comprueba solo su sesión (cierre + adjudicación
+      en cuanto se llena, sin esperar al siguiente tick).
+    - Sesión pasa a 'adjudicated' → se encadena.
+    - Sesión abierta / plantilla programada nueva → se anota su plazo en el
+      planificador del servicio (SessionService.expiries /
+      SessionPoolService.activations) y el worker se despierta exactamente
+      en el siguiente plazo.
+    - Cada resync_interval_seconds se hace un tick completo como el del modo
+      poll, por si se ha perdido alguna notificación; y en el acto si el feed
+      avisa de que las ha podido perder (RESYNC, p. ej. al reconectar).
+
+    Sin cambios ni plazos vencidos no se hace ninguna consulta.
+    """
+
+    def __init__(
+        self,
+        session_service: SessionService,
+        pool_service: SessionPoolService,
+        feed: ChangeFeed,
+        resync_interval_seconds: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.session_service = session_service
+        self.pool_service = pool_service
+        self.feed = feed
+        self.resync_interval_seconds = resync_interval_seconds
+        self.clock = clock
+        self._next_resync = 0.0
+
+    # --- plazos ---
+
+    def _next_deadline(self) -> float:
+        deadlines = [
+            self.session_service.expiries.next_deadline(),
+            self.pool_service.activations.next_deadline(),
+        ]
+        return min([d for d in deadlines if d is not None], default=float("inf"))
+
+    def _run_due_deadlines(self, now: float):
+        if _is_due(self.pool_service.activations, now):
+            self.pool_service.process_scheduled_sessions()
+        if _is_due(self.session_service.expiries, now):
+            self.session_service.expire_due_sessions()
+
+    # --- eventos ---
+
+    def tick(self):
+        """
+        Tick completo (el mismo trabajo que el modo poll, que además pone al
+        día los planificadores de plazos).
+        """
+        self.pool_service.process_scheduled_sessions()
+        self.session_service.process_open_sessions()
+        self.session_service.process_chains_for_adjudicated_sessions()
+
+    def handle(self, events: List[ChangeEvent]):
+        filled, adjudicated = set(), False
+        for event in events:
+            row = event.row
+            if event.table == "participants" and event.op == "INSERT":
+                filled.add(row["session_id"])
+            elif event.table == "sessions":
+                if row.get("status") == "adjudicated":
+                    adjudicated = True
+                elif row.get("status") == "open" and event.op == "INSERT":
+                    self.session_service.expiries.schedule(row["id"], row.get("expiry_timestamp"))
+            elif event.table == "sessions_pool" and row.get("type") == "scheduled":
+                self.pool_service.activations.schedule(row["id"], row.get("start_timestamp"))
+
+        if filled:
+            self.session_service.process_sessions(sorted(filled))
+        if adjudicated:
+            self.session_service.process_chains_for_adjudicated_sessions()
+
+    def run_once(self):
+        now = self.clock()
+        if now >= self._next_resync:
+            self.tick()
+            self._next_resync = now + self.resync_interval_seconds
+
+        wake_at = min(self._next_resync, self._next_deadline())
+        events = self.feed.wait(timeout=max(0.0, wake_at - self.clock()))
+        if RESYNC in events:
+            self.tick()
+            self._next_resync = self.clock() + self.resync_interval_seconds
+        elif events:
+            self.handle(events)
+        self._run_due_deadlines(self.clock())
+
+    def run_forever(self):
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                log(f"[WORKER ERROR] {e}")
+                time.sleep(1)
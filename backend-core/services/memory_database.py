@@ -0,0 +1,610 @@
+"""
+Backend de base de datos en memoria, para tests, benchmarks y simulaciones
+locales sin Supabase (DB_BACKEND=memory).
+
+InMemoryClient implementa el subconjunto del query builder de PostgREST que
+usa DatabaseService (table().select/insert/upsert/update/delete, filtros
+eq/in_/lte/ilike/..., order, range, rpc) sobre listas de diccionarios, así
+que InMemoryDatabaseService es el mismo DatabaseService con otro cliente.
+
+- Índices hash por columna (INDEXED_COLUMNS desde el principio, el resto al
+  primer filtro eq/in_ que los use), mantenidos fila a fila en insert,
+  update y delete: buscar por id, status, session_id, pool_id o
+  chain_group_id no recorre la tabla.
+- Cada execute() cuenta como un viaje de ida y vuelta a la base de datos
+  (round_trips, calls, rows_transferred), que es lo que miden los
+  benchmarks.
+
+    client = InMemoryClient({"sessions": [...], "participants": [...]})
+    db = DatabaseService(client=client)   # o InMemoryDatabaseService(tables)
+    ...
+    client.round_trips  # consultas ejecutadas
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from postgrest.exceptions import APIError
+
+from .database import DatabaseService
+from .shard_lease import SHARD_COUNT, shard_of
+
+
+class MemoryResponse:
+    def __init__(self, data: List[dict], count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+_FILTERS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+    "in": lambda a, b: a in b,
+    "is": lambda a, b: a is b,
+    "ilike": lambda a, b: a is not None and b.fullmatch(str(a)) is not None,
+}
+
+
+def _like_pattern(pattern: str) -> "re.Pattern":
+    """
+    Patrón ILIKE (% o * = cualquier texto, _ = un carácter, \\ = el siguiente
+    carácter es literal) como regex.
+    """
+    translated, escaped = [], False
+    for char in pattern:
+        if escaped:
+            translated.append(re.escape(char))
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        else:
+            translated.append(".*" if char in "%*" else "." if char == "_" else re.escape(char))
+    return re.compile("".join(translated), re.IGNORECASE | re.DOTALL)
+
+
+# Recurso embebido en un select: "sessions(id)" o "sessions(id,status)".
+_EMBED = re.compile(r"^(\w+)\((.*)\)$")
+
+
+def _split_columns(columns: str) -> List[str]:
+    """
+    Separa "*, sessions(id,status)" por las comas de primer nivel.
+    """
+    parts, depth, current = [], 0, ""
+    for char in columns:
+        if char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        depth += (char == "(") - (char == ")")
+        current += char
+    parts.append(current.strip())
+    return [p for p in parts if p]
+
+
+def _filter_value(value):
+    # Un recurso embebido sin filas cuenta como null (filtro is.null = anti-join).
+    return None if value == [] else value
+
+
+def _order_key(column: str) -> Callable[[dict], tuple]:
+    # Orden ascendente de PostgREST: los NULL al final.
+    return lambda row: (row.get(column) is None, row.get(column))
+
+
+class _Query:
+    def __init__(self, client: "InMemoryClient", table: str):
+        self.client = client
+        self.table_name = table
+        self.action = "select"
+        self.columns: Optional[List[str]] = None
+        self.embeds: List[tuple] = []
+        self.count: Optional[str] = None
+        self.payload: Any = None
+        self.filters: List[tuple] = []
+        self.orders: List[tuple] = []
+        self.limit_value: Optional[int] = None
+        self.offset_value = 0
+        self.returning = "representation"
+
+    # --- acciones ---
+
+    def select(self, *columns: str, count: Optional[str] = None):
+        self.action = "select"
+        cols = [c for col in columns for c in _split_columns(col)]
+        self.embeds = [(m.group(1), _split_columns(m.group(2))) for m in map(_EMBED.match, cols) if m]
+        cols = [c for c in cols if not _EMBED.match(c)]
+        self.columns = None if not cols or "*" in cols else cols
+        self.count = count
+        return self
+
+    def insert(self, data, *, returning: str = "representation", **_):
+        self.action = "insert"
+        self.payload = data
+        self.returning = str(returning)
+        return self
+
+    def upsert(self, data, *, on_conflict: str = "id", returning: str = "representation", **_):
+        self.action = "upsert"
+        self.payload = data
+        self.on_conflict = on_conflict or "id"
+        self.returning = str(returning)
+        return self
+
+    def update(self, data: dict, *, returning: str = "representation", **_):
+        self.action = "update"
+        self.payload = data
+        self.returning = str(returning)
+        return self
+
+    def delete(self, *, returning: str = "representation", **_):
+        self.action = "delete"
+        self.returning = str(returning)
+        return self
+
+    # --- filtros y modificadores ---
+
+    def _filter(self, op: str, field: str, value):
+        self.filters.append((op, field, value))
+        return self
+
+    def eq(self, field, value):
+        return self._filter("eq", field, value)
+
+    def neq(self, field, value):
+        return self._filter("neq", field, value)
+
+    def lt(self, field, value):
+        return self._filter("lt", field, value)
+
+    def lte(self, field, value):
+        return self._filter("lte", field, value)
+
+    def gt(self, field, value):
+        return self._filter("gt", field, value)
+
+    def gte(self, field, value):
+        return self._filter("gte", field, value)
+
+    def in_(self, field, values):
+        return self._filter("in", field, set(values))
+
+    def is_(self, field, value):
+        return self._filter("is", field, None if value in (None, "null") else value)
+
+    def ilike(self, field, pattern):
+        return self._filter("ilike", field, _like_pattern(pattern))
+
+    def order(self, column: str, *, desc: bool = False, **_):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, size: int, **_):
+        self.limit_value = size
+        return self
+
+    def range(self, start: int, end: int, **_):
+        self.offset_value = start
+        self.limit_value = end - start + 1
+        return self
+
+    # --- ejecución ---
+
+    def _candidates(self) -> List[dict]:
+        # Filtros de igualdad: se resuelven con un índice por columna, como
+        # haría la base de datos, en lugar de recorrer toda la tabla.
+        for op, field, value in self.filters:
+            if op in ("eq", "in"):
+                index = self.client.index(self.table_name, field)
+                keys = [value] if op == "eq" else value
+                return [row for k in keys for row in index.get(k, {}).values()]
+        return self.client.tables[self.table_name]
+
+    def _embed(self, row: dict) -> dict:
+        """
+        Añade a la fila sus recursos embebidos (filas hijas por clave foránea).
+        """
+        row = dict(row)
+        for child, child_columns in self.embeds:
+            fk = self.client.relation(self.table_name, child)
+            children = self.client.index(child, fk).get(row.get("id"), {}).values()
+            row[child] = [
+                dict(c) if "*" in child_columns else {col: c.get(col) for col in child_columns}
+                for c in children
+            ]
+        return row
+
+    def _iter_matching(self) -> Iterator[dict]:
+        candidates = self._candidates()
+        if self.embeds:
+            candidates = (self._embed(row) for row in candidates)
+        return (
+            row for row in candidates
+            if all(_FILTERS[op](_filter_value(row.get(field)), value) for op, field, value in self.filters)
+        )
+
+    def _matching(self) -> List[dict]:
+        return list(self._iter_matching())
+
+    def _ordered_page(self, column: str, desc: bool) -> List[dict]:
+        key = _order_key(column)
+        if desc or self.embeds:
+            pick = heapq.nlargest if desc else heapq.nsmallest
+            return pick(self.limit_value, self._iter_matching(), key=key)
+        keys, ordered = self.client.ordered(self.table_name, column)
+        start = 0
+        for op, field, value in self.filters:
+            if field == column and op in ("gt", "gte"):
+                start = max(start, (bisect.bisect_right if op == "gt" else bisect.bisect_left)(keys, value))
+        page = []
+        for position in range(start, len(ordered)):
+            row = ordered[position]
+            if all(_FILTERS[op](_filter_value(row.get(field)), value) for op, field, value in self.filters):
+                page.append(row)
+                if len(page) == self.limit_value:
+                    break
+        return page
+
+    def _project(self, row: dict) -> dict:
+        if self.columns is None:
+            return dict(row)
+        projected = {c: row.get(c) for c in self.columns}
+        projected.update((child, row[child]) for child, _ in self.embeds)
+        return projected
+
+    def execute(self) -> MemoryResponse:
+        response = self._execute()
+        if self.action != "select" and self.returning.endswith("minimal"):
+            # Como el cliente real: con return=minimal el cuerpo llega vacío.
+            return MemoryResponse([], 0)
+        return response
+
+    def _execute(self) -> MemoryResponse:
+        with self.client.lock:
+            response, changes = self._apply()
+        for op, row in changes:
+            self.client.notify(self.table_name, op, row)
+        return response
+
+    def _apply(self):
+        self.client.round_trips += 1
+        self.client.calls[(self.action, self.table_name)] += 1
+        rows = self.client.tables[self.table_name]
+
+        if self.action in ("insert", "upsert"):
+            items = self.payload if isinstance(self.payload, list) else [self.payload]
+            stored = []
+            for payload in items:
+                if self.action == "upsert":
+                    # ON CONFLICT DO UPDATE: la fila existente se busca por la
+                    # clave del conflicto con su índice y recibe las columnas
+                    # enviadas.
+                    key = self.on_conflict
+                    existing = self.client.index(self.table_name, key).get(payload.get(key))
+                    if existing:
+                        row = next(iter(existing.values()))
+                        self.client.update_row(self.table_name, row, payload)
+                        stored.append(dict(row))
+                        continue
+                item = dict(payload)
+                item.setdefault("id", str(uuid.uuid4()))
+                # Como el DEFAULT now() de created_at en las tablas de Supabase.
+                item.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+                for column, expression in self.client.generated.get(self.table_name, {}).items():
+                    item[column] = expression(item)
+                self.client.check_unique(self.table_name, item)
+                rows.append(item)
+                self.client.add_to_indexes(self.table_name, item)
+                stored.append(dict(item))
+            return MemoryResponse(stored), [("INSERT", r) for r in stored]
+
+        if self.action == "update":
+            matching = self._matching()
+            for row in matching:
+                self.client.update_row(self.table_name, row, self.payload)
+            updated = [dict(r) for r in matching]
+            return MemoryResponse(updated), [("UPDATE", r) for r in updated]
+
+        if self.action == "delete":
+            matching = self._matching()
+            self.client.remove_rows(self.table_name, matching)
+            return MemoryResponse([dict(r) for r in matching]), []
+
+        if self.client.max_rows is not None and (self.limit_value is None or self.limit_value > self.client.max_rows):
+            # Como db-max-rows de PostgREST: ningún select devuelve más filas.
+            self.limit_value = self.client.max_rows
+
+        if len(self.orders) == 1 and self.limit_value is not None and not self.offset_value and not self.count:
+            # Una página ordenada (p. ej. la paginación por clave de
+            # iter_rows): como con un índice B-tree, se salta hasta la clave
+            # y se leen filas en orden hasta llenar la página.
+            page = self._ordered_page(*self.orders[0])
+            self.client.rows_transferred += len(page)
+            return MemoryResponse([self._project(r) for r in page]), []
+
+        matching = self._matching()
+        for column, desc in reversed(self.orders):
+            matching.sort(key=lambda r: (r.get(column) is None, r.get(column)), reverse=desc)
+        total = len(matching)
+        end = None if self.limit_value is None else self.offset_value + self.limit_value
+        page = matching[self.offset_value:end]
+        self.client.rows_transferred += len(page)
+        return MemoryResponse([self._project(r) for r in page], total if self.count else None), []
+
+
+class _RPC:
+    def __init__(self, client: "InMemoryClient", name: str, params: dict):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self) -> MemoryResponse:
+        with self.client.lock:
+            self.client.round_trips += 1
+            self.client.calls[("rpc", self.name)] += 1
+            function = self.client.functions.get(self.name)
+            if function is None:
+                raise APIError({"code": "PGRST202", "message": f"Could not find the function {self.name}"})
+            return MemoryResponse(function(self.client, **self.params))
+
+
+def count_rows_grouped(client: "InMemoryClient", p_table: str, p_field: str, p_values: List[str]) -> List[dict]:
+    """
+    Equivalente en memoria de sql/001_count_rows_grouped.sql.
+    """
+    wanted = set(p_values)
+    counts = Counter()
+    for value, rows in client.index(p_table, p_field).items():
+        if str(value) in wanted:
+            counts[str(value)] += len(rows)
+    return [{"value": value, "row_count": n} for value, n in counts.items()]
+
+
+def claim_shard_leases(client: "InMemoryClient", p_owner: str, p_ttl_seconds: int) -> List[int]:
+    """
+    Equivalente en memoria de claim_shard_leases (sql/006_worker_shards.sql).
+    """
+    now = time.time()
+    expires = now + p_ttl_seconds
+    heartbeats = client.tables["worker_heartbeats"]
+    heartbeats[:] = [h for h in heartbeats if h["owner"] != p_owner and h["expires_at"] >= now]
+    heartbeats.append({"owner": p_owner, "expires_at": expires})
+
+    leases = client.tables["worker_shard_leases"]
+    if not leases:
+        leases.extend({"shard": shard, "owner": None, "expires_at": float("-inf")} for shard in range(SHARD_COUNT))
+    fair = math.ceil(len(leases) / len(heartbeats))
+
+    held = [lease for lease in leases if lease["owner"] == p_owner]
+    for lease in held:
+        lease["expires_at"] = expires
+    if len(held) > fair:
+        for lease in sorted(held, key=lambda l: l["shard"], reverse=True)[:len(held) - fair]:
+            lease.update(owner=None, expires_at=float("-inf"))
+    elif len(held) < fair:
+        free = [lease for lease in leases if lease["owner"] is None or lease["expires_at"] < now]
+        for lease in sorted(free, key=lambda l: l["shard"])[:fair - len(held)]:
+            lease.update(owner=p_owner, expires_at=expires)
+    # Las filas se modifican en sitio: los índices de estas tablas se rehacen.
+    client.invalidate("worker_heartbeats")
+    client.invalidate("worker_shard_leases")
+    return sorted(lease["shard"] for lease in leases if lease["owner"] == p_owner)
+
+
+def release_shard_leases(client: "InMemoryClient", p_owner: str) -> None:
+    for lease in client.tables["worker_shard_leases"]:
+        if lease["owner"] == p_owner:
+            lease.update(owner=None, expires_at=float("-inf"))
+    heartbeats = client.tables["worker_heartbeats"]
+    heartbeats[:] = [h for h in heartbeats if h["owner"] != p_owner]
+    client.invalidate("worker_heartbeats")
+    client.invalidate("worker_shard_leases")
+
+
+def count_distinct_values(client: "InMemoryClient", p_table: str, p_field: str) -> int:
+    """
+    Equivalente en memoria de sql/007_dashboard_queries.sql.
+    """
+    return sum(1 for value in client.index(p_table, p_field) if value is not None)
+
+
+DEFAULT_FUNCTIONS = {
+    "count_rows_grouped": count_rows_grouped,
+    "count_distinct_values": count_distinct_values,
+    "claim_shard_leases": claim_shard_leases,
+    "release_shard_leases": release_shard_leases,
+}
+
+# (tabla padre, tabla hija) → columna de la clave foránea en la hija.
+DEFAULT_RELATIONS = {("sessions_pool", "sessions"): "pool_id"}
+
+# Columnas generadas por tabla (como la columna shard de sql/006_worker_shards.sql).
+DEFAULT_GENERATED = {
+    "sessions": {"shard": lambda row: shard_of(row["id"])},
+    "sessions_pool": {"shard": lambda row: shard_of(row["id"])},
+}
+
+# Columnas con índice hash desde el principio (el resto se indexa al primer uso).
+INDEXED_COLUMNS = ("id", "status", "session_id", "pool_id", "chain_group_id")
+
+# Restricciones únicas por tabla (los NULL no chocan, como en Postgres).
+DEFAULT_UNIQUE = {"sessions": ("pool_id",), "sessions_pool": ("template_key",)}
+
+
+class InMemoryClient:
+    def __init__(
+        self,
+        tables: Optional[Dict[str, List[dict]]] = None,
+        functions: Optional[dict] = None,
+        relations: Optional[dict] = None,
+        listener: Optional[Callable[[str, str, dict], None]] = None,
+        generated: Optional[dict] = None,
+        unique: Optional[dict] = None,
+        max_rows: Optional[int] = None,
+    ):
+        self.generated = dict(DEFAULT_GENERATED if generated is None else generated)
+        self.unique = dict(DEFAULT_UNIQUE if unique is None else unique)
+        self.max_rows = max_rows
+        self.tables: Dict[str, List[dict]] = defaultdict(list)
+        for name, rows in (tables or {}).items():
+            expressions = self.generated.get(name, {})
+            self.tables[name] = [
+                {**r, **{column: expression(r) for column, expression in expressions.items()}} for r in rows
+            ]
+        self.functions = dict(DEFAULT_FUNCTIONS if functions is None else functions)
+        self.relations = dict(DEFAULT_RELATIONS if relations is None else relations)
+        # listener(table, op, row) tras cada INSERT/UPDATE, como los triggers
+        # de sql/004_change_notifications.sql (p. ej. LocalChangeFeed.publish).
+        self.listener = listener
+        self.lock = threading.RLock()
+        self.round_trips = 0
+        self.rows_transferred = 0
+        self.calls: Counter = Counter()
+        # (tabla, columna) → valor → {id(fila): fila}; un dict por valor para
+        # sacar una fila de su grupo en O(1) cuando cambia la columna.
+        self._indexes: Dict[tuple, Dict[Any, Dict[int, dict]]] = {}
+        self._ordered: Dict[tuple, tuple] = {}
+        for name, rows in self.tables.items():
+            for field in INDEXED_COLUMNS:
+                if rows and field in rows[0]:
+                    self.index(name, field)
+
+    def index(self, table: str, field: str) -> Dict[Any, Dict[int, dict]]:
+        """
+        Índice hash de table.field (se construye la primera vez y a partir de
+        ahí se mantiene con cada escritura).
+        """
+        index = self._indexes.get((table, field))
+        if index is None:
+            index = self._indexes[(table, field)] = defaultdict(dict)
+            for row in self.tables[table]:
+                index[row.get(field)][id(row)] = row
+        return index
+
+    def ordered(self, table: str, field: str):
+        """
+        Filas de la tabla ordenadas por field (los NULL al final) y la lista
+        de claves no nulas, para buscar con bisect.
+        """
+        ordered = self._ordered.get((table, field))
+        if ordered is None:
+            rows = sorted(self.tables[table], key=_order_key(field))
+            keys = [r[field] for r in rows if r.get(field) is not None]
+            ordered = self._ordered[(table, field)] = (keys, rows)
+        return ordered
+
+    def notify(self, table: str, op: str, row: dict):
+        if self.listener is not None:
+            self.listener(table, op, row)
+
+    def relation(self, parent: str, child: str) -> str:
+        try:
+            return self.relations[(parent, child)]
+        except KeyError:
+            raise APIError({
+                "code": "PGRST200",
+                "message": f"Could not find a relationship between '{parent}' and '{child}'",
+            }) from None
+
+    def add_to_indexes(self, table: str, row: dict):
+        for (name, field), index in self._indexes.items():
+            if name == table:
+                index[row.get(field)][id(row)] = row
+        # Como la fila va al final de la tabla, entre iguales queda detrás:
+        # el mismo orden que daría volver a ordenar.
+        for (name, field), (keys, rows) in self._ordered.items():
+            if name == table:
+                bisect.insort_right(rows, row, key=_order_key(field))
+                if row.get(field) is not None:
+                    bisect.insort_right(keys, row[field])
+
+    def update_row(self, table: str, row: dict, changes: dict):
+        """
+        Aplica changes a la fila moviéndola de grupo en los índices de las
+        columnas que cambian.
+        """
+        for (name, field), index in self._indexes.items():
+            if name != table or field not in changes or changes[field] == row.get(field):
+                continue
+            old = row.get(field)
+            group = index[old]
+            group.pop(id(row), None)
+            if not group:
+                del index[old]
+            index[changes[field]][id(row)] = row
+        row.update(changes)
+        self._drop_ordered(table, changes)
+
+    def remove_rows(self, table: str, rows: List[dict]):
+        if not rows:
+            return
+        ids = {id(r) for r in rows}
+        for (name, field), index in self._indexes.items():
+            if name != table:
+                continue
+            for row in rows:
+                group = index.get(row.get(field))
+                if group is not None:
+                    group.pop(id(row), None)
+                    if not group:
+                        del index[row.get(field)]
+        self.tables[table] = [r for r in self.tables[table] if id(r) not in ids]
+        self._drop_ordered(table)
+
+    def _drop_ordered(self, table: str, changed: Optional[dict] = None):
+        for key in [k for k in self._ordered if k[0] == table]:
+            if changed is None or key[1] in changed:
+                del self._ordered[key]
+
+    def check_unique(self, table: str, row: dict):
+        for column in self.unique.get(table, ()):
+            value = row.get(column)
+            if value is not None and self.index(table, column).get(value):
+                raise APIError({
+                    "code": "23505",
+                    "message": f'duplicate key value violates unique constraint "{table}_{column}_key"',
+                })
+
+    def invalidate(self, table: str, changed: Optional[dict] = None):
+        """
+        Descarta los índices de la tabla (o de las columnas de changed) tras
+        modificar sus filas directamente, sin pasar por el query builder.
+        """
+        for cache in (self._indexes, self._ordered):
+            for key in [k for k in cache if k[0] == table]:
+                if changed is None or key[1] in changed:
+                    del cache[key]
+
+    def table(self, name: str) -> _Query:
+        return _Query(self, name)
+
+    def rpc(self, name: str, params: Optional[dict] = None, **_) -> _RPC:
+        return _RPC(self, name, params or {})
+
+    def reset_counters(self):
+        self.round_trips = 0
+        self.rows_transferred = 0
+        self.calls.clear()
+
+
+class InMemoryDatabaseService(DatabaseService):
+    """
+    DatabaseService sobre InMemoryClient: misma interfaz (insert, fetch_all,
+    fetch_by_id, fetch_by_field, count_by_field, update, delete, iter_rows,
+    fetch_filtered...) sin red ni credenciales.
+    """
+
+    def __init__(self, tables: Optional[Dict[str, List[dict]]] = None, **client_options):
+        super().__init__(client=InMemoryClient(tables, **client_options))
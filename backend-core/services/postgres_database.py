@@ -0,0 +1,499 @@
+"""
+Backend de DatabaseService que habla directamente con Postgres (protocolo
+nativo, pool de conexiones psycopg) en lugar de pasar por la API REST de
+Supabase. Pensado para el worker y los procesos masivos: sin JSON por fila,
+sin límite de página, con transacciones, cursores en servidor y COPY.
+
+Se elige con DB_BACKEND=postgres (ver database.create_database_service) y
+necesita DATABASE_URL y psycopg[binary,pool]:
+
+    db = PostgresDatabaseService(os.environ["DATABASE_URL"])
+    with db.transaction():
+        db.update_many("sessions", ids, {"status": "complete"}, filters=[("eq", "status", "open")])
+    for row in db.iter_rows("participants", [("eq", "session_id", sid)]):
+        ...
+    db.copy_rows("participants", rows)
+
+Misma superficie que DatabaseService (insert / upsert_many / fetch_* /
+count_* / update* / delete / rpc), con las mismas respuestas (.data,
+.count), de modo que los servicios no distinguen el backend. Los filtros
+usan los mismos operadores (eq, neq, lt, lte, gt, gte, in, is, ilike,
+range); el único recurso embebido soportado es
+el anti-join child(cols) + ("is", child, "null") de SessionPoolService, que
+se traduce a NOT EXISTS por la clave foránea.
+
+Los valores de las filas llegan con los mismos tipos que por PostgREST
+(ver rest_value): fechas como texto ISO, uuid como str y numeric como float.
+"""
+
+import re
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from postgrest.exceptions import APIError
+
+from .database import IN_FILTER_CHUNK_SIZE, RELATIONSHIP_NOT_FOUND_CODE, Filter, _chunks
+
+
+# Filas por viaje de los cursores en servidor (iter_rows).
+DEFAULT_PAGE_SIZE = 1000
+
+_COMPARISONS = {"eq": "=", "neq": "<>", "lt": "<", "lte": "<=", "gt": ">", "gte": ">="}
+
+# Recurso embebido en la lista de columnas: "sessions(id)".
+_EMBED = re.compile(r"^(\w+)\((.*)\)$")
+
+
+class QueryResult:
+    """
+    Respuesta con la misma forma que la de postgrest-py (.data, .count).
+    """
+
+    def __init__(self, data: Any, count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+def rest_value(value: Any) -> Any:
+    """
+    Valor de una columna tal como lo entregaría PostgREST (JSON): datetime,
+    date y time → isoformat(), uuid → str, numeric → float; los arrays,
+    elemento a elemento. Así el resto del código (comparaciones de
+    created_at, hashes sobre timestamps, claves de dicts) no distingue el
+    backend.
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, list):
+        return [rest_value(v) for v in value]
+    return value
+
+
+def _rest_row_factory(dict_row):
+    """
+    row_factory de psycopg: dict_row con los valores pasados por rest_value.
+    Es el único punto de conversión (lo usan todas las consultas del pool,
+    cursores de iter_rows incluidos).
+    """
+    def factory(cursor):
+        make_row = dict_row(cursor)
+        return lambda values: make_row([rest_value(v) for v in values])
+
+    return factory
+
+
+def _split_columns(columns: str) -> List[str]:
+    parts, depth, current = [], 0, ""
+    for char in columns:
+        if char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        depth += (char == "(") - (char == ")")
+        current += char
+    parts.append(current.strip())
+    return [p for p in parts if p]
+
+
+class PostgresDatabaseService:
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10):
+        try:
+            from psycopg import sql
+            from psycopg.rows import dict_row
+            from psycopg_pool import ConnectionPool
+        except ImportError as e:
+            raise ImportError(
+                "El backend Postgres requiere psycopg y psycopg_pool (pip install 'psycopg[binary,pool]')."
+            ) from e
+
+        self._sql = sql
+        self.pool = ConnectionPool(
+            dsn,
+            min_size=min_size,
+            max_size=max_size,
+            kwargs={"autocommit": True, "row_factory": _rest_row_factory(dict_row)},
+            open=True,
+        )
+        # Conexión de la transacción en curso de cada hilo (ver transaction()).
+        self._local = threading.local()
+        self._column_types: Dict[Tuple[str, str], str] = {}
+        self._foreign_keys: Dict[Tuple[str, str], str] = {}
+
+    def close(self):
+        self.pool.close()
+
+    # --- conexiones y transacciones ---
+
+    @contextmanager
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        with self.pool.connection() as conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Todas las llamadas de este hilo dentro del bloque van en una sola
+        transacción (COMMIT al salir, ROLLBACK si hay excepción).
+        """
+        if getattr(self._local, "conn", None) is not None:
+            with self._local.conn.transaction():
+                yield self
+            return
+        with self.pool.connection() as conn:
+            with conn.transaction():
+                self._local.conn = conn
+                try:
+                    yield self
+                finally:
+                    self._local.conn = None
+
+    def _execute(self, query, params: Sequence[Any] = ()) -> List[dict]:
+        with self._connection() as conn:
+            cursor = conn.execute(query, params)
+            return cursor.fetchall() if cursor.description else []
+
+    # --- traducción de filtros y columnas ---
+
+    def _column_type(self, table: str, field: str) -> str:
+        """
+        Tipo SQL de la columna (p. ej. 'uuid'), para convertir las listas de
+        in (...) al tipo de la columna y que el filtro use su índice.
+        """
+        key = (table, field)
+        if key not in self._column_types:
+            rows = self._execute(
+                "select format_type(atttypid, atttypmod) as type from pg_attribute"
+                " where attrelid = %s::regclass and attname = %s and not attisdropped",
+                (table, field),
+            )
+            if not rows:
+                raise ValueError(f"La columna {table}.{field} no existe.")
+            self._column_types[key] = rows[0]["type"]
+        return self._column_types[key]
+
+    def _foreign_key(self, parent: str, child: str) -> str:
+        """
+        Columna de child que referencia a parent (como resuelve PostgREST
+        los recursos embebidos).
+        """
+        key = (parent, child)
+        if key not in self._foreign_keys:
+            rows = self._execute(
+                "select a.attname as column from pg_constraint c"
+                " join pg_attribute a on a.attrelid = c.conrelid and a.attnum = c.conkey[1]"
+                " where c.contype = 'f' and c.conrelid = %s::regclass and c.confrelid = %s::regclass",
+                (child, parent),
+            )
+            if not rows:
+                raise APIError({
+                    "code": RELATIONSHIP_NOT_FOUND_CODE,
+                    "message": f"Could not find a relationship between '{parent}' and '{child}'",
+                })
+            self._foreign_keys[key] = rows[0]["column"]
+        return self._foreign_keys[key]
+
+    def _where(self, table: str, filters: Sequence[Filter], embeds: Sequence[str] = ()):
+        sql = self._sql
+        clauses, params = [], []
+        for op, field, value in filters:
+            if field in embeds:
+                if op != "is" or value not in (None, "null"):
+                    raise ValueError(f"Solo se admite el anti-join {field}=is.null sobre recursos embebidos.")
+                clauses.append(sql.SQL("not exists (select 1 from {child} c where c.{fk} = {table}.id)").format(
+                    child=sql.Identifier(field),
+                    fk=sql.Identifier(self._foreign_key(table, field)),
+                    table=sql.Identifier(table),
+                ))
+            elif op in _COMPARISONS:
+                clauses.append(sql.SQL("{} " + _COMPARISONS[op] + " %s").format(sql.Identifier(field)))
+                params.append(value)
+            elif op == "in":
+                clauses.append(sql.SQL("{} = any(%s::" + self._column_type(table, field) + "[])").format(
+                    sql.Identifier(field)
+                ))
+                params.append(list(value))
+            elif op == "ilike":
+                clauses.append(sql.SQL("{} ilike %s").format(sql.Identifier(field)))
+                # PostgREST admite * como comodín; en SQL es %.
+                params.append(value.replace("*", "%"))
+            elif op == "range":
+                for bound, comparison in zip(value, (">=", "<=")):
+                    if bound is not None:
+                        clauses.append(sql.SQL("{} " + comparison + " %s").format(sql.Identifier(field)))
+                        params.append(bound)
+            elif op == "is":
+                literal = {None: "null", "null": "null", True: "true", False: "false"}[value]
+                clauses.append(sql.SQL("{} is " + literal).format(sql.Identifier(field)))
+            else:
+                raise ValueError(f"Operador de filtro no soportado: {op}")
+        if not clauses:
+            return sql.SQL(""), params
+        return sql.SQL(" where ") + sql.SQL(" and ").join(clauses), params
+
+    def _select(self, table: str, columns: str, filters: Sequence[Filter], with_total: bool = False):
+        sql = self._sql
+        parts = _split_columns(columns)
+        embeds = [m.group(1) for m in map(_EMBED.match, parts) if m]
+        plain = [p for p in parts if not _EMBED.match(p)]
+        if not plain or "*" in plain:
+            projection = sql.SQL("{}.*").format(sql.Identifier(table))
+        else:
+            projection = sql.SQL(", ").join(sql.Identifier(c) for c in plain)
+        if with_total:
+            # La ventana se evalúa antes de ORDER BY / LIMIT: total sin paginar.
+            projection += sql.SQL(", count(*) over () as _total")
+        where, params = self._where(table, filters, embeds)
+        query = sql.SQL("select {} from {}").format(projection, sql.Identifier(table)) + where
+        return query, params, embeds
+
+    # --- misma superficie que DatabaseService ---
+
+    def insert(self, table: str, data: dict) -> QueryResult:
+        sql = self._sql
+        query = sql.SQL("insert into {} ({}) values ({}) returning *").format(
+            sql.Identifier(table),
+            sql.SQL(", ").join(map(sql.Identifier, data)),
+            sql.SQL(", ").join(sql.Placeholder() * len(data)),
+        )
+        return QueryResult(self._execute(query, list(data.values())))
+
+    def fetch_all(self, table: str) -> QueryResult:
+        return self.fetch_filtered(table)
+
+    def fetch_by_id(self, table: str, record_id: str) -> QueryResult:
+        return self.fetch_filtered(table, [("eq", "id", record_id)])
+
+    def fetch_by_field(self, table: str, field: str, value) -> QueryResult:
+        return self.fetch_filtered(table, [("eq", field, value)])
+
+    def fetch_filtered(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        columns: str = "*",
+        order: Sequence[str] = (),
+        limit: Optional[int] = None,
+        offset: int = 0,
+        count: bool = False,
+    ) -> QueryResult:
+        """
+        Ver DatabaseService.fetch_filtered. Con count=True el total sale de
+        la misma consulta (count(*) over ()), sin un segundo viaje salvo
+        que la página llegue vacía.
+        """
+        sql = self._sql
+        query, params, embeds = self._select(table, columns, filters, with_total=count)
+        if order:
+            query += sql.SQL(" order by ") + sql.SQL(", ").join(
+                sql.SQL("{} desc" if column.startswith("-") else "{}").format(sql.Identifier(column.lstrip("-")))
+                for column in order
+            )
+        if limit is not None:
+            query += sql.SQL(" limit %s offset %s")
+            params = params + [limit, offset]
+        rows = self._execute(query, params)
+        total = None
+        if count:
+            total = rows[0]["_total"] if rows else self.count_filtered(table, filters)
+            for row in rows:
+                del row["_total"]
+        # Las filas que pasan el anti-join no tienen hijas.
+        for row in rows:
+            for child in embeds:
+                row[child] = []
+        return QueryResult(rows, total)
+
+    def fetch_in(self, table: str, field: str, values: Iterable[Any], columns: str = "*") -> List[dict]:
+        """
+        Una sola consulta field = any(array): sin URL, no hace falta trocear.
+        """
+        values = list(dict.fromkeys(values))
+        if not values:
+            return []
+        return self.fetch_filtered(table, [("in", field, values)], columns=columns).data
+
+    def iter_rows(
+        self,
+        table: str,
+        filters: Sequence[Filter] = (),
+        columns: str = "*",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        key: str = "id",
+    ) -> Iterator[dict]:
+        """
+        Recorre las filas con un cursor en servidor (DECLARE ... FETCH de
+        page_size en page_size), sin cargar la tabla entera en memoria.
+        key se acepta por compatibilidad con DatabaseService.iter_rows: el
+        cursor no necesita paginar por clave.
+        """
+        query, params, _ = self._select(table, columns, filters)
+        with self._connection() as conn:
+            # Los cursores con nombre necesitan una transacción abierta.
+            with conn.transaction():
+                with conn.cursor(name=f"iter_{table}_{uuid.uuid4().hex[:8]}") as cursor:
+                    cursor.itersize = page_size
+                    cursor.execute(query, params)
+                    yield from cursor
+
+    def count_by_field(self, table: str, field: str, value) -> int:
+        return self.count_filtered(table, [("eq", field, value)])
+
+    def count_filtered(self, table: str, filters: Sequence[Filter] = ()) -> int:
+        sql = self._sql
+        where, params = self._where(table, filters)
+        rows = self._execute(sql.SQL("select count(*) as n from {}").format(sql.Identifier(table)) + where, params)
+        return rows[0]["n"]
+
+    def count_distinct(self, table: str, field: str) -> int:
+        sql = self._sql
+        query = sql.SQL("select count(distinct {}) as n from {}").format(sql.Identifier(field), sql.Identifier(table))
+        return self._execute(query)[0]["n"]
+
+    def count_by_field_many(self, table: str, field: str, values: Iterable[Any]) -> Dict[Any, int]:
+        """
+        Un GROUP BY en base de datos (la misma consulta que
+        count_rows_grouped, sin pasar por la función).
+        """
+        values = list(dict.fromkeys(values))
+        counts = {value: 0 for value in values}
+        if not values:
+            return counts
+        sql = self._sql
+        where, params = self._where(table, [("in", field, values)])
+        query = (
+            sql.SQL("select {f}::text as value, count(*) as row_count from {t}").format(
+                f=sql.Identifier(field), t=sql.Identifier(table)
+            )
+            + where
+            + sql.SQL(" group by {}").format(sql.Identifier(field))
+        )
+        by_text = {str(v): v for v in values}
+        for row in self._execute(query, params):
+            counts[by_text[row["value"]]] = row["row_count"]
+        return counts
+
+    def rpc(self, function: str, params: dict) -> QueryResult:
+        """
+        Como PostgREST: filas si la función devuelve una tabla, el valor si
+        devuelve un escalar (p. ej. el smallint[] de claim_shard_leases).
+        """
+        sql = self._sql
+        query = sql.SQL("select * from {}({})").format(
+            sql.Identifier(function),
+            sql.SQL(", ").join(sql.SQL("{} => %s").format(sql.Identifier(name)) for name in params),
+        )
+        rows = self._execute(query, list(params.values()))
+        if len(rows) == 1 and list(rows[0]) == [function]:
+            return QueryResult(rows[0][function])
+        return QueryResult(rows)
+
+    def update(self, table: str, record_id: str, data: dict) -> QueryResult:
+        return QueryResult(self.update_many(table, [record_id], data, returning=True))
+
+    def update_many(
+        self,
+        table: str,
+        record_ids: Iterable[str],
+        data: dict,
+        filters: Sequence[Filter] = (),
+        chunk_size: int = IN_FILTER_CHUNK_SIZE,
+        returning: bool = False,
+    ) -> List[dict]:
+        """
+        Ver DatabaseService.update_many. Aquí los ids viajan como un array,
+        así que cada bloque puede ser mucho mayor; chunk_size se mantiene
+        por compatibilidad.
+        """
+        sql = self._sql
+        record_ids = list(dict.fromkeys(record_ids))
+        updated: List[dict] = []
+        for chunk in _chunks(record_ids, max(chunk_size, 10_000)):
+            where, params = self._where(table, [("in", "id", chunk)] + list(filters))
+            query = (
+                sql.SQL("update {} set {}").format(
+                    sql.Identifier(table),
+                    sql.SQL(", ").join(sql.SQL("{} = %s").format(sql.Identifier(k)) for k in data),
+                )
+                + where
+                + sql.SQL(" returning *" if returning else "")
+            )
+            updated.extend(self._execute(query, list(data.values()) + params))
+        return updated
+
+    def delete(self, table: str, record_id: str) -> QueryResult:
+        sql = self._sql
+        where, params = self._where(table, [("eq", "id", record_id)])
+        query = sql.SQL("delete from {}").format(sql.Identifier(table)) + where + sql.SQL(" returning *")
+        return QueryResult(self._execute(query, params))
+
+    # --- solo en este backend ---
+
+    def upsert_many(
+        self,
+        table: str,
+        rows: Sequence[dict],
+        on_conflict: str,
+        chunk_size: int = DEFAULT_PAGE_SIZE,
+        returning: bool = False,
+    ) -> List[dict]:
+        """
+        Ver DatabaseService.upsert_many. Cada bloque se carga con COPY en una
+        tabla temporal y pasa a la tabla con un único
+        INSERT ... SELECT ... ON CONFLICT DO UPDATE, en su propia transacción.
+        """
+        sql = self._sql
+        written: List[dict] = []
+        for chunk in _chunks(list(rows), chunk_size):
+            columns = list(chunk[0].keys())
+            staging_table = f"_upsert_{table}"
+            staging = sql.Identifier(staging_table)
+            names = sql.SQL(", ").join(map(sql.Identifier, columns))
+            updates = [sql.SQL("{c} = excluded.{c}").format(c=sql.Identifier(c)) for c in columns if c != on_conflict]
+            action = sql.SQL("do update set ") + sql.SQL(", ").join(updates) if updates else sql.SQL("do nothing")
+            with self.transaction():
+                self._execute(sql.SQL(
+                    "create temp table if not exists {} (like {} including defaults) on commit drop"
+                ).format(staging, sql.Identifier(table)))
+                # Dentro de una transacción exterior la tabla temporal sigue viva.
+                self._execute(sql.SQL("truncate {}").format(staging))
+                self.copy_rows(staging_table, chunk, columns)
+                query = sql.SQL(
+                    "insert into {t} ({cols}) select {cols} from {s} on conflict ({key}) {action}"
+                ).format(t=sql.Identifier(table), cols=names, s=staging, key=sql.Identifier(on_conflict), action=action)
+                if returning:
+                    query += sql.SQL(" returning *")
+                result = self._execute(query)
+            if returning:
+                written.extend(result)
+        return written
+
+    def copy_rows(self, table: str, rows: Sequence[dict], columns: Optional[Sequence[str]] = None) -> int:
+        """
+        Carga masiva con COPY ... FROM STDIN (sin RETURNING ni una sentencia
+        por fila). Devuelve el número de filas copiadas.
+        """
+        if not rows:
+            return 0
+        sql = self._sql
+        columns = list(columns or rows[0].keys())
+        query = sql.SQL("copy {} ({}) from stdin").format(
+            sql.Identifier(table), sql.SQL(", ").join(map(sql.Identifier, columns))
+        )
+        with self._connection() as conn:
+            with conn.cursor() as cursor:
+                with cursor.copy(query) as copy:
+                    for row in rows:
+                        copy.write_row([row.get(c) for c in columns])
+        return len(rows)
@@ -0,0 +1,184 @@
+"""
+Caché de lecturas para el dashboard.
+
+- QueryCache: resultados por clave con caducidad (TTL) y un máximo de
+  entradas (LRU), compartida por todos los operadores del proceso. Si varios
+  piden a la vez la misma clave sin cachear, solo uno consulta la base de
+  datos y el resto espera su resultado.
+- CachedDatabaseService: DatabaseService cuyas lecturas del dashboard pasan
+  por la caché, con la consulta completa (tabla, filtros, columnas, orden,
+  página) como clave.
+- watch_changes: invalida por tabla con los eventos de un ChangeFeed (los
+  triggers de sql/004_change_notifications.sql avisan cuando el worker
+  cambia el estado de una sesión, entra un participante o se crea una
+  plantilla).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from services.change_feed import RESYNC, ChangeFeed
+
+
+DEFAULT_TTL_SECONDS = 15.0
+DEFAULT_MAX_ENTRIES = 256
+
+# Lecturas que se cachean; el resto de métodos pasan directos a la base de datos.
+CACHED_METHODS = ("fetch_filtered", "count_filtered", "count_distinct", "count_by_field_many", "count_by_field")
+# Escrituras: además de ejecutarse, invalidan lo cacheado de su tabla.
+WRITE_METHODS = ("insert", "update", "update_many", "delete")
+
+
+def _freeze(value) -> Hashable:
+    """
+    Versión hashable de los argumentos de una consulta (listas de filtros,
+    listas de valores de un in...).
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class _Pending:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class QueryCache:
+    """
+    Las claves son tuplas cuyo segundo elemento es la tabla, para poder
+    invalidar por tabla: ("fetch_filtered", "sessions", ...).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._pending: Dict[tuple, _Pending] = {}
+        # Se incrementa en cada invalidación: una carga que empezó antes no
+        # guarda su resultado (podría ser anterior al cambio).
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = _Pending()
+                generation = self._generation
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        try:
+            pending.value = loader()
+        except BaseException as e:
+            pending.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._pending[key]
+                if pending.error is None and generation == self._generation:
+                    self._entries[key] = (self._clock() + self.ttl_seconds, pending.value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            pending.done.set()
+        return pending.value
+
+    def invalidate(self, table: Optional[str] = None):
+        """
+        Descarta lo cacheado de una tabla (o todo, sin tabla).
+        """
+        with self._lock:
+            self._generation += 1
+            if table is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[1] == table]:
+                del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CachedDatabaseService:
+    """
+    Envuelve un DatabaseService (o PostgresDatabaseService): las lecturas de
+    CACHED_METHODS se sirven desde la caché y las escrituras invalidan su
+    tabla. Los resultados se comparten entre operadores: no hay que
+    modificarlos.
+    """
+
+    def __init__(self, db, cache: QueryCache):
+        self.db = db
+        self.cache = cache
+
+    def __getattr__(self, name: str):
+        method = getattr(self.db, name)
+        if name in CACHED_METHODS:
+            def cached(table, *args, **kwargs):
+                key = (name, table, _freeze(args), _freeze(kwargs))
+                return self.cache.get_or_load(key, lambda: method(table, *args, **kwargs))
+            return cached
+        if name in WRITE_METHODS:
+            def write(table, *args, **kwargs):
+                try:
+                    return method(table, *args, **kwargs)
+                finally:
+                    self.cache.invalidate(table)
+            return write
+        return method
+
+
+def watch_changes(cache: QueryCache, feed: ChangeFeed) -> threading.Thread:
+    """
+    Hilo en segundo plano que invalida la caché con cada lote de eventos del
+    feed. Tras un RESYNC (eventos perdidos al reconectar) se invalida todo.
+    Si el feed falla se invalida todo y el hilo termina: a partir de ahí la
+    frescura queda acotada solo por el TTL.
+    """
+    def run():
+        try:
+            while True:
+                events = feed.wait(None)
+                if RESYNC in events:
+                    cache.invalidate()
+                    continue
+                for table in {event.table for event in events}:
+                    cache.invalidate(table)
+        except Exception as e:
+            print(f"[CACHE] feed de cambios caído ({e}); solo TTL a partir de ahora.")
+            cache.invalidate()
+
+    thread = threading.Thread(target=run, name="query-cache-invalidation", daemon=True)
+    thread.start()
+    return thread
@@ -7,8 +7,8 @@ class SessionCreationService:
     Servicio para crear nuevas sesiones de compra colectiva.
     """
 
-    def __init__(self):
-        self.db = DatabaseService()
+    def __init__(self, db: DatabaseService = None):
+        self.db = db or DatabaseService()
 
     def create_session(
         self,
@@ -1,7 +1,41 @@
+import time
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional
 
-from services.database import DatabaseService
+from postgrest.exceptions import APIError
+
+from services.chain_index import ChainIndex
+from services.database import (
+    IN_FILTER_CHUNK_SIZE,
+    RELATIONSHIP_NOT_FOUND_CODE,
+    UNIQUE_VIOLATION_CODE,
+    DatabaseService,
+)
+from services.deadline_scheduler import DeadlineScheduler, Watermark, schedule_rows
+from services.shard_lease import ShardLease
+
+
+def session_from_pool(pool_row: dict, auto_generated: bool = True) -> dict:
+    """
+    Fila de 'sessions' para activar una plantilla de sessions_pool, con la
+    caducidad estándar de 5 días desde la activación.
+    """
+    now_utc = datetime.now(timezone.utc)
+    expiry = now_utc + timedelta(days=5)
+
+    return {
+        "product_id": pool_row["product_id"],
+        "operator_code": pool_row["operator_code"],
+        "max_participants": pool_row["max_participants"],
+        "amount": pool_row["amount"],
+        "status": "open",
+        "expiry_timestamp": expiry.isoformat(),
+        "chain_group_id": pool_row.get("chain_group_id"),
+        "chain_index": pool_row.get("chain_index"),
+        "is_auto_generated": auto_generated,
+        "pool_id": pool_row["id"],
+        "chain_advanced": False,
+    }
 
 
 class SessionPoolService:
@@ -10,83 +44,135 @@ class SessionPoolService:
     a partir de plantillas preconfiguradas.
     """
 
-    def __init__(self):
-        self.db = DatabaseService()
+    def __init__(self, db: DatabaseService = None, shards: ShardLease = None):
+        self.db = db or DatabaseService()
+        # Con varios workers, solo se activan las plantillas de los shards
+        # arrendados (ver services/shard_lease.py); None = todas.
+        self.shards = shards
+        # Se desactiva tras el primer fallo si falta la clave foránea sessions.pool_id.
+        self._anti_join_available = True
+        self.chains = ChainIndex(self.db)
+        # Plazos de activación de las plantillas programadas (ver refresh_activations).
+        self.activations = DeadlineScheduler()
+        self._activations_watermark = Watermark()
+        self._activations_shards_version = None
 
     def _fetch_scheduled_pool_entries(self) -> List[dict]:
         """
         Devuelve entradas del pool tipo 'scheduled' cuya start_timestamp ya ha llegado.
         Solo se tendrán en cuenta las que aún no tienen sesión creada (no hay sessions.pool_id = pool.id).
         """
-        result = self.db.fetch_by_field("sessions_pool", "type", "scheduled")
-        entries = result.data or []
-        now_utc = datetime.now(timezone.utc)
-
-        # filtrar por start_timestamp <= now y sin sesión asociada
-        eligible = []
-        for row in entries:
-            start_ts = row.get("start_timestamp")
-            if not start_ts:
-                continue
+        now_iso = datetime.now(timezone.utc).isoformat()
+        return self._fetch_unactivated_scheduled([("lte", "start_timestamp", now_iso)])
 
-            if isinstance(start_ts, str):
-                start_dt = datetime.fromisoformat(start_ts.replace("Z", "+00:00"))
-            else:
-                start_dt = start_ts
+    def _fetch_unactivated_scheduled(self, filters: List[tuple], columns: str = "*") -> List[dict]:
+        """
+        Plantillas 'scheduled' que cumplen filters y aún no tienen sesión creada.
 
-            if start_dt <= now_utc:
-                # comprobar si ya hay una sesión creada a partir de este pool_id
-                existing = self.db.fetch_by_field("sessions", "pool_id", row["id"])
-                if not existing.data:
-                    eligible.append(row)
+        Todo se resuelve en una consulta (paginada con iter_rows): los
+        filtros y un anti-join con sessions (recurso embebido sessions(id)
+        filtrado con is.null, vía la clave foránea sessions.pool_id). Así el
+        coste depende de las plantillas pendientes, no del tamaño del parque.
 
-        return eligible
+        Si PostgREST no conoce la relación, se cae a dos consultas: las
+        plantillas y un pool_id IN (...) sobre sessions.
+        """
+        filters = [("eq", "type", "scheduled")] + (self.shards.filters() if self.shards else []) + list(filters)
+
+        if self._anti_join_available:
+            try:
+                entries = list(self.db.iter_rows(
+                    "sessions_pool",
+                    filters + [("is", "sessions", "null")],
+                    columns=f"{columns}, sessions(id)",
+                ))
+            except APIError as e:
+                if e.code != RELATIONSHIP_NOT_FOUND_CODE:
+                    raise
+                print("[POOL] sin relación sessions.pool_id → sessions_pool.id; se usa pool_id IN (...).")
+                self._anti_join_available = False
+            else:
+                for row in entries:
+                    row.pop("sessions", None)
+                return entries
+
+        entries = list(self.db.iter_rows("sessions_pool", filters, columns=columns))
+        activated = {
+            s["pool_id"]
+            for s in self.db.fetch_in("sessions", "pool_id", [row["id"] for row in entries], columns="pool_id")
+        }
+        return [row for row in entries if row["id"] not in activated]
 
-    def _create_session_from_pool(self, pool_row: dict, auto_generated: bool = True) -> dict:
+    def refresh_activations(self):
+        """
+        Mantiene self.activations al día: la primera vez carga la
+        start_timestamp de todas las plantillas programadas sin activar
+        (todas las páginas antes de fijar la marca de agua); después solo
+        las creadas desde la última vista (ver Watermark: con solape y una
+        recarga completa periódica). Cada start_timestamp se convierte a
+        epoch una sola vez. Si cambian los shards arrendados, se vuelve a
+        cargar todo.
+        """
+        if self.shards and self.shards.version != self._activations_shards_version:
+            self._activations_watermark.reset()
+            self._activations_shards_version = self.shards.version
+        full = self._activations_watermark.full_load_due()
+        activations = DeadlineScheduler() if full else self.activations
+        rows = self._fetch_unactivated_scheduled(
+            self._activations_watermark.filters(),
+            columns="id,start_timestamp,created_at",
+        )
+        latest = schedule_rows(activations, rows, "start_timestamp")
+        self.activations = activations
+        self._activations_watermark.advance(latest, full)
+
+    def _create_session_from_pool(self, pool_row: dict, auto_generated: bool = True) -> Optional[dict]:
         """
         Crea una sesión activa (en 'sessions') a partir de una fila de sessions_pool.
         Aplica caducidad estándar de 5 días desde la activación.
-        """
-
-        now_utc = datetime.now(timezone.utc)
-        expiry = now_utc + timedelta(days=5)
-
-        data = {
-            "product_id": pool_row["product_id"],
-            "operator_code": pool_row["operator_code"],
-            "max_participants": pool_row["max_participants"],
-            "amount": pool_row["amount"],
-            "status": "open",
-            "expiry_timestamp": expiry.isoformat(),
-            "chain_group_id": pool_row.get("chain_group_id"),
-            "chain_index": pool_row.get("chain_index"),
-            "is_auto_generated": auto_generated,
-            "pool_id": pool_row["id"],
-        }
 
-        result = self.db.insert("sessions", data)
+        Devuelve None si la plantilla ya tiene sesión (restricción única
+        sessions.pool_id): otro worker la ha activado a la vez.
+        """
+        try:
+            result = self.db.insert("sessions", session_from_pool(pool_row, auto_generated))
+        except APIError as e:
+            if e.code != UNIQUE_VIOLATION_CODE:
+                raise
+            print(f"[POOL] la plantilla {pool_row['id']} ya tiene sesión; se omite.")
+            return None
         return result.data[0]
 
     def process_scheduled_sessions(self):
         """
         Activa sesiones programadas ('scheduled') cuya start_timestamp ya ha llegado.
-        """
-        scheduled = self._fetch_scheduled_pool_entries()
-        for row in scheduled:
-            self._create_session_from_pool(row, auto_generated=False)
 
-    def get_next_in_chain_from_pool(self, chain_group_id: str, current_index: int) -> Optional[dict]:
+        Solo se sacan del planificador de plazos las plantillas vencidas
+        (O(k log n)); se releen por id (con el mismo anti-join, por si otra
+        vía ya las activó) y se crean sus sesiones.
+        """
+        self.refresh_activations()
+        due = self.activations.pop_due(time.time())
+        for start in range(0, len(due), IN_FILTER_CHUNK_SIZE):
+            chunk = due[start:start + IN_FILTER_CHUNK_SIZE]
+            for row in self._fetch_unactivated_scheduled([("in", "id", chunk)]):
+                self._create_session_from_pool(row, auto_generated=False)
+
+    def get_next_in_chain_from_pool(
+        self,
+        chain_group_id: str,
+        current_index: int,
+        operator_code: Optional[str] = None,
+    ) -> Optional[dict]:
         """
         Recupera la siguiente plantilla de la cadena desde sessions_pool.
         ej: current_index = 1 → busca chain_index = 2.
+
+        Se resuelve en el índice de cadenas en memoria (ver ChainIndex), que
+        se carga la primera vez y después solo recibe las plantillas nuevas.
         """
-        # no tenemos un método de filter complejo, así que traemos por grupo y filtramos en memoria
-        result = self.db.fetch_by_field("sessions_pool", "chain_group_id", chain_group_id)
-        rows = result.data or []
-        for row in rows:
-            if row.get("chain_index") == current_index + 1:
-                return row
-        return None
+        self.chains.refresh()
+        return self.chains.get(chain_group_id, operator_code, current_index + 1)
 
     def create_next_session_in_chain_if_needed(self, session: dict):
         """
@@ -94,27 +180,38 @@ class SessionPoolService:
         intenta crear la siguiente sesión (X23.2, X23.3, etc.) a partir de sessions_pool.
         Solo lo hace si aún no existe esa siguiente sesión en 'sessions'.
         """
+        self.advance_chains([session])
 
-        chain_group_id = session.get("chain_group_id")
-        chain_index = session.get("chain_index")
-        if not chain_group_id or chain_index is None:
-            return  # esta sesión no pertenece a una cadena
-
-        # comprobar si ya existe la siguiente sesión en la cadena
-        existing_next = self.db.fetch_by_field("sessions", "chain_group_id", chain_group_id)
-        next_index = chain_index + 1
+    def advance_chains(self, sessions: List[dict]):
+        """
+        Crea, para un lote de sesiones adjudicadas, la siguiente sesión de su
+        cadena (X23.1 → X23.2 → X23.3...) y las marca con chain_advanced = true,
+        de modo que cada sesión se procesa una sola vez.
+
+        - Las plantillas siguientes salen del índice en memoria (O(1) por sesión).
+        - La comprobación de "ya existe la siguiente sesión" es una sola
+          consulta pool_id IN (...) para todo el lote, en lugar de traer todas
+          las sesiones de cada cadena.
+        - Las sesiones sin cadena, o cuya cadena ya ha terminado, también se
+          marcan: no hay nada más que hacer con ellas.
+        """
+        if not sessions:
+            return
 
-        if existing_next.data:
-            for s in existing_next.data:
-                if s.get("chain_index") == next_index:
-                    # ya existe X23.(index+1), no hacemos nada
-                    return
+        self.chains.refresh()
+        successors = {}
+        for session in sessions:
+            pool_row = self.chains.next_for(session)
+            if pool_row:
+                successors[pool_row["id"]] = pool_row
 
-        # buscar plantilla de la siguiente sesión en sessions_pool
-        pool_row = self.get_next_in_chain_from_pool(chain_group_id, chain_index)
-        if not pool_row:
-            # no hay más sesiones en el parque para esta cadena
-            return
+        existing = {
+            row["pool_id"]
+            for row in self.db.fetch_in("sessions", "pool_id", list(successors), columns="pool_id")
+        }
+        for pool_id, pool_row in successors.items():
+            if pool_id not in existing:
+                # crear nueva sesión activa desde el pool
+                self._create_session_from_pool(pool_row, auto_generated=True)
 
-        # crear nueva sesión activa desde el pool
-        self._create_session_from_pool(pool_row, auto_generated=True)
+        self.db.update_many("sessions", [s["id"] for s in sessions], {"chain_advanced": True})
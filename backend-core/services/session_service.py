@@ -1,9 +1,17 @@
-from datetime import datetime, timezone
-from typing import List
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
 
 from services.database import DatabaseService
-from services.adjudication_service import AdjudicationService
+from services.deadline_scheduler import DeadlineScheduler, Watermark, schedule_rows
+from services.adjudication_service import SESSION_ADJUDICATIONS_TABLE, AdjudicationService
 from services.session_pool_service import SessionPoolService
+from services.shard_lease import ShardLease
+
+
+# Una sesión en 'complete' desde hace menos de esto puede estar aún
+# adjudicándose (en este u otro worker): la recuperación no la toca.
+RECOVERY_GRACE_SECONDS = 60
 
 
 class SessionService:
@@ -16,17 +24,59 @@ class SessionService:
     - Encadenar sesiones (X23.1 → X23.2 → X23.3…) a partir del sessions_pool.
     """
 
-    def __init__(self):
-        self.db = DatabaseService()
-        self.adjudication_service = AdjudicationService()
-        self.pool = SessionPoolService()
+    def __init__(self, db: DatabaseService = None, adjudication_service=None, pool=None, shards: ShardLease = None):
+        self.db = db or DatabaseService()
+        self.adjudication_service = adjudication_service or AdjudicationService(db=self.db)
+        self.pool = pool or SessionPoolService(db=self.db, shards=shards)
+        # Con varios workers, solo se procesan las sesiones de los shards
+        # arrendados (ver services/shard_lease.py); None = todas.
+        self.shards = shards
+        # Plazos de caducidad de las sesiones abiertas (ver refresh_expiries).
+        self.expiries = DeadlineScheduler()
+        self._expiries_watermark = Watermark()
+        self._expiries_shards_version = None
+        self.recovery_grace_seconds = RECOVERY_GRACE_SECONDS
+
+    def _shard_filters(self) -> list:
+        return self.shards.filters() if self.shards else []
 
     def _get_open_sessions(self) -> List[dict]:
         """
-        Recupera todas las sesiones en estado 'open'.
+        Recupera todas las sesiones en estado 'open' (solo las columnas que
+        necesitan la comprobación de caducidad y la de aforo), página a
+        página: un único select se quedaría en las primeras max-rows.
         """
-        result = self.db.fetch_by_field("sessions", "status", "open")
-        return result.data or []
+        return list(self.db.iter_rows(
+            "sessions",
+            [("eq", "status", "open")] + self._shard_filters(),
+            columns="id,max_participants,expiry_timestamp",
+        ))
+
+    def refresh_expiries(self):
+        """
+        Mantiene self.expiries al día: la primera vez carga la caducidad de
+        todas las sesiones abiertas (paginando hasta el final antes de fijar
+        la marca de agua); después solo pide las sesiones abiertas creadas
+        desde la última vista (ver Watermark: con solape y una recarga
+        completa periódica). Cada expiry_timestamp se convierte a epoch una
+        sola vez.
+
+        Si cambian los shards arrendados, se vuelve a cargar todo (de los
+        shards nuevos).
+        """
+        if self.shards and self.shards.version != self._expiries_shards_version:
+            self._expiries_watermark.reset()
+            self._expiries_shards_version = self.shards.version
+        full = self._expiries_watermark.full_load_due()
+        expiries = DeadlineScheduler() if full else self.expiries
+        rows = self.db.iter_rows(
+            "sessions",
+            [("eq", "status", "open")] + self._shard_filters() + self._expiries_watermark.filters(),
+            columns="id,expiry_timestamp,created_at",
+        )
+        latest = schedule_rows(expiries, rows, "expiry_timestamp")
+        self.expiries = expiries
+        self._expiries_watermark.advance(latest, full)
 
     def _is_expired(self, session: dict) -> bool:
         """
@@ -44,29 +94,53 @@ class SessionService:
         now_utc = datetime.now(timezone.utc)
         return now_utc > expiry_dt
 
-    def _is_session_full(self, session: dict) -> bool:
+    def _count_participants(self, sessions: List[dict]) -> Dict[str, int]:
+        """
+        Participantes por sesión ({session_id: count}) en una sola consulta
+        agrupada, en lugar de un COUNT por sesión.
+        """
+        return self.db.count_by_field_many("participants", "session_id", [s["id"] for s in sessions])
+
+    def _is_session_full(self, session: dict, participant_count: int = None) -> bool:
         """
         Comprueba si el número de participantes alcanza o supera max_participants.
         Cada fila en participants corresponde a un participante con pago preautorizado OK.
+
+        Si no se pasa participant_count (ya calculado en bloque), se consulta.
         """
-        session_id = session["id"]
-        max_participants = session["max_participants"]
-        count = self.db.count_by_field("participants", "session_id", session_id)
-        return count >= max_participants
+        if participant_count is None:
+            participant_count = self.db.count_by_field("participants", "session_id", session["id"])
+        return participant_count >= session["max_participants"]
 
     def _close_session(self, session: dict):
         """
         Marca la sesión como 'complete' y fija closing_timestamp.
         """
-        session_id = session["id"]
+        self._close_sessions([session])
+
+    def _close_sessions(self, sessions: List[dict]) -> List[dict]:
+        """
+        Marca varias sesiones como 'complete' en bloque (UPDATE ... WHERE id IN (...)).
+        Todas las sesiones cerradas en el mismo tick comparten closing_timestamp.
+
+        Es un compare-and-set (... AND status = 'open'): devuelve solo las
+        sesiones que ha cerrado esta llamada. Si otro worker se adelantó, su
+        sesión no aparece y no se vuelve a adjudicar.
+        """
+        if not sessions:
+            return []
         closing_ts = datetime.now(timezone.utc).isoformat()
-        self.db.update(
+        for s in sessions:
+            self.expiries.cancel(s["id"])
+        return self.db.update_many(
             "sessions",
-            session_id,
+            [s["id"] for s in sessions],
             {
                 "status": "complete",
                 "closing_timestamp": closing_ts,
             },
+            filters=[("eq", "status", "open")],
+            returning=True,
         )
 
     def _expire_session(self, session: dict):
@@ -74,11 +148,22 @@ class SessionService:
         Marca la sesión como 'expired' porque no alcanzó el aforo
         antes de la fecha/hora de caducidad.
         """
-        session_id = session["id"]
-        self.db.update(
+        self._expire_sessions([session])
+
+    def _expire_sessions(self, sessions: List[dict]):
+        """
+        Marca varias sesiones como 'expired' en bloque (UPDATE ... WHERE id IN (...)).
+        Solo se tocan las que siguen en 'open'.
+        """
+        if not sessions:
+            return
+        for s in sessions:
+            self.expiries.cancel(s["id"])
+        self.db.update_many(
             "sessions",
-            session_id,
-            {"status": "expired"}
+            [s["id"] for s in sessions],
+            {"status": "expired"},
+            filters=[("eq", "status", "open")],
         )
         # Aquí, en producción, deberíamos notificar a la Fintech para que
         # libere/ignore/caducen las preautorizaciones asociadas.
@@ -89,26 +174,120 @@ class SessionService:
         - Si una sesión ha caducado sin aforo completo → status = 'expired'.
         - Si una sesión aún está dentro de plazo y el aforo está completo →
           se cierra (complete) y se adjudica automáticamente.
+
+        Las transiciones de todo el tick se acumulan y se escriben en bloque
+        (un UPDATE por bloque de ids, ver DatabaseService.update_many). Los
+        cierres se escriben antes de adjudicar, de modo que la adjudicación
+        siempre ve la sesión ya en 'complete' con su closing_timestamp.
+        Las que se quedaron en 'complete' en un tick anterior se recuperan
+        primero (ver recover_unadjudicated_sessions).
+
+        El planificador de plazos caduca las vencidas que conoce; las demás
+        sesiones abiertas se vuelven a comprobar contra su expiry_timestamp
+        antes de cerrarlas (una vencida que el planificador no tenía, p. ej.
+        con la caducidad cambiada después de programarla, se caduca y no se
+        adjudica).
+        """
+        self.recover_unadjudicated_sessions()
+        self.expire_due_sessions()
+        self._process_open(self._get_open_sessions())
+
+    def process_sessions(self, session_ids: List[str]):
+        """
+        Misma lógica que process_open_sessions, pero solo para las sesiones
+        indicadas (p. ej. las que acaban de recibir participantes, en el
+        worker en modo eventos). Las que ya no están 'open', o son de shards
+        de otro worker, se ignoran.
         """
-        open_sessions = self._get_open_sessions()
+        sessions = self.db.fetch_in("sessions", "id", session_ids)
+        self._process_open([
+            s for s in sessions
+            if s.get("status") == "open" and (self.shards is None or self.shards.owns(s))
+        ])
+
+    def expire_due_sessions(self):
+        """
+        Marca como 'expired' las sesiones 'open' cuya expiry_timestamp ya ha
+        pasado. Solo se sacan del planificador de plazos las vencidas
+        (O(k log n)), sin recorrer ni parsear el resto de sesiones abiertas.
+        """
+        self.refresh_expiries()
+        due = self.expiries.pop_due(time.time())
+        self._expire_sessions([{"id": session_id} for session_id in due])
+
+    def _process_open(self, open_sessions: List[dict]):
+        in_time, expired = [], []
         for session in open_sessions:
             # 1) Si está caducada, se marca como 'expired' y NO se adjudica
             if self._is_expired(session):
-                self._expire_session(session)
+                expired.append(session)
                 continue
+            in_time.append(session)
+        self._expire_sessions(expired)
+        self._close_full_sessions(in_time)
+
+    def _close_full_sessions(self, in_time: List[dict]):
+        # 2) Si aún está dentro de plazo y el aforo está completo,
+        #    se cierra y se adjudica (un único conteo agrupado por tick)
+        counts = self._count_participants(in_time)
+        full = [s for s in in_time if self._is_session_full(s, counts[s["id"]])]
+        self._adjudicate_sessions(self._close_sessions(full))
 
-            # 2) Si aún está dentro de plazo y el aforo está completo,
-            #    se cierra y se adjudica
-            if self._is_session_full(session):
-                self._close_session(session)
+    def _adjudicate_sessions(self, sessions: List[dict]):
+        """
+        Adjudica cada sesión por separado: un fallo se registra y no impide
+        adjudicar las demás (la sesión queda en 'complete' y la recoge
+        recover_unadjudicated_sessions en el siguiente tick).
+        """
+        for session in sessions:
+            try:
                 self.adjudication_service.adjudicate(session["id"])
+            except Exception as e:
+                print(f"[WORKER ERROR] adjudicación de {session['id']}: {e}")
+
+    def _stuck_filters(self) -> list:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.recovery_grace_seconds)
+        return [("eq", "status", "complete"), ("lt", "closing_timestamp", cutoff.isoformat())]
+
+    def recover_unadjudicated_sessions(self):
+        """
+        Sesiones que siguen en 'complete' (su adjudicación falló o el worker
+        cayó entre el cierre y la adjudicación):
+        - sin fila en session_adjudications → se adjudican de nuevo;
+        - con fila (el worker cayó después de guardarla) → solo se pasan a
+          'adjudicated'.
+        Solo se miran las cerradas hace más de recovery_grace_seconds, para
+        no adjudicar dos veces una sesión que otro worker acaba de cerrar.
+        La adjudicación es determinista y se guarda por session_id, así que
+        repetirla no cambia el resultado.
+        """
+        complete = [
+            s["id"] for s in self.db.iter_rows(
+                "sessions", self._stuck_filters() + self._shard_filters(), columns="id"
+            )
+        ]
+        if not complete:
+            return
+        stored = {
+            row["session_id"]
+            for row in self.db.fetch_in(SESSION_ADJUDICATIONS_TABLE, "session_id", complete, columns="session_id")
+        }
+        if stored:
+            self.db.update_many(
+                "sessions", sorted(stored), {"status": "adjudicated"}, filters=[("eq", "status", "complete")]
+            )
+        self._adjudicate_sessions([{"id": session_id} for session_id in complete if session_id not in stored])
 
     def _get_adjudicated_sessions(self) -> List[dict]:
         """
-        Recupera sesiones ya adjudicadas (ganador decidido),
-        candidatas a encadenar (crear la siguiente X23.2).
+        Recupera sesiones ya adjudicadas (ganador decidido) cuya cadena aún no
+        se ha hecho avanzar (chain_advanced = false), candidatas a encadenar
+        (crear la siguiente X23.2). Las ya procesadas no vuelven a leerse.
         """
-        result = self.db.fetch_by_field("sessions", "status", "adjudicated")
+        result = self.db.fetch_filtered(
+            "sessions",
+            [("eq", "status", "adjudicated"), ("eq", "chain_advanced", False)] + self._shard_filters(),
+        )
         return result.data or []
 
     def process_chains_for_adjudicated_sessions(self):
@@ -116,8 +295,9 @@ class SessionService:
         Para cada sesión 'adjudicated' que pertenece a una cadena (chain_group_id),
         intenta crear la siguiente sesión a partir de sessions_pool.
         (X23.1 → X23.2 → X23.3...)
+
+        El trabajo por tick es proporcional a las sesiones adjudicadas desde
+        el tick anterior, no al histórico.
         """
         adjudicated = self._get_adjudicated_sessions()
-        for session in adjudicated:
-            self.pool.create_next_session_in_chain_if_needed(session)
-
+        self.pool.advance_chains(adjudicated)
@@ -0,0 +1,77 @@
+"""
+Reparto de sesiones entre varios workers (session_worker.py --sharded).
+
+Las sesiones y las plantillas se reparten en SHARD_COUNT shards fijos según
+un hash estable de su id (columna generada shard, ver
+sql/006_worker_shards.sql). Cada worker tiene un arrendamiento renovable
+sobre un subconjunto de shards y solo procesa las filas de esos shards.
+
+- claim_shard_leases (función SQL) renueva los shards propios y, con el
+  número de workers vivos, reparte a partes iguales: si sobran shards se
+  ceden, si faltan se cogen los libres o caducados. Un worker nuevo recibe
+  su parte en un par de renovaciones; uno caído la pierde al caducar.
+- Entre que un arrendamiento caduca y el worker se entera, dos workers
+  pueden creer que tienen el mismo shard; por eso las transiciones de estado
+  son además compare-and-set (UPDATE ... WHERE status = 'open') y solo
+  adjudica el worker que de verdad cerró la sesión.
+"""
+
+import hashlib
+import os
+import socket
+import uuid
+from typing import List, Optional
+
+from services.database import DatabaseService, Filter
+
+
+SHARD_COUNT = 64
+
+CLAIM_SHARDS_RPC = "claim_shard_leases"
+RELEASE_SHARDS_RPC = "release_shard_leases"
+
+
+def shard_of(key) -> int:
+    """
+    Shard de un id: los 32 primeros bits del md5 de su texto, módulo
+    SHARD_COUNT. Es la misma expresión que la columna generada en SQL.
+    """
+    return int(hashlib.md5(str(key).encode()).hexdigest()[:8], 16) % SHARD_COUNT
+
+
+class ShardLease:
+    def __init__(self, db: DatabaseService, owner: Optional[str] = None, ttl_seconds: int = 30):
+        self.db = db
+        self.owner = owner or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.ttl_seconds = ttl_seconds
+        self.shards: List[int] = []
+        # Cambia cada vez que cambia el conjunto de shards (los servicios
+        # recargan entonces sus planificadores de plazos).
+        self.version = 0
+
+    def renew(self) -> List[int]:
+        """
+        Renueva el arrendamiento (hay que llamarlo bastante antes de
+        ttl_seconds, p. ej. en cada tick) y devuelve los shards propios.
+        """
+        response = self.db.rpc(CLAIM_SHARDS_RPC, {"p_owner": self.owner, "p_ttl_seconds": self.ttl_seconds})
+        shards = sorted(response.data or [])
+        if shards != self.shards:
+            self.shards = shards
+            self.version += 1
+        return shards
+
+    def release(self):
+        """
+        Cede todos los shards (al parar el worker), para que los demás los
+        cojan en su siguiente renovación sin esperar a que caduquen.
+        """
+        self.db.rpc(RELEASE_SHARDS_RPC, {"p_owner": self.owner})
+        self.shards = []
+        self.version += 1
+
+    def filters(self) -> List[Filter]:
+        return [("in", "shard", self.shards)]
+
+    def owns(self, row: dict) -> bool:
+        return shard_of(row["id"]) in self.shards
@@ -1,18 +1,248 @@
-from supabase import create_client, Client
+import importlib.util
 import os
+import threading
+from typing import Dict, Optional
+
+import httpx
 from dotenv import load_dotenv
+from postgrest import SyncPostgrestClient
+from postgrest.utils import SyncClient
+from supabase import Client, create_client
 
 load_dotenv()
 
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+class ConnectionMetrics:
+    """
+    Contadores del pool HTTP compartido, a partir de los eventos de traza de
+    httpx: cuántas peticiones se han hecho, cuántas conexiones TCP se han
+    abierto y cuántos handshakes TLS ha costado. Una petición que no abre
+    conexión ha reutilizado una del pool. pool_waits cuenta las peticiones
+    que esperaron turno porque todas las conexiones estaban ocupadas (si
+    crece mucho, conviene subir SUPABASE_POOL_SIZE).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+        # Peticiones que tuvieron que esperar a que se liberase una conexión.
+        self.pool_waits = 0
+
+    def _trace(self, event: str, info: dict):
+        if event == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections += 1
+        elif event == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+
+    def on_wait(self):
+        with self._lock:
+            self.pool_waits += 1
+
+    def on_request(self, request: httpx.Request):
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections": self.connections,
+                "tls_handshakes": self.tls_handshakes,
+                "reused": self.requests - self.connections,
+                "pool_waits": self.pool_waits,
+            }
+
+
+class _BoundedSyncClient(SyncClient):
+    """
+    Sesión httpx que no deja más peticiones en vuelo que conexiones tiene el
+    pool: el resto espera aquí, no dentro de httpcore (con hilos esperando
+    conexión, httpcore 1.0 puede cerrar un socket que otro hilo está leyendo).
+    """
+
+    def __init__(self, *args, max_in_flight: int, metrics: "ConnectionMetrics", **kwargs):
+        super().__init__(*args, **kwargs)
+        self._max_in_flight = max_in_flight
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._metrics = metrics
+        # Sesión que sustituye a esta tras reset() (ver retire).
+        self._replacement: Optional["_BoundedSyncClient"] = None
+
+    def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        if not self._slots.acquire(blocking=False):
+            self._metrics.on_wait()
+            self._slots.acquire()
+        try:
+            replacement = self._replacement
+            if replacement is None:
+                return super().send(request, **kwargs)
+        finally:
+            self._slots.release()
+        # Petición preparada con esta sesión antes del reset(): sale por la nueva.
+        return replacement.send(request, **kwargs)
+
+    def retire(self, replacement: "_BoundedSyncClient"):
+        """
+        Deja de usar esta sesión: las peticiones que lleguen a partir de
+        ahora van por replacement; se esperan las que están en vuelo y
+        después se cierran las conexiones.
+        """
+        self._replacement = replacement
+        for _ in range(self._max_in_flight):
+            self._slots.acquire()
+        try:
+            self.close()
+        finally:
+            for _ in range(self._max_in_flight):
+                self._slots.release()
+
+
+class PooledPostgrestClient(SyncPostgrestClient):
+    """
+    Cliente PostgREST (table() / rpc(), como el de Supabase) sobre una única
+    sesión httpx con pool de conexiones keep-alive:
+
+    - pool_size conexiones (y peticiones en vuelo) como máximo, todas
+      reutilizables entre peticiones y entre hilos;
+    - HTTP/2 si está instalado h2 (varias peticiones por conexión);
+    - métricas de reutilización y handshakes (self.metrics);
+    - check_health() / reset() para comprobar y rehacer el pool.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        pool_size: int = 10,
+        http2: bool = True,
+        timeout: float = 120,
+        keepalive_expiry: float = 30.0,
+    ):
+        self.pool_size = pool_size
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.keepalive_expiry = keepalive_expiry
+        self.metrics = ConnectionMetrics()
+        self._reset_lock = threading.Lock()
+        self._headers = {**headers, "Accept": "application/json", "Content-Type": "application/json"}
+        super().__init__(base_url, headers=self._headers, timeout=timeout)
+
+    def create_session(self, base_url: str, headers: Dict[str, str], timeout, verify: bool = True) -> SyncClient:
+        return _BoundedSyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            follow_redirects=True,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            event_hooks={"request": [self.metrics.on_request]},
+            max_in_flight=self.pool_size,
+            metrics=self.metrics,
+        )
+
+    def check_health(self) -> bool:
+        """
+        True si PostgREST responde (HEAD a la raíz de la API, sin cuerpo).
+        """
+        try:
+            return self.session.head("/").status_code < 500
+        except httpx.HTTPError:
+            return False
+
+    def reset(self):
+        """
+        Abre una sesión nueva y cierra las conexiones de la anterior (p. ej.
+        tras un corte de red que haya dejado conexiones colgadas).
+
+        Se puede llamar con otros hilos usando el cliente: la sesión se
+        cambia bajo un cerrojo y la anterior solo se cierra cuando la nueva
+        ya está en su sitio y han terminado sus peticiones en vuelo (las que
+        ya tenían la sesión anterior en la mano salen por la nueva).
+        """
+        with self._reset_lock:
+            old = self.session
+            self.session = self.create_session(str(old.base_url), self._headers, old.timeout)
+        old.retire(self.session)
+
+
 class SupabaseConnection:
     def __init__(self):
         self.url = os.getenv("SUPABASE_URL")
         self.key = os.getenv("SUPABASE_KEY")
-        
+
         if not self.url or not self.key:
             raise ValueError("Supabase credentials not found. Check SUPABASE_URL and SUPABASE_KEY.")
 
-        self.client: Client = create_client(self.url, self.key)
+        self._client: Optional[Client] = None
+        self._client_lock = threading.Lock()
+        # Mismas cabeceras y URL que el cliente de supabase-py usa para PostgREST.
+        self.postgrest = PooledPostgrestClient(
+            f"{self.url}/rest/v1",
+            headers={"apikey": self.key, "Authorization": f"Bearer {self.key}"},
+            pool_size=_env_int("SUPABASE_POOL_SIZE", 10),
+            http2=os.getenv("SUPABASE_HTTP2", "1") != "0",
+            timeout=_env_int("SUPABASE_TIMEOUT", 120),
+        )
 
     def get_client(self) -> Client:
-        return self.client
+        """
+        Cliente completo de supabase-py (auth, storage, PostgREST...). Se crea
+        la primera vez que se pide: DatabaseService no lo necesita.
+        """
+        with self._client_lock:
+            if self._client is None:
+                self._client = create_client(self.url, self.key)
+            return self._client
+
+    def get_postgrest_client(self) -> PooledPostgrestClient:
+        """
+        Cliente PostgREST con pool de conexiones compartido (el de
+        DatabaseService, ver get_shared_client).
+        """
+        return self.postgrest
+
+
+_shared_client: Optional[PooledPostgrestClient] = None
+_shared_client_lock = threading.Lock()
+
+
+def get_shared_client() -> PooledPostgrestClient:
+    """
+    Cliente único por proceso: todos los DatabaseService() sin cliente
+    explícito (servicios, vistas del dashboard, scripts) comparten el mismo
+    pool de conexiones en lugar de abrir cada uno el suyo. En Streamlit
+    sobrevive entre reruns, porque el módulo solo se importa una vez.
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = SupabaseConnection().get_postgrest_client()
+        return _shared_client
+
+
+async def create_async_supabase_client():
+    """
+    Cliente Supabase asíncrono (mismas credenciales que SupabaseConnection),
+    para los servicios de services/async_*.py: execute() es awaitable.
+    """
+    from supabase import acreate_client
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+    if not url or not key:
+        raise ValueError("Supabase credentials not found. Check SUPABASE_URL and SUPABASE_KEY.")
+    return await acreate_client(url, key)
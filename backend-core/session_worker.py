@@ -1,9 +1,116 @@
+import argparse
+import asyncio
+import os
 import time
+from typing import Dict, Optional
+
+from services.database import DatabaseService, create_database_service
 from services.session_service import SessionService
 from services.session_pool_service import SessionPoolService
+from services.shard_lease import ShardLease
 
 
-def main(poll_interval_seconds: int = 5):
+def _check_connection(db: DatabaseService):
+    """
+    Tras un error, comprueba que PostgREST responde y, si no, rehace el pool
+    de conexiones compartido (ver supabase_client.PooledPostgrestClient).
+    El backend Postgres directo (psycopg_pool) ya descarta por su cuenta las
+    conexiones rotas.
+    """
+    check_health = getattr(getattr(db, "client", None), "check_health", None)
+    if check_health is not None and not check_health():
+        print("[WORKER] PostgREST no responde; se rehace el pool de conexiones.")
+        db.client.reset()
+
+
+def run_tick(session_service: SessionService, pool_service: SessionPoolService):
+    # 1) Activar sesiones programadas (parque de sesiones)
+    pool_service.process_scheduled_sessions()
+
+    # 2) Procesar sesiones abiertas (caducidad, cierre, adjudicación)
+    session_service.process_open_sessions()
+
+    # 3) Encadenar sesiones para las sesiones adjudicadas
+    session_service.process_chains_for_adjudicated_sessions()
+
+
+async def _timed(timings: Dict[str, float], phase: str, coro):
+    start = time.perf_counter()
+    try:
+        await coro
+    finally:
+        timings[phase] = time.perf_counter() - start
+
+
+async def run_tick_async(session_service, pool_service) -> Dict[str, float]:
+    """
+    Tick del worker asíncrono (ver services/async_session_service.py): las
+    tres fases se lanzan a la vez y comparten el límite de consultas
+    simultáneas de la base de datos. Devuelve la duración de cada fase en
+    segundos (también "total").
+    """
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+    await asyncio.gather(
+        _timed(timings, "scheduled", pool_service.process_scheduled_sessions()),
+        _timed(timings, "open", session_service.process_open_sessions()),
+        _timed(timings, "chains", session_service.process_chains_for_adjudicated_sessions()),
+    )
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+async def _run_async(poll_interval_seconds: float):
+    from services.adjudication_service import AdjudicationService
+    from services.async_database import AsyncDatabaseService
+    from services.async_session_pool_service import AsyncSessionPoolService
+    from services.async_session_service import AsyncSessionService
+
+    db = await AsyncDatabaseService.connect()
+    pool_service = AsyncSessionPoolService(db=db)
+    # El motor de adjudicación sigue siendo síncrono: se ejecuta en hilos.
+    session_service = AsyncSessionService(
+        db=db, adjudication_service=AdjudicationService(db=DatabaseService()), pool=pool_service
+    )
+
+    while True:
+        try:
+            timings = await run_tick_async(session_service, pool_service)
+            print("[WORKER] tick " + ", ".join(f"{phase}={seconds * 1000:.0f}ms" for phase, seconds in timings.items()))
+        except Exception as e:
+            print(f"[WORKER ERROR] {e}")
+
+        await asyncio.sleep(poll_interval_seconds)
+
+
+def run_sharded(session_service, pool_service, lease, poll_interval_seconds: float, ticks: Optional[int] = None):
+    """
+    Bucle del modo poll con varios workers: antes de cada tick se renueva el
+    arrendamiento de shards (services/shard_lease.py), y los servicios solo
+    ven las sesiones y plantillas de esos shards. Al salir se ceden los
+    shards para que los demás workers los recojan enseguida.
+    """
+    done = 0
+    try:
+        while ticks is None or done < ticks:
+            try:
+                lease.renew()
+                run_tick(session_service, pool_service)
+            except Exception as e:
+                print(f"[WORKER ERROR] {e}")
+                _check_connection(session_service.db)
+            done += 1
+            time.sleep(poll_interval_seconds)
+    finally:
+        lease.release()
+
+
+def main(
+    poll_interval_seconds: int = 5,
+    mode: str = "poll",
+    resync_interval_seconds: float = 60.0,
+    sharded: bool = False,
+):
     """
     Worker sencillo que:
     - Cada poll_interval_seconds:
@@ -13,26 +120,79 @@ def main(poll_interval_seconds: int = 5):
             - Cierra + adjudica las que alcanzan aforo dentro de plazo.
         3) Procesa cadenas de sesiones para las que están en 'adjudicated':
             - X23.1 -> X23.2 -> X23.3 desde sessions_pool.
+
+    Con mode="events" no hay sondeo fijo: el worker escucha las
+    notificaciones de Postgres (LISTEN platform_changes, ver
+    sql/004_change_notifications.sql y DATABASE_URL) y se despierta en los
+    plazos de caducidad/activación conocidos, con un tick completo cada
+    resync_interval_seconds (ver services/event_worker.py). El modo "poll"
+    sigue siendo el de por defecto y el de respaldo.
+
+    Con mode="async" el tick es el mismo que en "poll", pero sobre el
+    cliente asíncrono de Supabase: las fases, los bloques de consultas y las
+    adjudicaciones van a la vez, con límites de concurrencia (ver
+    run_tick_async).
+
+    Con sharded=True (solo en modo poll) pueden correr varios workers a la
+    vez: cada uno arrienda una parte de los shards de sesiones y las
+    transiciones son compare-and-set, así que ninguna sesión se adjudica dos
+    veces (ver services/shard_lease.py y sql/006_worker_shards.sql).
     """
-    session_service = SessionService()
-    pool_service = SessionPoolService()
+    if sharded and mode != "poll":
+        raise ValueError("El reparto en shards (--sharded) solo está disponible en modo poll.")
 
-    while True:
-        try:
-            # 1) Activar sesiones programadas (parque de sesiones)
-            pool_service.process_scheduled_sessions()
+    if mode == "async":
+        asyncio.run(_run_async(poll_interval_seconds))
+        return
 
-            # 2) Procesar sesiones abiertas (caducidad, cierre, adjudicación)
-            session_service.process_open_sessions()
+    # DB_BACKEND=postgres → conexión directa a Postgres en lugar de PostgREST.
+    db = create_database_service()
+    lease = None
+    if sharded:
+        lease = ShardLease(db)
+    pool_service = SessionPoolService(db=db, shards=lease)
+    session_service = SessionService(db=db, pool=pool_service, shards=lease)
 
-            # 3) Encadenar sesiones para las sesiones adjudicadas
-            session_service.process_chains_for_adjudicated_sessions()
+    if mode == "events":
+        from services.change_feed import PostgresChangeFeed
+        from services.event_worker import EventDrivenWorker
 
+        dsn = os.getenv("DATABASE_URL")
+        if not dsn:
+            raise ValueError("El modo eventos requiere DATABASE_URL (conexión directa a Postgres).")
+        worker = EventDrivenWorker(
+            session_service,
+            pool_service,
+            PostgresChangeFeed(dsn),
+            resync_interval_seconds=resync_interval_seconds,
+        )
+        worker.run_forever()
+        return
+
+    if lease is not None:
+        run_sharded(session_service, pool_service, lease, poll_interval_seconds)
+        return
+
+    while True:
+        try:
+            run_tick(session_service, pool_service)
         except Exception as e:
             print(f"[WORKER ERROR] {e}")
+            _check_connection(db)
 
         time.sleep(poll_interval_seconds)
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Worker de sesiones de The Platform.")
+    parser.add_argument("--mode", choices=["poll", "events", "async"], default=os.getenv("WORKER_MODE", "poll"))
+    parser.add_argument("--poll-interval", type=int, default=5)
+    parser.add_argument("--resync-interval", type=float, default=60.0)
+    parser.add_argument(
+        "--sharded",
+        action="store_true",
+        default=os.getenv("WORKER_SHARDED") == "1",
+        help="varios workers a la vez, repartiendo las sesiones por shards (sql/006_worker_shards.sql)",
+    )
+    args = parser.parse_args()
+    main(args.poll_interval, args.mode, args.resync_interval, args.sharded)
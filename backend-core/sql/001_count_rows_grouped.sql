@@ -0,0 +1,35 @@
+-- Conteo agrupado genérico para DatabaseService.count_by_field_many.
+--
+--   select * from count_rows_grouped('participants', 'session_id', array['<uuid>', ...]);
+--
+-- Devuelve una fila (value, row_count) por cada valor con al menos una fila.
+-- Los valores llegan como texto y se convierten al tipo real de la columna,
+-- de modo que el filtro usa el índice de la columna (p. ej. participants.session_id).
+
+create or replace function count_rows_grouped(p_table text, p_field text, p_values text[])
+returns table (value text, row_count bigint)
+language plpgsql
+stable
+as $$
+declare
+    v_type text;
+begin
+    select format_type(a.atttypid, a.atttypmod)
+      into v_type
+      from pg_attribute a
+     where a.attrelid = p_table::regclass
+       and a.attname = p_field
+       and not a.attisdropped;
+
+    if v_type is null then
+        raise exception 'La columna %.% no existe', p_table, p_field;
+    end if;
+
+    return query execute format(
+        'select %1$I::text, count(*) from %2$I where %1$I = any($1::%3$s[]) group by %1$I',
+        p_field, p_table, v_type
+    ) using p_values;
+end;
+$$;
+
+create index if not exists participants_session_id_idx on participants (session_id);
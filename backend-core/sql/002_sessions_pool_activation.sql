@@ -0,0 +1,22 @@
+-- Activación de plantillas programadas (SessionPoolService._fetch_scheduled_pool_entries).
+--
+-- La consulta del worker es un anti-join resuelto por PostgREST:
+--   sessions_pool?select=*,sessions(id)&type=eq.scheduled&start_timestamp=lte.<ahora>&sessions=is.null
+-- que necesita la clave foránea sessions.pool_id → sessions_pool.id y los índices de abajo.
+
+do $$
+begin
+    if not exists (
+        select 1 from pg_constraint where conname = 'sessions_pool_id_fkey'
+    ) then
+        alter table sessions
+            add constraint sessions_pool_id_fkey foreign key (pool_id) references sessions_pool (id);
+    end if;
+end;
+$$;
+
+create index if not exists sessions_pool_id_idx on sessions (pool_id);
+
+create index if not exists sessions_pool_scheduled_start_idx
+    on sessions_pool (start_timestamp)
+    where type = 'scheduled';
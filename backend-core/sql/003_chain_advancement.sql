@@ -0,0 +1,21 @@
+-- Encadenado de sesiones (SessionPoolService.advance_chains / ChainIndex).
+--
+-- chain_advanced marca las sesiones adjudicadas cuya cadena ya se ha hecho
+-- avanzar: el worker solo lee las pendientes (status = 'adjudicated' and
+-- chain_advanced = false), así que su trabajo no crece con el histórico.
+-- Las sesiones adjudicadas antes de esta migración se procesan una vez; la
+-- comprobación por pool_id evita duplicar sucesoras ya creadas.
+
+alter table sessions add column if not exists chain_advanced boolean not null default false;
+
+create index if not exists sessions_pending_chain_idx
+    on sessions (status)
+    where chain_advanced = false;
+
+-- created_at es la marca de agua con la que ChainIndex pide solo plantillas nuevas.
+alter table sessions_pool add column if not exists created_at timestamptz not null default now();
+
+create index if not exists sessions_pool_created_at_idx on sessions_pool (created_at);
+
+create index if not exists sessions_pool_chain_key_idx
+    on sessions_pool (chain_group_id, operator_code, chain_index);
@@ -0,0 +1,52 @@
+-- Notificaciones de cambios para el worker en modo eventos
+-- (session_worker.py --mode events, services/change_feed.py).
+--
+-- Cada cambio relevante hace pg_notify('platform_changes', json) con un
+-- payload pequeño (muy por debajo del límite de 8000 bytes de NOTIFY):
+--   {"table": "...", "op": "INSERT|UPDATE", "row": {...columnas necesarias...}}
+
+create or replace function notify_platform_change()
+returns trigger
+language plpgsql
+as $$
+declare
+    v_row jsonb;
+begin
+    if TG_TABLE_NAME = 'participants' then
+        v_row := jsonb_build_object('id', NEW.id, 'session_id', NEW.session_id);
+    elsif TG_TABLE_NAME = 'sessions' then
+        v_row := jsonb_build_object(
+            'id', NEW.id,
+            'status', NEW.status,
+            'expiry_timestamp', NEW.expiry_timestamp
+        );
+    else
+        v_row := jsonb_build_object(
+            'id', NEW.id,
+            'type', NEW.type,
+            'start_timestamp', NEW.start_timestamp
+        );
+    end if;
+
+    perform pg_notify(
+        'platform_changes',
+        jsonb_build_object('table', TG_TABLE_NAME, 'op', TG_OP, 'row', v_row)::text
+    );
+    return NEW;
+end;
+$$;
+
+drop trigger if exists participants_notify on participants;
+create trigger participants_notify
+    after insert on participants
+    for each row execute function notify_platform_change();
+
+drop trigger if exists sessions_notify on sessions;
+create trigger sessions_notify
+    after insert or update of status on sessions
+    for each row execute function notify_platform_change();
+
+drop trigger if exists sessions_pool_notify on sessions_pool;
+create trigger sessions_pool_notify
+    after insert on sessions_pool
+    for each row execute function notify_platform_change();
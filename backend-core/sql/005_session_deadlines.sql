@@ -0,0 +1,12 @@
+-- Planificador de plazos del worker (services/deadline_scheduler.py).
+--
+-- SessionService.refresh_expiries carga una vez la caducidad de las sesiones
+-- abiertas y después solo pide las creadas desde la última vista:
+--   sessions?select=id,expiry_timestamp,created_at&status=eq.open&created_at=gte.<marca>
+-- (sessions_pool.created_at, para las activaciones, ya lo añade 003).
+
+alter table sessions add column if not exists created_at timestamptz not null default now();
+
+create index if not exists sessions_open_created_at_idx
+    on sessions (created_at)
+    where status = 'open';
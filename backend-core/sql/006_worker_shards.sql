@@ -0,0 +1,110 @@
+-- Reparto de sesiones entre varios workers (services/shard_lease.py).
+--
+-- 1) Columna generada shard en sessions y sessions_pool: hash estable del id,
+--    el mismo que calcula shard_lease.shard_of en Python:
+--        int(md5(id)[:8], 16) % 64
+--    El worker filtra por shard=in.(...) con sus shards arrendados.
+-- 2) Arrendamientos renovables por shard (worker_shard_leases) y latido de
+--    cada worker (worker_heartbeats), gestionados por claim_shard_leases /
+--    release_shard_leases.
+-- 3) Una sesión por plantilla (unique sessions.pool_id): si dos workers
+--    activan o encadenan la misma plantilla a la vez, el segundo INSERT
+--    falla con 23505 y se ignora.
+
+alter table sessions add column if not exists shard smallint
+    generated always as (
+        ((('x' || lpad(substr(md5(id::text), 1, 8), 16, '0'))::bit(64)::bigint) % 64)::smallint
+    ) stored;
+
+alter table sessions_pool add column if not exists shard smallint
+    generated always as (
+        ((('x' || lpad(substr(md5(id::text), 1, 8), 16, '0'))::bit(64)::bigint) % 64)::smallint
+    ) stored;
+
+create index if not exists sessions_shard_status_idx on sessions (shard, status);
+create index if not exists sessions_pool_shard_idx on sessions_pool (shard) where type = 'scheduled';
+
+do $$
+begin
+    if not exists (
+        select 1 from pg_constraint where conname = 'sessions_pool_id_key'
+    ) then
+        alter table sessions add constraint sessions_pool_id_key unique (pool_id);
+    end if;
+end;
+$$;
+
+create table if not exists worker_shard_leases (
+    shard smallint primary key,
+    owner text,
+    expires_at timestamptz not null default '-infinity'
+);
+
+insert into worker_shard_leases (shard)
+select generate_series(0, 63)
+on conflict do nothing;
+
+create table if not exists worker_heartbeats (
+    owner text primary key,
+    expires_at timestamptz not null
+);
+
+-- Renueva los shards de p_owner y reparte a partes iguales entre los workers
+-- vivos (latido no caducado): cede los que le sobran y coge libres o
+-- caducados hasta su parte. Devuelve los shards de p_owner.
+create or replace function claim_shard_leases(p_owner text, p_ttl_seconds integer)
+returns smallint[]
+language plpgsql
+as $$
+declare
+    v_expires timestamptz := now() + make_interval(secs => p_ttl_seconds);
+    v_workers integer;
+    v_fair integer;
+    v_held integer;
+begin
+    insert into worker_heartbeats (owner, expires_at)
+    values (p_owner, v_expires)
+    on conflict (owner) do update set expires_at = excluded.expires_at;
+
+    delete from worker_heartbeats where expires_at < now();
+
+    select count(*) into v_workers from worker_heartbeats;
+    select ceil(count(*)::numeric / v_workers) into v_fair from worker_shard_leases;
+
+    update worker_shard_leases set expires_at = v_expires where owner = p_owner;
+    select count(*) into v_held from worker_shard_leases where owner = p_owner;
+
+    if v_held > v_fair then
+        update worker_shard_leases
+           set owner = null, expires_at = '-infinity'
+         where shard in (
+            select l.shard from worker_shard_leases l
+             where l.owner = p_owner
+             order by l.shard desc
+             limit v_held - v_fair
+         );
+    elsif v_held < v_fair then
+        update worker_shard_leases
+           set owner = p_owner, expires_at = v_expires
+         where shard in (
+            select l.shard from worker_shard_leases l
+             where l.owner is null or l.expires_at < now()
+             order by l.shard
+             limit v_fair - v_held
+             for update skip locked
+         );
+    end if;
+
+    return array(
+        select l.shard from worker_shard_leases l where l.owner = p_owner order by l.shard
+    );
+end;
+$$;
+
+create or replace function release_shard_leases(p_owner text)
+returns void
+language sql
+as $$
+    update worker_shard_leases set owner = null, expires_at = '-infinity' where owner = p_owner;
+    delete from worker_heartbeats where owner = p_owner;
+$$;
@@ -0,0 +1,36 @@
+-- Consultas del dashboard (dashboard/views/active_sessions.py y park_sessions_.py).
+--
+-- Las vistas piden a PostgREST solo la página visible, con los filtros del
+-- operador en la URL:
+--   sessions?select=id,...&operator_code=eq.ES&status=eq.open&order=created_at.desc&limit=50&offset=0
+--   sessions_pool?select=id,...&product_id=ilike.%25cafe%25&order=created_at.desc&limit=50
+-- con Prefer: count=exact para el total de resultados.
+
+-- Número de valores distintos de una columna (DatabaseService.count_distinct),
+-- p. ej. cadenas configuradas en sessions_pool.
+create or replace function count_distinct_values(p_table text, p_field text)
+returns bigint
+language plpgsql
+stable
+as $$
+declare
+    v_count bigint;
+begin
+    execute format('select count(distinct %I) from %I', p_field, p_table) into v_count;
+    return v_count;
+end;
+$$;
+
+-- Página más reciente por filtro: cada índice sirve el filtro y el ORDER BY.
+create index if not exists sessions_created_at_idx on sessions (created_at desc);
+create index if not exists sessions_status_created_at_idx on sessions (status, created_at desc);
+create index if not exists sessions_operator_created_at_idx on sessions (operator_code, created_at desc);
+create index if not exists sessions_chain_group_idx on sessions (chain_group_id);
+
+-- sessions_pool ya tiene (created_at) y (chain_group_id, ...) de 003_chain_advancement.sql.
+create index if not exists sessions_pool_operator_created_at_idx on sessions_pool (operator_code, created_at desc);
+
+-- Búsqueda por subcadena de producto (product_id ilike '%...%').
+create extension if not exists pg_trgm;
+create index if not exists sessions_pool_product_trgm_idx
+    on sessions_pool using gin (product_id gin_trgm_ops);
@@ -0,0 +1,19 @@
+-- Clave natural de las plantillas de sessions_pool para la carga masiva
+-- idempotente de seed_sessions_pool.py (upsert con on_conflict=template_key).
+--
+--   cadena:  <chain_group_id>:<operator_code>:<chain_index>   p. ej. XIPH15:ES:2
+--   standby: <product_id>:<operator_code>:standby:<n>          p. ej. ps5:PT:standby:1
+--
+-- Las plantillas anteriores quedan con template_key NULL (no chocan entre sí).
+
+alter table sessions_pool add column if not exists template_key text;
+
+do $$
+begin
+    if not exists (
+        select 1 from pg_constraint where conname = 'sessions_pool_template_key_key'
+    ) then
+        alter table sessions_pool add constraint sessions_pool_template_key_key unique (template_key);
+    end if;
+end;
+$$;
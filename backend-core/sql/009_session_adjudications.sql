@@ -0,0 +1,37 @@
+-- Resultado de la adjudicación de cada sesión (AdjudicationService.adjudicate).
+--
+-- Una fila por sesión, escrita por el worker al adjudicar una sesión
+-- 'complete' (que pasa a 'adjudicated'); un reintento sobrescribe la fila.
+--
+-- - input: el AdjudicationInput exacto que se adjudicó (modelo del worker,
+--   models/adjudication.py), ya canonicalizado. Es lo que se hashea: no hay
+--   que reconstruirlo a partir de sessions y participants.
+-- - result: el AdjudicationResult completo (con la traza y numeric_seed, que
+--   no cabe en un bigint).
+--
+-- {"input": input, "result": result} es una línea de verify_adjudications.py
+-- (registros del worker: "1.0" = 1.0-closing-seed).
+--
+-- Cómo se construye input (services/adjudication_service.py,
+-- session_adjudication_input):
+-- - session_id, product_id: los de la sesión.
+-- - group_id: chain_group_id de la sesión; fuera de una cadena, session_id.
+-- - closing_timestamp: el de la sesión, en ISO 8601 UTC con +00:00.
+-- - participantes, en el orden de lectura (por id):
+--   - participant_id: participants.id como texto;
+--   - ticket_number: participants.ticket_number; si es NULL, la posición
+--     (desde 1) en ese orden;
+--   - join_timestamp: participants.created_at, en ISO 8601 UTC con +00:00.
+
+create table if not exists session_adjudications (
+    session_id uuid primary key references sessions (id),
+    winner_participant_id text not null,
+    winner_ticket_number integer not null,
+    result_hash text not null,
+    input jsonb not null,
+    result jsonb not null,
+    created_at timestamptz not null default now()
+);
+
+-- Tablas creadas antes de guardar la entrada.
+alter table session_adjudications add column if not exists input jsonb;
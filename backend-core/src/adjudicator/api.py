@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from .models import AdjudicationResult
+from .offload import AdjudicationOffloader, OverloadedError
+
+
+def create_router(offloader: AdjudicationOffloader) -> APIRouter:
+    router = APIRouter()
+
+    @router.post("/adjudicate", response_model=AdjudicationResult)
+    async def adjudicate(request: Request):
+        """
+        Adjudica una sesión (cuerpo: AdjudicationInput en JSON).
+
+        El cuerpo se pasa sin validar al offloader: las sesiones grandes se
+        validan y adjudican en el pool de procesos, sin bloquear el bucle de
+        eventos. 422 si la entrada no es válida, 400 si falla la
+        adjudicación y 429 (con Retry-After) si el pool está saturado.
+        """
+        return await _adjudicate(request, columnar=False)
+
+    @router.post("/adjudicate/columnar", response_model=AdjudicationResult)
+    async def adjudicate_columnar(request: Request):
+        """
+        Igual que /adjudicate, con los participantes en columnas
+        (ColumnarAdjudicationInput: participant_ids, ticket_numbers y
+        join_timestamps opcional). Para sesiones grandes es bastante más
+        barato de parsear.
+        """
+        return await _adjudicate(request, columnar=True)
+
+    async def _adjudicate(request: Request, columnar: bool) -> Response:
+        try:
+            status, body = await offloader.adjudicate(await request.body(), columnar)
+        except OverloadedError as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+        # Los bytes ya son el JSON final (serializado por pydantic-core).
+        return Response(content=body, status_code=status, media_type="application/json")
+
+    return router
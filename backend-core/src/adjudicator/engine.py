@@ -1,5 +1,4 @@
-from typing import Tuple
-import hashlib
+from typing import List
 
 from .models import (
     AdjudicationInput,
@@ -7,119 +6,84 @@ from .models import (
     Participant,
     TraceStep,
 )
-from .utils import (
-    normalize_seed_to_int,
-    build_base_seed,
-    sort_participants_deterministically,
-    create_trace_step,
+from .registry import (
+    API_ALIASES,
+    TRACE_FULL,
+    get_algorithm,
+    validate_trace_level,
+    verify_result,
 )
+from .utils import create_trace_step
 
 
-def _compute_winner_index(numeric_seed: int, total_participants: int) -> int:
+def adjudicate_session(
+    input_data: AdjudicationInput,
+    trace_level: str = TRACE_FULL,
+    presorted: bool = False,
+) -> AdjudicationResult:
     """
-    Dado un entero grande (numeric_seed) y el número total de participantes N,
-    el índice ganador es: numeric_seed mod N.
-    """
-    if total_participants <= 0:
-        raise ValueError("No hay participantes en la sesión de adjudicación.")
-    return numeric_seed % total_participants
-
-
-def _hash_result(session_id: str, winner_participant_id: str, numeric_seed: int) -> str:
-    """
-    Genera un hash del resultado para facilitar verificaciones y sellado.
-    """
-    base = f"{session_id}|{winner_participant_id}|{numeric_seed}"
-    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+    Ejecuta el proceso de adjudicación determinista para una sesión cerrada.
 
+    El cálculo lo hace la versión indicada en input_data.algorithm_version,
+    a través del mismo registro que usa el worker (registry.py).
 
-def adjudicate_session(input_data: AdjudicationInput) -> AdjudicationResult:
-    """
-    Ejecuta el proceso de adjudicación determinista para una sesión cerrada.
+    "1.0" (el valor por defecto) es la 1.0-public-seed, como antes de
+    unificar los motores (ver API_ALIASES).
 
-    Pasos:
+    Pasos (versión 1.0-public-seed):
     1) Ordenar participantes de forma determinista.
     2) Construir una semilla base combinando session_id + public_seed.
     3) Normalizar esa semilla base a un entero mediante SHA-256.
     4) Calcular winner_index = numeric_seed % N.
     5) Seleccionar el participante ganador.
-    6) Generar una traza explicativa.
+    6) Generar una traza explicativa (según trace_level).
     7) Devolver AdjudicationResult.
-    """
 
-    trace = []
+    trace_level:
+    - "full": todos los pasos de la traza.
+    - "summary": omite los pasos de tamaño O(N) (lista ordenada, semilla base).
+    - "none": sin traza; se puede regenerar después con build_trace(input_data).
 
-    # Paso 1: ordenar participantes
-    trace.append(create_trace_step(
-        step=1,
-        description="Número de participantes en la sesión",
-        value=str(len(input_data.participants))
-    ))
+    presorted=True indica que los participantes ya llegan en el orden canónico
+    de la versión: solo se verifica en O(N) en lugar de reordenar.
+    """
+    validate_trace_level(trace_level)
 
-    ordered_participants = sort_participants_deterministically(input_data.participants)
-    if not ordered_participants:
-        raise ValueError("La lista de participantes está vacía.")
+    outcome = get_algorithm(input_data.algorithm_version, API_ALIASES).adjudicate(input_data, presorted=presorted)
+    winner: Participant = outcome.winner
 
-    # Paso 2: construir semilla base
-    base_seed = build_base_seed(
-        session_id=input_data.session_id,
-        public_seed=input_data.public_seed
-    )
-    trace.append(create_trace_step(
-        step=2,
-        description="Semilla base (session_id | public_seed)",
-        value=base_seed
-    ))
-
-    # Paso 3: normalizar semilla a entero
-    numeric_seed = normalize_seed_to_int(base_seed)
-    trace.append(create_trace_step(
-        step=3,
-        description="Semilla numérica (SHA-256 → entero)",
-        value=str(numeric_seed)
-    ))
-
-    # Paso 4: calcular índice ganador
-    winner_index = _compute_winner_index(numeric_seed, len(ordered_participants))
-    trace.append(create_trace_step(
-        step=4,
-        description="Índice ganador (numeric_seed mod N)",
-        value=f"{winner_index} (N={len(ordered_participants)})"
-    ))
-
-    # Paso 5: seleccionar participante ganador
-    winner: Participant = ordered_participants[winner_index]
-    trace.append(create_trace_step(
-        step=5,
-        description="Participante ganador (según índice ganador en lista ordenada)",
-        value=f"participant_id={winner.participant_id}, ticket_number={winner.ticket_number}"
-    ))
-
-    # Paso 6: generar hash del resultado
-    result_hash = _hash_result(
-        session_id=input_data.session_id,
-        winner_participant_id=winner.participant_id,
-        numeric_seed=numeric_seed
-    )
-    trace.append(create_trace_step(
-        step=6,
-        description="Hash del resultado (session_id | winner_id | numeric_seed)",
-        value=result_hash
-    ))
+    trace = [
+        create_trace_step(step=step, description=description, value=value)
+        for step, description, value in outcome.trace_steps(trace_level)
+    ]
 
-    # Paso 7: construir objeto resultado
     result = AdjudicationResult(
         session_id=input_data.session_id,
         product_id=input_data.product_id,
         group_id=input_data.group_id,
         algorithm_version=input_data.algorithm_version,
         public_seed=input_data.public_seed,
-        numeric_seed=numeric_seed,
+        numeric_seed=outcome.numeric_seed,
         winner_participant_id=winner.participant_id,
         winner_ticket_number=winner.ticket_number,
-        winner_index=winner_index,
+        winner_index=outcome.winner_index,
         trace=trace,
-        result_hash=result_hash,
+        result_hash=outcome.result_hash,
     )
 
     return result
+
+
+def build_trace(input_data: AdjudicationInput) -> List[TraceStep]:
+    """
+    Regenera bajo demanda la traza completa a partir de los datos de entrada.
+    """
+    return adjudicate_session(input_data, trace_level=TRACE_FULL).trace
+
+
+def verify(input_data: AdjudicationInput, result: AdjudicationResult) -> bool:
+    """
+    Verifica un AdjudicationResult almacenado sin reconstruir la traza
+    (recalcula numeric_seed, winner_index y result_hash y los compara).
+    """
+    return verify_result(input_data, result, aliases=API_ALIASES)
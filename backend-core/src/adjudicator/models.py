@@ -1,5 +1,5 @@
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import List, NamedTuple, Optional, Sequence
+from pydantic import BaseModel, Field, model_validator
 
 
 class Participant(BaseModel):
@@ -9,6 +9,23 @@ class Participant(BaseModel):
     participant_id: str = Field(..., description="Identificador interno del participante")
     ticket_number: int = Field(..., description="Número de participación dentro del grupo (1..N)")
     weight: float = Field(1.0, description="Peso opcional (por defecto 1.0; normalmente no se usa)")
+    join_timestamp: Optional[str] = Field(
+        None,
+        description="Timestamp ISO de alta (lo usa el orden de la versión 1.0-closing-seed del algoritmo)"
+    )
+
+
+class ParticipantRow(NamedTuple):
+    """
+    Participante ligero, sin validación, con los mismos atributos que
+    Participant (es lo único que leen los algoritmos de registry.py).
+    Crear 100.000 de estos cuesta una fracción de lo que cuestan 100.000
+    modelos Pydantic, validados o no (model_construct).
+    """
+    participant_id: str
+    ticket_number: int
+    join_timestamp: Optional[str] = None
+    weight: float = 1.0
 
 
 class AdjudicationInput(BaseModel):
@@ -20,13 +37,20 @@ class AdjudicationInput(BaseModel):
     group_id: str = Field(..., description="Identificador lógico del grupo (por país / operador, etc.)")
 
     # Semilla de aleatoriedad pública/verificable (ej. hash de beacon, drand, fintech, etc.)
-    public_seed: str = Field(..., description="Semilla pública de aleatoriedad (en formato texto)")
+    # Obligatoria en la versión 1.0-public-seed (la "1.0" de la API); opcional en la 1.0-closing-seed.
+    public_seed: Optional[str] = Field(None, description="Semilla pública de aleatoriedad (en formato texto)")
+
+    # Momento de cierre de la sesión (obligatorio en la versión 1.0-closing-seed del algoritmo)
+    closing_timestamp: Optional[str] = Field(None, description="Timestamp ISO de cierre de la sesión")
 
     # Lista de participantes (ya cerrada, no modificable)
     participants: List[Participant] = Field(..., description="Lista de participantes admitidos en la sesión")
 
-    # Versión del algoritmo (para trazabilidad futura)
-    algorithm_version: str = Field("1.0", description="Versión del algoritmo determinista de adjudicación")
+    # Versión del algoritmo: se despacha por ella en registry.py ("1.0" = 1.0-public-seed, ver API_ALIASES)
+    algorithm_version: str = Field(
+        "1.0",
+        description="Versión del algoritmo determinista de adjudicación (ver registry.ALGORITHMS)"
+    )
 
 
 class TraceStep(BaseModel):
@@ -47,7 +71,7 @@ class AdjudicationResult(BaseModel):
     group_id: str
 
     algorithm_version: str
-    public_seed: str
+    public_seed: Optional[str]
     numeric_seed: int
 
     winner_participant_id: str
@@ -61,3 +85,59 @@ class AdjudicationResult(BaseModel):
 
     # Campo opcional para anexar firma digital o hash del resultado
     result_hash: Optional[str] = None
+
+
+class ColumnarAdjudicationInput(BaseModel):
+    """
+    AdjudicationInput con los participantes en columnas paralelas (ids,
+    tickets y, opcionalmente, timestamps de alta): se valida como tres
+    listas de escalares en lugar de un objeto por participante, y el JSON
+    ocupa menos de la mitad.
+    """
+    session_id: str
+    product_id: str
+    group_id: str
+    public_seed: Optional[str] = None
+    closing_timestamp: Optional[str] = None
+    algorithm_version: str = "1.0"
+
+    participant_ids: List[str]
+    ticket_numbers: List[int]
+    join_timestamps: Optional[List[Optional[str]]] = None
+
+    @model_validator(mode="after")
+    def _same_length(self):
+        lengths = {len(self.participant_ids), len(self.ticket_numbers)}
+        if self.join_timestamps is not None:
+            lengths.add(len(self.join_timestamps))
+        if len(lengths) > 1:
+            raise ValueError("participant_ids, ticket_numbers y join_timestamps deben tener la misma longitud.")
+        return self
+
+    def to_input(self) -> AdjudicationInput:
+        fields = self.model_dump(exclude={"participant_ids", "ticket_numbers", "join_timestamps"})
+        return trusted_input(
+            participant_ids=self.participant_ids,
+            ticket_numbers=self.ticket_numbers,
+            join_timestamps=self.join_timestamps,
+            **fields,
+        )
+
+
+def trusted_input(
+    participant_ids: Sequence[str],
+    ticket_numbers: Sequence[int],
+    join_timestamps: Optional[Sequence[Optional[str]]] = None,
+    **fields,
+) -> AdjudicationInput:
+    """
+    AdjudicationInput sin validar, con ParticipantRow como participantes.
+    Solo para llamantes internos cuyos datos ya son del tipo correcto (filas
+    de la base de datos, una entrada columnar ya validada): sirve para
+    adjudicar, no para volver a serializar la entrada.
+    """
+    if join_timestamps is None:
+        participants = list(map(ParticipantRow, participant_ids, ticket_numbers))
+    else:
+        participants = list(map(ParticipantRow, participant_ids, ticket_numbers, join_timestamps))
+    return AdjudicationInput.model_construct(participants=participants, **fields)
@@ -0,0 +1,181 @@
+"""
+Adjudicación fuera del bucle de eventos para el endpoint /adjudicate.
+
+Una sesión con cientos de miles de participantes tarda segundos en validarse,
+ordenarse, hashearse y trazarse; hecho en el proceso del servidor, bloquea
+todas las demás peticiones mientras tanto.
+
+- Los cuerpos pequeños (hasta inline_max_bytes) se adjudican en el propio
+  proceso: ahí el coste de pasar el trabajo a otro proceso supera al cálculo.
+- Los grandes van a un pool de procesos propio, como bytes JSON (se validan
+  allí, no aquí), con como mucho max_in_flight en ejecución y max_queue
+  esperando turno. Por encima, OverloadedError (el endpoint responde 429)
+  en lugar de acumular peticiones y memoria sin límite.
+"""
+
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Optional, Tuple
+
+from pydantic import ValidationError
+
+from utils.logger import log
+
+from .engine import adjudicate_session
+from .models import AdjudicationInput, ColumnarAdjudicationInput
+
+
+# ~4.000 participantes: por debajo, adjudicar tarda unos pocos milisegundos.
+INLINE_MAX_BYTES = 256 * 1024
+
+# Segundos que se sugieren al cliente (Retry-After) cuando no hay hueco.
+RETRY_AFTER_SECONDS = 1
+
+
+class OverloadedError(Exception):
+    def __init__(self, retry_after: int = RETRY_AFTER_SECONDS):
+        super().__init__("Demasiadas adjudicaciones en curso; reintentar más tarde.")
+        self.retry_after = retry_after
+
+
+def adjudicate_json(body: bytes, columnar: bool = False) -> Tuple[int, bytes]:
+    """
+    Cuerpo JSON de un AdjudicationInput (o, con columnar=True, de un
+    ColumnarAdjudicationInput) → (código HTTP, cuerpo JSON de la respuesta).
+    Es lo que se ejecuta en el pool: los errores vuelven como respuesta y no
+    como excepción, que tendría que cruzar procesos con pickle.
+
+    Tanto el parseo como la serialización los hace pydantic-core (Rust),
+    directamente entre bytes y modelos, sin pasar por dicts intermedios.
+    """
+    try:
+        if columnar:
+            input_data = ColumnarAdjudicationInput.model_validate_json(body).to_input()
+        else:
+            input_data = AdjudicationInput.model_validate_json(body)
+    except ValidationError as e:
+        return 422, json.dumps({"detail": json.loads(e.json(include_url=False))}).encode()
+    try:
+        result = adjudicate_session(input_data)
+    except Exception as e:
+        return 400, json.dumps({"detail": str(e)}).encode()
+    return 200, result.model_dump_json().encode()
+
+
+def _ping(_) -> None:
+    return None
+
+
+class AdjudicationOffloader:
+    """
+    Reparte las adjudicaciones entre el bucle de eventos y el pool de
+    procesos, con control de admisión. Se usa desde un único bucle de
+    eventos (los contadores no llevan cerrojo).
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        inline_max_bytes: int = INLINE_MAX_BYTES,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight = max_in_flight or self.max_workers
+        self.max_queue = 2 * self.max_in_flight if max_queue is None else max_queue
+        self.inline_max_bytes = inline_max_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        # Peticiones admitidas en el pool (en ejecución + esperando turno).
+        self._admitted = 0
+        self.inline = 0
+        self.offloaded = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "AdjudicationOffloader":
+        def env_int(name: str) -> Optional[int]:
+            value = os.getenv(name)
+            return int(value) if value else None
+
+        return cls(
+            max_workers=env_int("ADJUDICATE_WORKERS"),
+            max_in_flight=env_int("ADJUDICATE_MAX_IN_FLIGHT"),
+            max_queue=env_int("ADJUDICATE_MAX_QUEUE"),
+            inline_max_bytes=env_int("ADJUDICATE_INLINE_MAX_BYTES") or INLINE_MAX_BYTES,
+        )
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # spawn: hacer fork de un servidor con hilos y un bucle de eventos
+        # en marcha puede dejar cerrojos tomados en el hijo.
+        return ProcessPoolExecutor(self.max_workers, mp_context=get_context("spawn"))
+
+    def start(self):
+        """
+        Crea el pool y arranca ya sus procesos, para que la primera petición
+        grande no pague el arranque (se llama al iniciar la aplicación).
+        """
+        if self._executor is None:
+            self._executor = self._new_executor()
+            list(self._executor.map(_ping, range(self.max_workers)))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def adjudicate(self, body: bytes, columnar: bool = False) -> Tuple[int, bytes]:
+        if len(body) <= self.inline_max_bytes:
+            self.inline += 1
+            return adjudicate_json(body, columnar)
+
+        if self._admitted >= self.max_in_flight + self.max_queue:
+            self.rejected += 1
+            raise OverloadedError()
+        self._admitted += 1
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            self._admitted -= 1
+            raise
+
+        if self._executor is None:
+            self._executor = self._new_executor()
+        executor = self._executor
+        try:
+            future = asyncio.get_running_loop().run_in_executor(executor, adjudicate_json, body, columnar)
+        except BaseException as e:
+            self._release()
+            if isinstance(e, BrokenProcessPool):
+                self._discard(executor)
+            raise
+        # El hueco se libera cuando el proceso termina, aunque el cliente
+        # se haya desconectado antes (el cálculo sigue ocupando un proceso).
+        future.add_done_callback(lambda _: self._release())
+        self.offloaded += 1
+        try:
+            return await asyncio.shield(future)
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+
+    def _discard(self, executor: ProcessPoolExecutor):
+        """
+        Un proceso murió (p. ej. sin memoria) y el pool ya no sirve: se
+        cierra sin esperar, cancelando lo que tuviera en cola, y la siguiente
+        petición crea otro. Si otra petición ya lo ha sustituido, no se toca
+        el nuevo.
+        """
+        if self._executor is not executor:
+            return
+        log("[ADJUDICATE] pool de procesos roto; se crea uno nuevo.")
+        executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    def _release(self):
+        self._slots.release()
+        self._admitted -= 1
@@ -0,0 +1,135 @@
+"""
+Primitivas compartidas por todas las versiones del algoritmo de adjudicación.
+
+No dependen de ningún modelo Pydantic concreto: trabajan con cualquier objeto
+que exponga participant_id, ticket_number y (opcionalmente) join_timestamp,
+de modo que las usan igual el motor del worker (engine.py) y el de la API
+(src/adjudicator/engine.py).
+"""
+
+import hashlib
+from itertools import chain, islice
+from operator import attrgetter, le
+from typing import Any, Iterable, List, Optional, Sequence
+
+
+# Fragmentos que se concatenan de una vez antes de pasarlos al hash incremental:
+# acota la memoria sin pagar una llamada a update() por participante.
+SEED_HASH_BATCH_SIZE = 4096
+
+# Para 0 <= ticket_number < 10**10, str(t).zfill(10) tiene siempre 10 dígitos,
+# así que comparar los enteros da exactamente el mismo orden que comparar
+# las cadenas rellenadas con ceros.
+_ZFILL_SAFE_TICKET_LIMIT = 10 ** 10
+
+_join_order_attr_key = attrgetter("join_timestamp", "ticket_number", "participant_id")
+_ticket_order_attr_key = attrgetter("ticket_number", "participant_id")
+_participant_id = attrgetter("participant_id")
+
+
+def normalize_seed_to_int(seed_text: str) -> int:
+    """
+    SHA-256 de una semilla textual → entero (big-endian).
+    """
+    digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+    return int.from_bytes(digest, byteorder="big")
+
+
+def hash_fragments_to_int(fragments: Iterable[str]) -> int:
+    """
+    Equivalente a normalize_seed_to_int("".join(fragments)), pero sin construir
+    nunca la cadena completa: alimenta un hashlib.sha256 incremental por bloques.
+    """
+    hasher = hashlib.sha256()
+    fragments = iter(fragments)
+    while True:
+        batch = list(islice(fragments, SEED_HASH_BATCH_SIZE))
+        if not batch:
+            break
+        hasher.update("".join(batch).encode("utf-8"))
+    return int.from_bytes(hasher.digest(), byteorder="big")
+
+
+def closing_seed_fragments(
+    session_id: str,
+    closing_timestamp: str,
+    participant_ids: Iterable[str],
+    public_seed: Optional[str] = None,
+) -> Iterable[str]:
+    """
+    Fragmentos de session_id | closing_timestamp | ids_concatenados [| public_seed],
+    en el mismo orden y con los mismos separadores que la semilla base en texto.
+    """
+    head = [f"{session_id}|{closing_timestamp}|"]
+    tail = [f"|{public_seed}"] if public_seed else []
+    return chain(head, participant_ids, tail)
+
+
+def participant_ids(participants: Iterable[Any]) -> Iterable[str]:
+    return map(_participant_id, participants)
+
+
+def compute_winner_index(numeric_seed: int, total_participants: int) -> int:
+    """
+    Dado un entero grande (numeric_seed) y el número total de participantes N,
+    el índice ganador es: numeric_seed mod N.
+    """
+    if total_participants <= 0:
+        raise ValueError("No hay participantes en la sesión de adjudicación.")
+    return numeric_seed % total_participants
+
+
+def hash_result(session_id: str, winner_participant_id: str, numeric_seed: int) -> str:
+    """
+    Genera un hash del resultado para facilitar verificaciones y sellado.
+    """
+    base = f"{session_id}|{winner_participant_id}|{numeric_seed}"
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+def _zfill_key(p: Any):
+    return (p.join_timestamp or "", str(p.ticket_number).zfill(10), p.participant_id)
+
+
+def join_order_keys(participants: Sequence[Any]) -> List[tuple]:
+    """
+    Precalcula, en una sola pasada, las claves del orden
+    (join_timestamp, ticket zfill(10), participant_id):
+
+    - Todos los tickets en [0, 10**10): (join_timestamp, ticket_number, participant_id)
+      con el ticket como entero, sin formatear ninguna cadena.
+    - Algún ticket negativo o de más de 10 dígitos: la clave zfill original,
+      porque ahí el orden textual y el numérico difieren.
+    """
+    keys = list(map(_join_order_attr_key, participants))
+    if not keys:
+        return keys
+
+    timestamps, tickets, _ = zip(*keys)
+    if min(tickets) < 0 or max(tickets) >= _ZFILL_SAFE_TICKET_LIMIT:
+        return list(map(_zfill_key, participants))
+    if None in timestamps:
+        return [(ts or "", ticket, pid) for ts, ticket, pid in keys]
+    return keys
+
+
+def ticket_order_keys(participants: Sequence[Any]) -> List[tuple]:
+    """
+    Claves del orden (ticket_number, participant_id).
+    """
+    return list(map(_ticket_order_attr_key, participants))
+
+
+def sort_by_keys(items: Sequence[Any], keys: List[tuple]) -> List[Any]:
+    """
+    Ordena items según sus claves precalculadas (orden estable).
+    """
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    return list(map(items.__getitem__, order))
+
+
+def keys_in_order(keys: List[tuple]) -> bool:
+    """
+    Comprueba en O(N), sin reordenar, que las claves ya están en orden ascendente.
+    """
+    return all(map(le, keys, islice(keys, 1, None)))
@@ -0,0 +1,320 @@
+"""
+Registro de versiones del algoritmo de adjudicación.
+
+Cada AdjudicationResult lleva un algorithm_version. Este módulo es la única
+fuente de verdad sobre qué significa cada versión: el motor del worker
+(engine.AdjudicationEngine) y el de la API (src/adjudicator/engine.py)
+despachan aquí por algorithm_version, así que la misma entrada produce el
+mismo resultado venga de donde venga.
+
+Versiones registradas:
+- "1.0-closing-seed": semilla SHA256(session_id | closing_timestamp | ids_concatenados [| public_seed]),
+  orden (join_timestamp, ticket_number, participant_id). Es la de la memoria técnica
+  y la que usa el worker.
+- "1.0-public-seed": semilla SHA256(session_id | public_seed),
+  orden (ticket_number, participant_id). Es la que usaba la API antes de unificar.
+
+"1.0" es el identificador que usaban los dos motores antes de unificarlos,
+cada uno para su algoritmo, y con él hay peticiones y resultados guardados.
+Se mantiene como alias por motor: WORKER_ALIASES lo lleva a
+"1.0-closing-seed" y API_ALIASES a "1.0-public-seed". El resultado conserva
+la versión pedida ("1.0"), así que lo guardado antes sigue verificando igual.
+
+Una versión publicada no se modifica nunca: un cambio de algoritmo es una
+versión nueva registrada con register_algorithm.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from utils.logger import log
+
+from .primitives import (
+    closing_seed_fragments,
+    compute_winner_index,
+    hash_fragments_to_int,
+    hash_result,
+    join_order_keys,
+    keys_in_order,
+    participant_ids,
+    sort_by_keys,
+    ticket_order_keys,
+)
+
+
+# Niveles de traza: "full" incluye los pasos de tamaño O(N) (lista ordenada,
+# semilla base), "summary" solo los pasos de tamaño constante y "none" ninguno.
+TRACE_NONE = "none"
+TRACE_SUMMARY = "summary"
+TRACE_FULL = "full"
+TRACE_LEVELS = (TRACE_NONE, TRACE_SUMMARY, TRACE_FULL)
+
+ALGORITHM_V1 = "1.0"
+ALGORITHM_V1_CLOSING_SEED = "1.0-closing-seed"
+ALGORITHM_V1_PUBLIC_SEED = "1.0-public-seed"
+
+# Qué significaba "1.0" en cada motor (ver el docstring del módulo).
+WORKER_ALIASES: Mapping[str, str] = {ALGORITHM_V1: ALGORITHM_V1_CLOSING_SEED}
+API_ALIASES: Mapping[str, str] = {ALGORITHM_V1: ALGORITHM_V1_PUBLIC_SEED}
+
+
+def validate_trace_level(trace_level: str) -> str:
+    if trace_level not in TRACE_LEVELS:
+        raise ValueError(f"trace_level no válido: {trace_level!r} (usa uno de {TRACE_LEVELS}).")
+    return trace_level
+
+
+class AdjudicationOutcome:
+    """
+    Resultado del cálculo de adjudicación, independiente de los modelos
+    Pydantic de cada motor (cada motor construye su AdjudicationResult).
+    """
+
+    __slots__ = (
+        "algorithm",
+        "input_data",
+        "ordered_participants",
+        "numeric_seed",
+        "winner_index",
+        "winner",
+        "result_hash",
+    )
+
+    def __init__(self, algorithm, input_data, ordered_participants, numeric_seed, winner_index, winner, result_hash):
+        self.algorithm = algorithm
+        self.input_data = input_data
+        self.ordered_participants = ordered_participants
+        self.numeric_seed = numeric_seed
+        self.winner_index = winner_index
+        self.winner = winner
+        self.result_hash = result_hash
+
+    def trace_steps(self, trace_level: str = TRACE_FULL) -> List[Tuple[int, str, str]]:
+        """
+        Pasos de la traza como tuplas (step, description, value).
+        """
+        return self.algorithm.trace_steps(self, validate_trace_level(trace_level))
+
+
+class AdjudicationAlgorithm(ABC):
+    """
+    Una versión concreta del algoritmo. Las subclases definen el orden
+    canónico (order_keys), los fragmentos de la semilla base (seed_fragments)
+    y la traza; el resto del proceso es común a todas las versiones.
+    """
+
+    version: str = ""
+
+    @abstractmethod
+    def order_keys(self, participants: Sequence[Any]) -> List[tuple]:
+        ...
+
+    @abstractmethod
+    def seed_fragments(self, input_data: Any, ordered: Sequence[Any]) -> Iterable[str]:
+        ...
+
+    @abstractmethod
+    def trace_steps(self, outcome: AdjudicationOutcome, trace_level: str) -> List[Tuple[int, str, str]]:
+        ...
+
+    def order(self, participants: Sequence[Any], presorted: bool = False) -> List[Any]:
+        """
+        Participantes en el orden canónico de esta versión.
+
+        Con presorted=True el llamante garantiza que ya vienen ordenados y solo
+        se verifica en O(N); si no lo están, se avisa y se ordenan igualmente.
+        """
+        keys = self.order_keys(participants)
+        if presorted:
+            if keys_in_order(keys):
+                return list(participants)
+            log("[ADJUDICATION] participantes marcados como ordenados pero no lo están; se reordenan.")
+        return sort_by_keys(participants, keys)
+
+    def base_seed(self, input_data: Any, ordered: Sequence[Any]) -> str:
+        """
+        Semilla base en texto (solo para traza y auditoría).
+        """
+        return "".join(self.seed_fragments(input_data, ordered))
+
+    def numeric_seed(self, input_data: Any, ordered: Sequence[Any]) -> int:
+        return hash_fragments_to_int(self.seed_fragments(input_data, ordered))
+
+    def adjudicate(self, input_data: Any, presorted: bool = False) -> AdjudicationOutcome:
+        ordered = self.order(input_data.participants, presorted=presorted)
+        if not ordered:
+            raise ValueError("La lista de participantes está vacía.")
+
+        numeric_seed = self.numeric_seed(input_data, ordered)
+        winner_index = compute_winner_index(numeric_seed, len(ordered))
+        winner = ordered[winner_index]
+        return AdjudicationOutcome(
+            algorithm=self,
+            input_data=input_data,
+            ordered_participants=ordered,
+            numeric_seed=numeric_seed,
+            winner_index=winner_index,
+            winner=winner,
+            result_hash=hash_result(input_data.session_id, winner.participant_id, numeric_seed),
+        )
+
+
+class ClosingSeedAlgorithm(AdjudicationAlgorithm):
+    """
+    Versión 1.0-closing-seed (worker / memoria técnica; "1.0" en el worker):
+    HASH = SHA256( session_id | closing_timestamp | ids_concatenados [| public_seed] )
+    """
+
+    version = ALGORITHM_V1_CLOSING_SEED
+
+    def order_keys(self, participants):
+        return join_order_keys(participants)
+
+    def seed_fragments(self, input_data, ordered):
+        if not input_data.closing_timestamp:
+            raise ValueError(f"El algoritmo {self.version} requiere closing_timestamp.")
+        return closing_seed_fragments(
+            session_id=input_data.session_id,
+            closing_timestamp=input_data.closing_timestamp,
+            participant_ids=participant_ids(ordered),
+            public_seed=input_data.public_seed,
+        )
+
+    def trace_steps(self, outcome, trace_level):
+        if trace_level == TRACE_NONE:
+            return []
+
+        input_data = outcome.input_data
+        ordered = outcome.ordered_participants
+        winner = outcome.winner
+
+        steps = [(1, "Número de participantes en la sesión", str(len(input_data.participants)))]
+        if trace_level == TRACE_FULL:
+            steps.append((
+                2,
+                "Participantes ordenados de forma determinista",
+                "; ".join(f"{p.participant_id}:{p.ticket_number}" for p in ordered),
+            ))
+            steps.append((
+                3,
+                "Semilla base (session_id | closing_timestamp | ids_concatenados | [public_seed])",
+                self.base_seed(input_data, ordered),
+            ))
+        steps += [
+            (4, "Semilla numérica (SHA-256 → entero)", str(outcome.numeric_seed)),
+            (5, "Índice ganador (numeric_seed mod N)", f"{outcome.winner_index} (N={len(ordered)})"),
+            (
+                6,
+                "Participante ganador (según índice ganador en lista ordenada)",
+                f"participant_id={winner.participant_id}, ticket_number={winner.ticket_number}",
+            ),
+            (7, "Hash del resultado (session_id | winner_id | numeric_seed)", outcome.result_hash),
+        ]
+        return steps
+
+
+class PublicSeedAlgorithm(AdjudicationAlgorithm):
+    """
+    Versión 1.0-public-seed (API original; "1.0" en la API):
+    HASH = SHA256( session_id | public_seed ), orden (ticket_number, participant_id).
+    """
+
+    version = ALGORITHM_V1_PUBLIC_SEED
+
+    def order_keys(self, participants):
+        return ticket_order_keys(participants)
+
+    def seed_fragments(self, input_data, ordered):
+        if not input_data.public_seed:
+            raise ValueError(f"El algoritmo {self.version} requiere public_seed.")
+        return [f"{input_data.session_id}|{input_data.public_seed}"]
+
+    def trace_steps(self, outcome, trace_level):
+        if trace_level == TRACE_NONE:
+            return []
+
+        input_data = outcome.input_data
+        winner = outcome.winner
+
+        steps = [(1, "Número de participantes en la sesión", str(len(input_data.participants)))]
+        if trace_level == TRACE_FULL:
+            steps.append((
+                2,
+                "Semilla base (session_id | public_seed)",
+                self.base_seed(input_data, outcome.ordered_participants),
+            ))
+        steps += [
+            (3, "Semilla numérica (SHA-256 → entero)", str(outcome.numeric_seed)),
+            (4, "Índice ganador (numeric_seed mod N)", f"{outcome.winner_index} (N={len(outcome.ordered_participants)})"),
+            (
+                5,
+                "Participante ganador (según índice ganador en lista ordenada)",
+                f"participant_id={winner.participant_id}, ticket_number={winner.ticket_number}",
+            ),
+            (6, "Hash del resultado (session_id | winner_id | numeric_seed)", outcome.result_hash),
+        ]
+        return steps
+
+
+# Tabla de despacho: algorithm_version → implementación.
+ALGORITHMS: Dict[str, AdjudicationAlgorithm] = {}
+
+
+def register_algorithm(algorithm: AdjudicationAlgorithm) -> AdjudicationAlgorithm:
+    if algorithm.version in ALGORITHMS:
+        raise ValueError(f"La versión de algoritmo {algorithm.version!r} ya está registrada.")
+    ALGORITHMS[algorithm.version] = algorithm
+    return algorithm
+
+
+def get_algorithm(version: str, aliases: Mapping[str, str] = {}) -> AdjudicationAlgorithm:
+    """
+    Implementación de version; aliases traduce antes los identificadores
+    heredados de cada motor (WORKER_ALIASES, API_ALIASES).
+    """
+    try:
+        return ALGORITHMS[aliases.get(version, version)]
+    except KeyError:
+        raise ValueError(
+            f"Versión de algoritmo desconocida: {version!r} (disponibles: {sorted(ALGORITHMS)})."
+        ) from None
+
+
+def adjudicate(
+    input_data: Any,
+    version: Optional[str] = None,
+    presorted: bool = False,
+    aliases: Mapping[str, str] = {},
+) -> AdjudicationOutcome:
+    """
+    Adjudica con la versión indicada (por defecto, input_data.algorithm_version).
+    """
+    algorithm = get_algorithm(version or input_data.algorithm_version, aliases)
+    return algorithm.adjudicate(input_data, presorted=presorted)
+
+
+def verify_result(input_data: Any, result: Any, presorted: bool = False, aliases: Mapping[str, str] = {}) -> bool:
+    """
+    Verifica un resultado almacenado contra sus datos de entrada recalculando
+    solo numeric_seed, winner_index, ganador y result_hash (sin traza ni
+    modelos). Usa la versión del algoritmo declarada en el resultado.
+
+    Una entrada que no se puede adjudicar (versión desconocida, sin
+    participantes, faltan campos...) no verifica ningún resultado.
+    """
+    try:
+        outcome = get_algorithm(result.algorithm_version, aliases).adjudicate(input_data, presorted=presorted)
+    except ValueError:
+        return False
+    return (
+        result.session_id == input_data.session_id
+        and outcome.numeric_seed == result.numeric_seed
+        and outcome.winner_index == result.winner_index
+        and outcome.winner.participant_id == result.winner_participant_id
+        and outcome.winner.ticket_number == result.winner_ticket_number
+        and outcome.result_hash == result.result_hash
+    )
+
+
+register_algorithm(ClosingSeedAlgorithm())
+register_algorithm(PublicSeedAlgorithm())
@@ -1,15 +1,6 @@
-import hashlib
 from typing import List
 from .models import Participant, TraceStep
-
-
-def normalize_seed_to_int(seed_text: str) -> int:
-    """
-    Normaliza una semilla textual arbitraria a un entero grande determinista.
-    Usamos SHA-256 y lo convertimos a entero.
-    """
-    digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
-    return int.from_bytes(digest, byteorder="big")
+from .primitives import normalize_seed_to_int, sort_by_keys, ticket_order_keys
 
 
 def build_base_seed(session_id: str, public_seed: str) -> str:
@@ -25,10 +16,7 @@ def sort_participants_deterministically(participants: List[Participant]) -> List
     Ordena los participantes de forma determinista.
     Aquí elegimos: primero por ticket_number, luego por participant_id.
     """
-    return sorted(
-        participants,
-        key=lambda p: (p.ticket_number, p.participant_id)
-    )
+    return sort_by_keys(participants, ticket_order_keys(participants))
 
 
 def create_trace_step(step: int, description: str, value: str) -> TraceStep:
@@ -1,6 +1,8 @@
 from fastapi import FastAPI
 from core.config import settings
 from core.database import init_supabase
+from adjudicator.api import create_router
+from adjudicator.offload import AdjudicationOffloader
 
 app = FastAPI(
     title="The Platform Core API",
@@ -8,6 +10,12 @@ app = FastAPI(
     description="Núcleo de adjudicación y orquestación de CompraAbierta.com"
 )
 
+# Adjudicaciones grandes en un pool de procesos con control de admisión
+# (ADJUDICATE_WORKERS, ADJUDICATE_MAX_IN_FLIGHT, ADJUDICATE_MAX_QUEUE,
+# ADJUDICATE_INLINE_MAX_BYTES; ver adjudicator/offload.py).
+offloader = AdjudicationOffloader.from_env()
+app.include_router(create_router(offloader))
+
 # Inicializar Supabase al arrancar
 @app.on_event("startup")
 def startup_event():
@@ -16,21 +24,15 @@ def startup_event():
         print("Supabase inicializado correctamente.")
     except Exception as e:
         print(f"Error inicializando Supabase: {e}")
+    offloader.start()
 
 
-@app.get("/health")
-from fastapi import HTTPException
-from adjudicator.models import AdjudicationInput
-from adjudicator.engine import adjudicate_session
+@app.on_event("shutdown")
+def shutdown_event():
+    offloader.shutdown()
 
-@app.post("/adjudicate")
-def adjudicate(input_data: AdjudicationInput):
-    try:
-        result = adjudicate_session(input_data)
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/health")
 def health_check():
     return {
         "status": "ok",
@@ -0,0 +1,100 @@
+import asyncio
+import json
+import os
+import signal
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.adjudicator.api import create_router
+from src.adjudicator.engine import adjudicate_session
+from src.adjudicator.models import AdjudicationInput
+from src.adjudicator.offload import AdjudicationOffloader, OverloadedError
+
+
+def _body(n: int) -> bytes:
+    return json.dumps({
+        "session_id": "s1",
+        "product_id": "p1",
+        "group_id": "g1",
+        "public_seed": "beacon",
+        "participants": [{"participant_id": f"u{i}", "ticket_number": i + 1} for i in range(n)],
+    }).encode()
+
+
+def test_small_requests_are_adjudicated_inline():
+    offloader = AdjudicationOffloader(max_workers=1)
+    app = FastAPI()
+    app.include_router(create_router(offloader))
+    client = TestClient(app)
+
+    response = client.post("/adjudicate", content=_body(5))
+    expected = adjudicate_session(AdjudicationInput.model_validate_json(_body(5)))
+    assert response.status_code == 200
+    assert response.json() == json.loads(expected.model_dump_json())
+    assert client.post("/adjudicate", content=b'{"session_id": "s1"}').status_code == 422
+    assert offloader.inline == 2 and offloader._executor is None
+
+
+def test_columnar_input_matches_row_input():
+    app = FastAPI()
+    app.include_router(create_router(AdjudicationOffloader(max_workers=1)))
+    client = TestClient(app)
+    rows = json.loads(_body(20))
+    participants = rows.pop("participants")
+    columnar = {
+        **rows,
+        "algorithm_version": "1.0",
+        "closing_timestamp": "2025-01-02T00:00:00Z",
+        "participant_ids": [p["participant_id"] for p in participants],
+        "ticket_numbers": [p["ticket_number"] for p in participants],
+        "join_timestamps": [f"2025-01-01T10:00:{i % 3:02d}Z" for i in range(20)],
+    }
+    expected = {**columnar, "participants": [
+        {"participant_id": pid, "ticket_number": t, "join_timestamp": ts}
+        for pid, t, ts in zip(columnar["participant_ids"], columnar["ticket_numbers"], columnar["join_timestamps"])
+    ]}
+
+    response = client.post("/adjudicate/columnar", json=columnar)
+    assert response.status_code == 200
+    assert response.json() == client.post("/adjudicate", json=expected).json()
+    columnar["ticket_numbers"].pop()
+    assert client.post("/adjudicate/columnar", json=columnar).status_code == 422
+
+
+def test_large_requests_go_to_the_pool_and_overload_is_rejected():
+    offloader = AdjudicationOffloader(max_workers=1, max_in_flight=1, max_queue=0, inline_max_bytes=0)
+
+    async def two_at_once():
+        return await asyncio.gather(
+            offloader.adjudicate(_body(50)), offloader.adjudicate(_body(50)), return_exceptions=True
+        )
+
+    try:
+        first, second = asyncio.run(two_at_once())
+        assert first[0] == 200 and json.loads(first[1])["session_id"] == "s1"
+        assert isinstance(second, OverloadedError)
+        assert (offloader.offloaded, offloader.rejected, offloader._admitted) == (1, 1, 0)
+    finally:
+        offloader.shutdown()
+
+
+def test_broken_pool_is_shut_down_and_replaced():
+    offloader = AdjudicationOffloader(max_workers=1, inline_max_bytes=0)
+    offloader.start()
+    broken = offloader._executor
+    try:
+        for process in list(broken._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+        with pytest.raises(BrokenProcessPool):
+            for _ in range(50):  # hasta que el pool se entere de la muerte
+                asyncio.run(offloader.adjudicate(_body(10)))
+        assert offloader._executor is None and offloader._admitted == 0
+
+        status, body = asyncio.run(offloader.adjudicate(_body(10)))
+        assert status == 200 and json.loads(body)["session_id"] == "s1"
+        assert offloader._executor is not broken
+    finally:
+        offloader.shutdown()
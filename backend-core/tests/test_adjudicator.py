@@ -0,0 +1,28 @@
+from src.adjudicator.engine import adjudicate_session, build_trace
+from src.adjudicator.models import AdjudicationInput, Participant
+
+
+def _input(n: int = 5) -> AdjudicationInput:
+    return AdjudicationInput(
+        session_id="api-session-1",
+        product_id="p1",
+        group_id="g1",
+        public_seed="beacon-123",
+        participants=[Participant(participant_id=f"u{i}", ticket_number=n - i) for i in range(n)],
+    )
+
+
+def test_trace_levels_do_not_change_result():
+    input_data = _input()
+
+    full = adjudicate_session(input_data)
+    summary = adjudicate_session(input_data, trace_level="summary")
+    none = adjudicate_session(input_data, trace_level="none")
+
+    assert [s.step for s in full.trace] == [1, 2, 3, 4, 5, 6]
+    assert [s.step for s in summary.trace] == [1, 3, 4, 5, 6]
+    assert none.trace == []
+    for result in (summary, none):
+        assert result.model_dump(exclude={"trace"}) == full.model_dump(exclude={"trace"})
+
+    assert build_trace(input_data) == full.trace
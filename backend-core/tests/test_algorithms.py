@@ -0,0 +1,118 @@
+import pytest
+
+from engine import AdjudicationEngine
+from models.adjudication import AdjudicationInput, Participant
+from src.adjudicator import engine as api_engine
+from src.adjudicator import models as api_models
+from src.adjudicator.registry import (
+    ALGORITHM_V1,
+    ALGORITHM_V1_CLOSING_SEED,
+    ALGORITHM_V1_PUBLIC_SEED,
+    ALGORITHMS,
+    get_algorithm,
+)
+
+PARTICIPANTS = [
+    ("u-3", 3, "2025-01-01T10:00:02Z"),
+    ("u-1", 1, "2025-01-01T10:00:00Z"),
+    ("u-2", 2, "2025-01-01T10:00:00Z"),
+    ("ü-9", 12, None),
+    ("u-5", -4, "2025-01-01T10:00:01Z"),
+]
+
+# Resultados de referencia calculados con los motores anteriores a la unificación:
+# (algorithm_version, public_seed) → (winner_participant_id, winner_index, result_hash)
+GOLDEN = {
+    (ALGORITHM_V1_CLOSING_SEED, None): ("u-1", 1, "2dad94b646e292a709df92e38e80d72c6573842dce9c8adcf9331eea6977dab7"),
+    (ALGORITHM_V1_CLOSING_SEED, "drand-7"): ("u-1", 1, "b9173968367d2dff89fa6af650cec765f17cf5e89bc6c6d0b2fcc76e17e08c62"),
+    (ALGORITHM_V1_PUBLIC_SEED, "drand-7"): ("u-2", 2, "bc3766faaef26cab78f56ee30428c226c817b491735ea981773d45f351550cee"),
+}
+
+
+def _worker_input(version, public_seed):
+    return AdjudicationInput(
+        session_id="golden-1",
+        product_id="p",
+        group_id="g",
+        algorithm_version=version,
+        closing_timestamp="2025-01-02T00:00:00Z",
+        public_seed=public_seed,
+        participants=[Participant(participant_id=a, ticket_number=b, join_timestamp=c) for a, b, c in PARTICIPANTS],
+    )
+
+
+def _api_input(version, public_seed):
+    return api_models.AdjudicationInput(
+        session_id="golden-1",
+        product_id="p",
+        group_id="g",
+        algorithm_version=version,
+        closing_timestamp="2025-01-02T00:00:00Z",
+        public_seed=public_seed,
+        participants=[
+            api_models.Participant(participant_id=a, ticket_number=b, join_timestamp=c) for a, b, c in PARTICIPANTS
+        ],
+    )
+
+
+@pytest.mark.parametrize("version, public_seed", sorted(GOLDEN, key=str))
+def test_both_engines_match_golden_results(version, public_seed):
+    expected = GOLDEN[(version, public_seed)]
+
+    worker = AdjudicationEngine().adjudicate_session(_worker_input(version, public_seed))
+    api = api_engine.adjudicate_session(_api_input(version, public_seed))
+
+    for result in (worker, api):
+        assert result.algorithm_version == version
+        assert (result.winner_participant_id, result.winner_index, result.result_hash) == expected
+    assert [s.model_dump() for s in worker.trace] == [s.model_dump() for s in api.trace]
+
+
+def test_v1_full_trace_is_unchanged():
+    trace = AdjudicationEngine().adjudicate_session(_worker_input(ALGORITHM_V1, None)).trace
+    assert trace[1].value == "ü-9:12; u-1:1; u-2:2; u-5:-4; u-3:3"
+    assert trace[2].value == "golden-1|2025-01-02T00:00:00Z|ü-9u-1u-2u-5u-3"
+
+
+@pytest.mark.parametrize("version", sorted(ALGORITHMS))
+def test_every_version_is_presorted_stable(version):
+    algorithm = get_algorithm(version)
+    input_data = _worker_input(version, "drand-7")
+    ordered = algorithm.order(input_data.participants)
+    presorted_input = input_data.model_copy(update={"participants": ordered})
+
+    baseline = algorithm.adjudicate(input_data)
+    presorted = algorithm.adjudicate(presorted_input, presorted=True)
+    assert (presorted.numeric_seed, presorted.winner_index, presorted.result_hash) == (
+        baseline.numeric_seed,
+        baseline.winner_index,
+        baseline.result_hash,
+    )
+
+
+def test_unknown_or_incomplete_versions_are_rejected():
+    with pytest.raises(ValueError):
+        AdjudicationEngine(algorithm_version="9.9")
+    with pytest.raises(ValueError):
+        api_engine.adjudicate_session(_api_input(ALGORITHM_V1_PUBLIC_SEED, None))
+    with pytest.raises(ValueError):
+        api_engine.adjudicate_session(
+            _api_input(ALGORITHM_V1_CLOSING_SEED, None).model_copy(update={"closing_timestamp": None})
+        )
+
+
+def test_legacy_v1_keeps_each_engine_meaning():
+    # "1.0" es la 1.0-closing-seed en el worker y la 1.0-public-seed en la
+    # API, como antes de unificar; el resultado conserva la versión pedida.
+    worker = AdjudicationEngine().adjudicate_session(_worker_input(ALGORITHM_V1, None))
+    api = api_engine.adjudicate_session(_api_input(ALGORITHM_V1, "drand-7"))
+    assert (worker.winner_participant_id, worker.winner_index, worker.result_hash) == GOLDEN[
+        (ALGORITHM_V1_CLOSING_SEED, None)
+    ]
+    assert (api.winner_participant_id, api.winner_index, api.result_hash) == GOLDEN[(ALGORITHM_V1_PUBLIC_SEED, "drand-7")]
+    assert worker.algorithm_version == api.algorithm_version == ALGORITHM_V1
+    assert api_models.AdjudicationInput.model_fields["algorithm_version"].default == ALGORITHM_V1
+
+    assert AdjudicationEngine().verify(_worker_input(ALGORITHM_V1, None), worker)
+    assert api_engine.verify(_api_input(ALGORITHM_V1, "drand-7"), api)
+    assert not api_engine.verify(_api_input(ALGORITHM_V1, "drand-7"), worker)
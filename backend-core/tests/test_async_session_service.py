@@ -0,0 +1,79 @@
+import asyncio
+from collections import Counter
+
+from postgrest import AsyncPostgrestClient
+
+from benchmarks.fake_postgrest_server import FakePostgrestServer
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_session_tables
+from services.async_database import AsyncDatabaseService
+from services.async_session_service import AsyncSessionService
+from services.database import DatabaseService
+from services.session_service import SessionService
+from session_worker import run_tick_async
+
+
+class _RecordingAdjudication:
+    def __init__(self):
+        self.adjudicated = []
+
+    def adjudicate(self, session_id):
+        self.adjudicated.append(session_id)
+
+
+class _AsyncRecordingAdjudication(_RecordingAdjudication):
+    async def adjudicate(self, session_id):
+        self.adjudicated.append(session_id)
+
+
+async def _async_tick(client, adjudication):
+    with FakePostgrestServer(client) as url:
+        postgrest = AsyncPostgrestClient(url)
+        service = AsyncSessionService(db=AsyncDatabaseService(postgrest), adjudication_service=adjudication)
+        timings = await run_tick_async(service, service.pool)
+        await postgrest.aclose()
+    return timings
+
+
+def test_async_tick_matches_sync_tick_over_http():
+    tables = make_session_tables(60, max_participants=3, full_ratio=0.3, expired_ratio=0.2)
+
+    sync_client = FakeSupabaseClient(tables)
+    sync_adjudication = _RecordingAdjudication()
+    SessionService(db=DatabaseService(client=sync_client), adjudication_service=sync_adjudication).process_open_sessions()
+
+    async_client = FakeSupabaseClient(tables)
+    async_adjudication = _AsyncRecordingAdjudication()
+    timings = asyncio.run(_async_tick(async_client, async_adjudication))
+
+    statuses = Counter(s["status"] for s in async_client.tables["sessions"])
+    assert statuses == Counter(s["status"] for s in sync_client.tables["sessions"])
+    assert statuses["expired"] and statuses["complete"]
+    assert sorted(async_adjudication.adjudicated) == sorted(sync_adjudication.adjudicated)
+    assert set(timings) == {"scheduled", "open", "chains", "total"}
+
+
+def test_async_overdue_full_session_unknown_to_scheduler_is_expired_not_closed():
+    client = FakeSupabaseClient({
+        "sessions": [{"id": "s1", "status": "open", "max_participants": 2,
+                      "expiry_timestamp": "2999-01-01T00:00:00+00:00", "created_at": "2025-01-01T10:00:00+00:00"},
+                     # Más reciente: deja s1 fuera del solape de la marca de agua.
+                     {"id": "s2", "status": "open", "max_participants": 5,
+                      "expiry_timestamp": "2999-01-01T00:00:00+00:00", "created_at": "2025-01-01T12:00:00+00:00"}],
+        "participants": [{"id": f"p{i}", "session_id": "s1"} for i in range(2)],
+    })
+    adjudication = _AsyncRecordingAdjudication()
+
+    async def run():
+        with FakePostgrestServer(client) as url:
+            postgrest = AsyncPostgrestClient(url)
+            service = AsyncSessionService(db=AsyncDatabaseService(postgrest), adjudication_service=adjudication)
+            await service.refresh_expiries()
+            # La caducidad cambia después de programarla: el planificador sigue con la antigua.
+            client.table("sessions").update({"expiry_timestamp": "2025-01-02T00:00:00+00:00"}).eq("id", "s1").execute()
+            await service.process_open_sessions()
+            await postgrest.aclose()
+
+    asyncio.run(run())
+    assert {s["id"]: s["status"] for s in client.tables["sessions"]} == {"s1": "expired", "s2": "open"}
+    assert adjudication.adjudicated == []
@@ -9,3 +9,225 @@ def test_engine_demo():
     assert result.winner_index >= 0
     assert result.winner_participant_id is not None
 
+
+
+def test_adjudicate_many_matches_single_session_path():
+    from benchmarks.synthetic import make_inputs
+
+    engine = AdjudicationEngine()
+    inputs = make_inputs(session_count=12, participant_count=25)
+
+    expected = [engine.adjudicate_session(i).model_dump_json() for i in inputs]
+
+    inline = [r.model_dump_json() for r in engine.adjudicate_many(inputs)]
+    pooled = [
+        r.model_dump_json()
+        for r in engine.adjudicate_many(iter(inputs), max_workers=2, chunk_size=5, parallel_threshold=4)
+    ]
+
+    assert inline == expected
+    assert pooled == expected
+
+
+def test_trace_levels_do_not_change_result():
+    from benchmarks.synthetic import make_input
+
+    engine = AdjudicationEngine()
+    input_data = make_input("trace-session", participant_count=50)
+
+    full = engine.adjudicate_session(input_data)
+    summary = engine.adjudicate_session(input_data, trace_level="summary")
+    none = AdjudicationEngine(trace_level="none").adjudicate_session(input_data)
+
+    assert [s.step for s in full.trace] == [1, 2, 3, 4, 5, 6, 7]
+    assert [s.step for s in summary.trace] == [1, 4, 5, 6, 7]
+    assert none.trace == []
+    for result in (summary, none):
+        assert result.model_dump(exclude={"trace"}) == full.model_dump(exclude={"trace"})
+
+    assert engine.build_trace(input_data) == full.trace
+
+
+def test_stream_seed_matches_concatenated_seed():
+    from utils import build_base_seed, normalize_seed_to_int, stream_seed_to_int
+
+    ids = [f"ü-{i}" for i in range(10_000)] + ["", "user-x"]
+    for public_seed in (None, "", "drand-42"):
+        expected = normalize_seed_to_int(
+            build_base_seed("s-1", "2025-01-01T00:00:00Z", "".join(ids), public_seed)
+        )
+        assert stream_seed_to_int("s-1", "2025-01-01T00:00:00Z", iter(ids), public_seed) == expected
+
+
+def test_sort_key_and_presorted_contract_match_legacy_order():
+    import random
+
+    from models.adjudication import AdjudicationInput, Participant
+    from utils import participants_in_canonical_order, sort_participants_deterministically
+
+    def legacy_sort(participants):
+        return sorted(
+            participants,
+            key=lambda p: (p.join_timestamp or "", str(p.ticket_number).zfill(10), p.participant_id),
+        )
+
+    engine = AdjudicationEngine(trace_level="none")
+    for case in range(200):
+        rng = random.Random(case)
+        tickets = (
+            (0, 50) if case % 3 else (-(10 ** 11), 10 ** 11)  # incluye negativos y > 10 dígitos
+        )
+        participants = [
+            Participant(
+                participant_id=f"u{rng.randint(0, 30)}",
+                ticket_number=rng.randint(*tickets),
+                join_timestamp=rng.choice([None, "", "2025-01-01T10:00:00Z", "2025-01-01T10:00:01Z"])
+                if case % 2
+                else f"2025-01-01T10:00:{rng.randint(0, 9):02d}Z",
+            )
+            for _ in range(rng.randint(1, 60))
+        ]
+
+        expected = legacy_sort(participants)
+        assert sort_participants_deterministically(participants) == expected
+        assert participants_in_canonical_order(expected)
+
+        input_data = AdjudicationInput(
+            session_id=f"prop-{case}",
+            product_id="p",
+            group_id="g",
+            closing_timestamp="2025-01-02T00:00:00Z",
+            participants=participants,
+        )
+        presorted_input = input_data.model_copy(update={"participants": expected})
+        baseline = engine.adjudicate_session(input_data)
+        # Contrato cumplido (solo verificación) y contrato incumplido (se reordena).
+        assert engine.adjudicate_session(presorted_input, presorted=True) == baseline
+        assert engine.adjudicate_session(input_data, presorted=True) == baseline
+
+
+def test_verify_detects_tampered_results(tmp_path):
+    import json
+
+    from benchmarks.synthetic import make_inputs
+    from verify_adjudications import verify_export
+
+    engine = AdjudicationEngine(trace_level="none")
+    inputs = make_inputs(session_count=6, participant_count=20)
+    results = list(engine.adjudicate_many(inputs))
+
+    assert all(engine.verify(i, r) for i, r in zip(inputs, results))
+
+    tampered = results[2].model_copy(update={"winner_index": (results[2].winner_index + 1) % 20})
+    forged = results[4].model_copy(update={"result_hash": "0" * 64})
+    pairs = list(zip(inputs, results))
+    pairs[2] = (inputs[2], tampered)
+    pairs[4] = (inputs[4], forged)
+    assert list(engine.verify_many(pairs, max_workers=2, chunk_size=2, parallel_threshold=3)) == [
+        True, True, False, True, False, True,
+    ]
+
+    export = tmp_path / "adjudications.jsonl"
+    export.write_text(
+        "\n".join(
+            json.dumps({"input": i.model_dump(), "result": r.model_dump()}) for i, r in pairs
+        )
+        + "\nnot-json\n"
+    )
+    summary = verify_export(str(export), max_workers=1)
+    assert summary["total"] == 7
+    assert summary["verified"] == 4
+    assert [f["line"] for f in summary["failed"]] == [3, 5, 7]
+
+
+def test_verify_export_uses_the_record_engine(tmp_path):
+    import json
+
+    from src.adjudicator import engine as api_engine
+    from src.adjudicator import models as api_models
+    from verify_adjudications import verify_export
+
+    def api_record(version, **extra):
+        # Sin closing_timestamp, que el modelo de entrada del worker exige.
+        input_data = api_models.AdjudicationInput(
+            session_id=f"api-{version}",
+            product_id="p",
+            group_id="g",
+            public_seed="drand-7",
+            algorithm_version=version,
+            participants=[api_models.Participant(participant_id=f"u-{i}", ticket_number=i) for i in range(1, 6)],
+        )
+        result = api_engine.adjudicate_session(input_data, trace_level="none")
+        return {"input": input_data.model_dump(), "result": result.model_dump(), **extra}
+
+    # "1.0" es la versión por defecto de la API: con el worker sería la 1.0-closing-seed.
+    legacy = api_record("1.0")
+    forged = {**legacy, "result": {**legacy["result"], "result_hash": "0" * 64}}
+    export = tmp_path / "api.jsonl"
+    export.write_text("\n".join(json.dumps(r) for r in (legacy, forged, api_record("1.0-public-seed"))))
+
+    summary = verify_export(str(export), max_workers=1, source="api")
+    assert summary["verified"] == 2
+    assert summary["failed"] == [{"line": 2, "session_id": "api-1.0", "error": ""}]
+    assert verify_export(str(export), max_workers=1)["verified"] == 0
+
+    # El campo engine de cada línea manda sobre source.
+    export.write_text("\n".join(json.dumps(r) for r in (api_record("1.0", engine="api"), api_record("1.0"))))
+    summary = verify_export(str(export), max_workers=1)
+    assert summary["verified"] == 1 and [f["line"] for f in summary["failed"]] == [2]
+
+
+def test_adjudication_service_same_result_for_string_and_datetime_rows():
+    from datetime import datetime, timezone
+
+    from benchmarks.fake_supabase import FakeSupabaseClient
+    from services.adjudication_service import AdjudicationService
+    from services.database import DatabaseService
+
+    closing = datetime(2025, 1, 2, 9, 30, 0, 123456, tzinfo=timezone.utc)
+    joined = [datetime(2025, 1, 1, 10, i, tzinfo=timezone.utc) for i in range(3)]
+
+    def adjudicate(as_text: bool) -> AdjudicationResult:
+        value = (lambda ts: ts.isoformat()) if as_text else (lambda ts: ts)
+        tables = {
+            "sessions": [{"id": "s1", "product_id": "cafe", "status": "complete", "closing_timestamp": value(closing)}],
+            # Ticket 0 es un ticket válido, no un hueco a rellenar con la posición.
+            "participants": [
+                {"id": f"p{i}", "session_id": "s1", "ticket_number": i, "created_at": value(ts)}
+                for i, ts in enumerate(joined)
+            ],
+        }
+        return AdjudicationService(db=DatabaseService(client=FakeSupabaseClient(tables))).adjudicate("s1")
+
+    from_rest, from_postgres = adjudicate(as_text=True), adjudicate(as_text=False)
+    assert from_rest.result_hash == from_postgres.result_hash
+    assert from_rest.winner_ticket_number == int(from_rest.winner_participant_id[1:])
+
+
+def test_stored_session_adjudication_verifies_from_its_own_input(tmp_path):
+    import json
+
+    from benchmarks.fake_supabase import FakeSupabaseClient
+    from services.adjudication_service import SESSION_ADJUDICATIONS_TABLE, AdjudicationService
+    from services.database import DatabaseService
+    from verify_adjudications import verify_export
+
+    client = FakeSupabaseClient({
+        "sessions": [{"id": "s1", "product_id": "cafe", "chain_group_id": "g1", "status": "complete",
+                      "closing_timestamp": "2025-01-02T09:30:00Z"}],
+        "participants": [
+            {"id": f"p{i}", "session_id": "s1", "ticket_number": None if i == 2 else i * 10,
+             "created_at": f"2025-01-01T10:0{i}:00Z"}
+            for i in range(4)
+        ],
+    })
+    AdjudicationService(db=DatabaseService(client=client)).adjudicate("s1")
+
+    (row,) = client.tables[SESSION_ADJUDICATIONS_TABLE]
+    assert row["input"]["group_id"] == "g1"
+    assert row["input"]["closing_timestamp"] == "2025-01-02T09:30:00+00:00"
+    assert [p["ticket_number"] for p in row["input"]["participants"]] == [0, 10, 3, 30]
+
+    export = tmp_path / "session_adjudications.jsonl"
+    export.write_text(json.dumps({"input": row["input"], "result": row["result"]}))
+    assert verify_export(str(export), max_workers=1)["verified"] == 1
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.fake_supabase import FakeSupabaseClient
+from services.change_feed import RESYNC, LocalChangeFeed
+from services.database import DatabaseService
+from services.event_worker import EventDrivenWorker
+from services.session_pool_service import SessionPoolService
+from services.session_service import SessionService
+
+
+class _RecordingAdjudication:
+    def __init__(self):
+        self.adjudicated = []
+
+    def adjudicate(self, session_id):
+        self.adjudicated.append(session_id)
+
+
+def _worker(sessions):
+    feed = LocalChangeFeed()
+    client = FakeSupabaseClient({"sessions": sessions}, listener=feed.publish)
+    db = DatabaseService(client=client)
+    adjudication = _RecordingAdjudication()
+    pool = SessionPoolService(db=db)
+    service = SessionService(db=db, adjudication_service=adjudication, pool=pool)
+    return EventDrivenWorker(service, pool, feed, resync_interval_seconds=3600), client, db, adjudication
+
+
+def test_participant_insert_closes_session_without_full_tick():
+    expiry = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+    worker, client, db, adjudication = _worker([
+        {"id": "s1", "status": "open", "max_participants": 2, "expiry_timestamp": expiry},
+        {"id": "s2", "status": "open", "max_participants": 2, "expiry_timestamp": expiry},
+    ])
+    db.insert("participants", {"session_id": "s1"})
+    worker.run_once()  # tick inicial + evento del primer alta
+    assert adjudication.adjudicated == []
+
+    db.insert("participants", {"session_id": "s1"})
+    client.reset_counters()
+    worker.run_once()
+    assert adjudication.adjudicated == ["s1"]
+    assert ("select", "sessions") in client.calls and client.calls[("select", "sessions")] == 1
+
+
+def test_expiry_deadline_wakes_worker():
+    soon = (datetime.now(timezone.utc) + timedelta(milliseconds=200)).isoformat()
+    worker, client, db, adjudication = _worker([
+        {"id": "s1", "status": "open", "max_participants": 5, "expiry_timestamp": soon},
+    ])
+    worker.run_once()
+    assert client.tables["sessions"][0]["status"] == "expired"
+
+
+def test_resync_event_forces_full_tick():
+    expiry = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+    worker, client, db, adjudication = _worker([
+        {"id": "s1", "status": "open", "max_participants": 1, "expiry_timestamp": expiry},
+    ])
+    worker._next_resync = worker.clock() + 3600  # el tick periódico aún no toca
+
+    # Alta hecha mientras el feed estaba caído: su notificación se ha perdido.
+    client.tables.setdefault("participants", []).append({"id": "p1", "session_id": "s1"})
+    worker.feed._events.put(RESYNC)
+    worker.run_once()
+    assert adjudication.adjudicated == ["s1"]
+
+
+def test_deadline_scheduler_pops_only_due_and_honours_reschedule():
+    from services.deadline_scheduler import DeadlineScheduler
+
+    scheduler = DeadlineScheduler()
+    scheduler.schedule("a", "2025-01-01T00:00:10Z")
+    scheduler.schedule("b", "2025-01-01T00:00:20+00:00")
+    scheduler.schedule("c", "2025-01-01T00:00:05Z")
+    scheduler.schedule("a", "2025-01-01T00:00:30Z")  # reprogramada
+    scheduler.cancel("c")
+    assert scheduler.schedule("d", None) is False
+
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+    assert scheduler.pop_due(base + 15) == []
+    assert scheduler.next_deadline() == base + 20
+    assert scheduler.pop_due(base + 30) == ["b", "a"]
+    assert len(scheduler) == 0
@@ -0,0 +1,12 @@
+from benchmarks.bench_lifecycle import simulate
+
+
+def test_lifecycle_adjudicates_every_filled_session_within_a_tick():
+    report = simulate(operators=2, chains=4, chain_length=3, max_participants=4, arrival_rate=10, ticks=25)
+
+    assert report["filled"] > 8 and report["pending"] == []
+    # Las cadenas avanzan: se crean sesiones más allá del primer eslabón.
+    assert report["sessions"] > 2 * 4
+    assert report["latency_p99"] <= 5.0 + 1.0
+    # Coste fijo por adjudicación: sesión, participantes, resultado y estado.
+    assert report["calls_per_adjudication"] == 4
@@ -0,0 +1,52 @@
+from services.database import create_database_service, like_escape
+from services.memory_database import InMemoryDatabaseService
+
+
+def test_memory_backend_keeps_indexes_in_step_with_writes(monkeypatch):
+    monkeypatch.setenv("DB_BACKEND", "memory")
+    db = create_database_service()
+    assert isinstance(db, InMemoryDatabaseService)
+
+    ids = [db.insert("sessions", {"status": "open", "pool_id": f"p{i}"}).data[0]["id"] for i in range(4)]
+    db.insert("participants", {"session_id": ids[0]})
+    db.update("sessions", ids[1], {"status": "complete"})
+    db.delete("sessions", ids[2])
+
+    assert db.fetch_by_id("sessions", ids[1]).data[0]["status"] == "complete"
+    assert {r["id"] for r in db.fetch_by_field("sessions", "status", "open").data} == {ids[0], ids[3]}
+    assert db.count_by_field("participants", "session_id", ids[0]) == 1
+    assert db.fetch_by_id("sessions", ids[2]).data == []
+    assert len(db.fetch_all("sessions").data) == 3
+
+    status = db.client.index("sessions", "status")
+    assert {value: len(rows) for value, rows in status.items()} == {"open": 2, "complete": 1}
+
+
+def test_inserts_keep_ordered_index_sorted():
+    db = InMemoryDatabaseService({"sessions": [{"id": "a", "created_at": "2025-01-01T10:00:05+00:00"}]})
+    after = [("gt", "created_at", "2025-01-01T10:00:01+00:00")]
+    page = lambda: [r["id"] for r in db.fetch_filtered("sessions", after, order=("created_at",), limit=10).data]
+    assert page() == ["a"]
+    cached = db.client.ordered("sessions", "created_at")
+
+    db.insert("sessions", {"id": "b", "created_at": "2025-01-01T10:00:03+00:00"})
+    db.insert("sessions", {"id": "c", "created_at": None})
+    db.insert("sessions", {"id": "d", "created_at": "2025-01-01T10:00:05+00:00"})
+    db.insert("sessions", {"id": "e", "created_at": "2025-01-01T10:00:00+00:00"})
+
+    assert db.client.ordered("sessions", "created_at") is cached
+    assert page() == ["b", "a", "d"]
+    assert [r["id"] for r in cached[1]] == ["e", "b", "a", "d", "c"]
+    assert cached[0] == sorted(r["created_at"] for r in cached[1] if r["created_at"])
+
+
+def test_escaped_ilike_matches_literally():
+    keys = ["a_b", "axb", "50%", "500", "c\\d", "cd"]
+    db = InMemoryDatabaseService({"sessions_pool": [{"id": key, "product_id": key} for key in keys]})
+    search = lambda text: sorted(
+        r["id"] for r in db.fetch_filtered("sessions_pool", [("ilike", "product_id", f"%{like_escape(text)}%")]).data
+    )
+    assert search("_") == ["a_b"]
+    assert search("0%") == ["50%"]
+    assert search("\\") == ["c\\d"]
+    assert search("A_B") == ["a_b"]
@@ -0,0 +1,85 @@
+import threading
+import time
+
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_session_tables
+from services.change_feed import LocalChangeFeed
+from services.database import DatabaseService
+from services.query_cache import CachedDatabaseService, QueryCache, watch_changes
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cached_reads_expire_and_invalidate_by_table():
+    client = FakeSupabaseClient(make_session_tables(20, max_participants=3))
+    clock = _Clock()
+    db = CachedDatabaseService(DatabaseService(client=client), QueryCache(ttl_seconds=10, clock=clock))
+    open_filter = [("eq", "status", "open")]
+
+    first = db.fetch_filtered("sessions", open_filter, columns="id", limit=5)
+    assert db.fetch_filtered("sessions", list(open_filter), columns="id", limit=5) is first
+    assert db.fetch_filtered("sessions", open_filter, columns="id", limit=6) is not first
+    assert client.round_trips == 2
+
+    db.cache.invalidate("participants")
+    db.fetch_filtered("sessions", open_filter, columns="id", limit=5)
+    assert client.round_trips == 2
+
+    clock.now = 11
+    db.fetch_filtered("sessions", open_filter, columns="id", limit=5)
+    assert client.round_trips == 3
+
+    # Una escritura invalida su tabla.
+    db.update_many("sessions", [client.tables["sessions"][0]["id"]], {"status": "expired"})
+    assert db.count_filtered("sessions", open_filter) == 19
+    assert client.round_trips == 5
+
+
+def test_cache_is_bounded_and_loads_once_under_concurrency():
+    cache = QueryCache(max_entries=3)
+    for i in range(10):
+        cache.get_or_load(("fetch_filtered", "sessions", i), lambda: i)
+    assert len(cache) == 3
+
+    loads = []
+    release = threading.Event()
+
+    def slow_load():
+        loads.append(1)
+        release.wait(5)
+        return "page"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load(("count", "sessions"), slow_load)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+    assert results == ["page"] * 8 and len(loads) == 1
+
+
+def test_change_feed_invalidates_cached_table():
+    cache = QueryCache()
+    feed = LocalChangeFeed()
+    cache.get_or_load(("fetch_filtered", "sessions"), lambda: 1)
+    cache.get_or_load(("fetch_filtered", "sessions_pool"), lambda: 2)
+
+    watch_changes(cache, feed)
+    feed.publish("sessions", "UPDATE", {"id": "s1", "status": "complete"})
+
+    deadline = time.time() + 2
+    while len(cache) != 1 and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.get_or_load(("fetch_filtered", "sessions_pool"), lambda: 0) == 2
+    assert cache.get_or_load(("fetch_filtered", "sessions"), lambda: 3) == 3
@@ -0,0 +1,19 @@
+from benchmarks.fake_supabase import FakeSupabaseClient
+from services.database import DatabaseService
+from seed_sessions_pool import OPERATORS, PRODUCTS, seed_sessions_pool
+
+
+def test_bulk_seed_batches_and_is_idempotent():
+    client = FakeSupabaseClient()
+    db = DatabaseService(client=client)
+    expected = len(PRODUCTS) * len(OPERATORS) * (3 * 5 + 2)
+
+    assert seed_sessions_pool(db, chains=3, batch_size=40, workers=3) == expected
+    assert client.calls[("upsert", "sessions_pool")] == -(-expected // 40)
+    seed_sessions_pool(db, chains=3, batch_size=40, workers=3)
+
+    pool = client.tables["sessions_pool"]
+    assert len(pool) == expected
+    assert len({row["template_key"] for row in pool}) == expected
+    chain = [row for row in pool if row["chain_group_id"] == "XPS5-00002" and row["operator_code"] == "PT"]
+    assert sorted(row["chain_index"] for row in chain) == [1, 2, 3, 4, 5]
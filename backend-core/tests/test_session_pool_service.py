@@ -0,0 +1,66 @@
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_pool_tables
+from services.database import DatabaseService
+from services.session_pool_service import SessionPoolService
+
+
+def test_scheduled_entries_single_query_and_fallback():
+    tables = make_pool_tables(200, pending=7, future=5)
+    expected = [f"pool-{i:07d}" for i in range(193, 200)]
+
+    client = FakeSupabaseClient(tables)
+    pool = SessionPoolService(db=DatabaseService(client=client))
+    entries = pool._fetch_scheduled_pool_entries()
+    assert sorted(r["id"] for r in entries) == expected
+    assert client.round_trips == 1
+    assert all("sessions" not in r for r in entries)
+
+    fallback = SessionPoolService(db=DatabaseService(client=FakeSupabaseClient(tables, relations={})))
+    assert sorted(r["id"] for r in fallback._fetch_scheduled_pool_entries()) == expected
+
+
+def test_advance_chains_respects_operator_and_runs_once():
+    from benchmarks.synthetic import make_chain_tables
+    from services.session_service import SessionService
+
+    tables = make_chain_tables(30, chain_length=4, new_adjudications=10, operators=("ES", "PT"))
+    client = FakeSupabaseClient(tables)
+    db = DatabaseService(client=client)
+    service = SessionService(db=db, adjudication_service=object(), pool=SessionPoolService(db=db))
+    before = {s["id"] for s in client.tables["sessions"]}
+
+    service.process_chains_for_adjudicated_sessions()
+    created = [s for s in client.tables["sessions"] if s["id"] not in before]
+    assert len(created) == 10
+    for s in created:
+        template = next(p for p in client.tables["sessions_pool"] if p["id"] == s["pool_id"])
+        assert s["operator_code"] == template["operator_code"]
+        assert s["chain_index"] == template["chain_index"]
+    assert not [s for s in client.tables["sessions"] if s["status"] == "adjudicated" and not s["chain_advanced"]]
+
+    client.reset_counters()
+    service.process_chains_for_adjudicated_sessions()
+    assert client.round_trips == 1
+    assert len(client.tables["sessions"]) == len(before) + 10
+
+
+def test_chain_index_pages_full_load_and_sees_late_templates():
+    from services.chain_index import CHAIN_TEMPLATE_COLUMNS, ChainIndex
+    from services.database import DEFAULT_PAGE_SIZE
+
+    templates = [
+        {"id": f"p{i:04d}", "product_id": "cafe", "operator_code": "ES", "max_participants": 3, "amount": 1,
+         "chain_group_id": "g", "chain_index": i, "created_at": "2025-01-01T10:00:00+00:00", "notes": "x" * 50}
+        for i in range(DEFAULT_PAGE_SIZE + 5)
+    ]
+    client = FakeSupabaseClient({"sessions_pool": templates}, max_rows=DEFAULT_PAGE_SIZE)
+    chains = ChainIndex(DatabaseService(client=client))
+
+    chains.refresh()
+    assert len(chains) == DEFAULT_PAGE_SIZE + 5
+    assert set(chains.get("g", "ES", 0)) == set(CHAIN_TEMPLATE_COLUMNS.split(","))
+
+    # Confirmada tarde: created_at anterior a la marca de agua.
+    client.table("sessions_pool").insert({**templates[0], "id": "late", "chain_group_id": "h"}).execute()
+    chains.refresh()
+    assert chains.get("h", "ES", 0)["id"] == "late"
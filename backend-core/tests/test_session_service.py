@@ -0,0 +1,163 @@
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_session_tables
+from services.database import DEFAULT_PAGE_SIZE, DatabaseService
+from services.session_service import SessionService
+
+
+class _RecordingAdjudication:
+    def __init__(self):
+        self.adjudicated = []
+
+    def adjudicate(self, session_id):
+        self.adjudicated.append(session_id)
+
+
+def test_count_by_field_many_rpc_and_fallback_agree():
+    tables = make_session_tables(50, max_participants=4)
+    ids = [s["id"] for s in tables["sessions"]] + ["missing"]
+
+    rpc_db = DatabaseService(client=FakeSupabaseClient(tables))
+    fallback_db = DatabaseService(client=FakeSupabaseClient(tables, functions={}))
+
+    expected = {i: rpc_db.count_by_field("participants", "session_id", i) for i in ids}
+    assert rpc_db.count_by_field_many("participants", "session_id", ids) == expected
+    assert fallback_db.count_by_field_many("participants", "session_id", ids) == expected
+    assert expected["missing"] == 0
+
+
+def test_iter_rows_pages_by_key_without_truncating():
+    tables = make_session_tables(250, max_participants=2)
+    client = FakeSupabaseClient(tables)
+    db = DatabaseService(client=client)
+
+    rows = list(db.iter_rows("participants", columns="session_id", page_size=100))
+
+    assert sorted(r["id"] for r in rows) == sorted(p["id"] for p in tables["participants"])
+    assert client.calls[("select", "participants")] == len(rows) // 100 + 1
+    assert len(db.fetch_all("participants").data) == len(rows)
+
+    open_ids = {s["id"] for s in tables["sessions"] if s["status"] == "open"}
+    streamed = db.iter_rows("sessions", [("eq", "status", "open")], columns="status", page_size=7)
+    assert {r["id"] for r in streamed} == open_ids
+
+
+def test_fetch_filtered_spec_pages_in_database():
+    rows = [
+        {"id": f"t{i:03d}", "product_id": f"Cafe-{i % 3}" if i % 2 else f"te-{i}", "created_at": f"2025-01-{1 + i % 28:02d}"}
+        for i in range(60)
+    ]
+    client = FakeSupabaseClient({"sessions_pool": rows})
+    db = DatabaseService(client=client)
+    filters = [("ilike", "product_id", "%cafe%"), ("range", "created_at", ("2025-01-05", None))]
+    expected = sorted(
+        (r for r in rows if "cafe" in r["product_id"].lower() and r["created_at"] >= "2025-01-05"),
+        key=lambda r: r["created_at"],
+        reverse=True,
+    )
+
+    page = db.fetch_filtered(
+        "sessions_pool", filters, columns="id,created_at", order=("-created_at",), limit=10, offset=10, count=True
+    )
+
+    assert page.count == len(expected) == db.count_filtered("sessions_pool", filters)
+    assert [r["created_at"] for r in page.data] == [r["created_at"] for r in expected[10:20]]
+    assert set(page.data[0]) == {"id", "created_at"}
+    assert client.rows_transferred == 10 + 1
+
+
+def test_process_open_sessions_counts_once_per_tick():
+    tables = make_session_tables(40, max_participants=3, full_ratio=0.3, expired_ratio=0.2)
+    client = FakeSupabaseClient(tables)
+    adjudication = _RecordingAdjudication()
+    service = SessionService(db=DatabaseService(client=client), adjudication_service=adjudication, pool=object())
+
+    service.process_open_sessions()
+
+    assert client.calls[("rpc", "count_rows_grouped")] == 1
+    assert client.calls[("update", "sessions")] == 2  # un bloque de caducadas y uno de cerradas
+    assert ("select", "participants") not in client.calls
+    statuses = {s["id"]: s["status"] for s in client.tables["sessions"]}
+    assert sorted(adjudication.adjudicated) == sorted(i for i, st in statuses.items() if st == "complete")
+    assert "expired" in statuses.values() and adjudication.adjudicated
+
+
+def test_failed_adjudication_is_isolated_and_recovered_next_tick():
+    tables = make_session_tables(30, max_participants=3, full_ratio=0.5, expired_ratio=0.0)
+    client = FakeSupabaseClient(tables)
+    db = DatabaseService(client=client)
+
+    class _FlakyAdjudication(_RecordingAdjudication):
+        failing = None
+
+        def adjudicate(self, session_id):
+            if self.failing is None:
+                self.failing = session_id
+            if session_id == self.failing:
+                raise RuntimeError("motor caído")
+            super().adjudicate(session_id)
+            db.update_many("sessions", [session_id], {"status": "adjudicated"})
+
+    adjudication = _FlakyAdjudication()
+    service = SessionService(db=db, adjudication_service=adjudication, pool=object())
+    service.recovery_grace_seconds = 0
+
+    service.process_open_sessions()
+    statuses = {s["id"]: s["status"] for s in client.tables["sessions"]}
+    assert statuses[adjudication.failing] == "complete"
+    assert len(adjudication.adjudicated) >= 2  # el fallo no corta el resto del lote
+
+    # Un cierre que sí guardó su resultado pero no llegó a cambiar el estado.
+    stuck = adjudication.adjudicated[0]
+    db.update_many("sessions", [stuck], {"status": "complete"})
+    db.insert("session_adjudications", {"session_id": stuck})
+    failed, adjudication.failing = adjudication.failing, "none"
+
+    service.process_open_sessions()
+    statuses = {s["id"]: s["status"] for s in client.tables["sessions"]}
+    assert statuses[failed] == statuses[stuck] == "adjudicated"
+    assert adjudication.adjudicated.count(stuck) == 1 and failed in adjudication.adjudicated
+    assert "complete" not in statuses.values()
+
+
+def test_refresh_expiries_pages_past_max_rows_and_picks_up_late_commits():
+    sessions = [
+        {"id": f"s{i:04d}", "status": "open", "expiry_timestamp": f"2025-02-01T00:00:{i % 60:02d}+00:00",
+         "created_at": f"2025-01-01T10:00:{i % 60:02d}+00:00"}
+        for i in range(DEFAULT_PAGE_SIZE + 25)
+    ]
+    client = FakeSupabaseClient({"sessions": sessions}, max_rows=DEFAULT_PAGE_SIZE)
+    service = SessionService(db=DatabaseService(client=client), adjudication_service=object(), pool=object())
+
+    service.refresh_expiries()
+    assert len(service.expiries) == DEFAULT_PAGE_SIZE + 25  # un select suelto se quedaría en max-rows
+
+    # Confirmada después de la carga, pero con una created_at anterior a la marca.
+    client.table("sessions").insert({
+        "id": "late", "status": "open", "expiry_timestamp": "2025-02-01T00:00:00+00:00",
+        "created_at": "2025-01-01T10:00:00+00:00",
+    }).execute()
+    service.refresh_expiries()
+    assert len(service.expiries) == DEFAULT_PAGE_SIZE + 26
+
+
+def test_overdue_full_session_unknown_to_scheduler_is_expired_not_closed():
+    tables = {
+        "sessions": [{"id": "s1", "status": "open", "max_participants": 2,
+                      "expiry_timestamp": "2999-01-01T00:00:00+00:00", "created_at": "2025-01-01T10:00:00+00:00"},
+                     # Más reciente: deja s1 fuera del solape de la marca de agua.
+                     {"id": "s2", "status": "open", "max_participants": 5,
+                      "expiry_timestamp": "2999-01-01T00:00:00+00:00", "created_at": "2025-01-01T12:00:00+00:00"}],
+        "participants": [{"id": f"p{i}", "session_id": "s1"} for i in range(2)],
+    }
+    client = FakeSupabaseClient(tables)
+    db = DatabaseService(client=client)
+    adjudication = _RecordingAdjudication()
+    service = SessionService(db=db, adjudication_service=adjudication, pool=object())
+
+    service.refresh_expiries()
+    # La caducidad cambia después de programarla: el planificador sigue con la antigua.
+    db.update("sessions", "s1", {"expiry_timestamp": "2025-01-02T00:00:00+00:00"})
+    service.process_open_sessions()
+
+    assert {s["id"]: s["status"] for s in client.tables["sessions"]} == {"s1": "expired", "s2": "open"}
+    assert adjudication.adjudicated == []
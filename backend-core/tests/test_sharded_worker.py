@@ -0,0 +1,95 @@
+import multiprocessing
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+from postgrest import SyncPostgrestClient
+
+from benchmarks.fake_postgrest_server import FakePostgrestServer
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_session_tables
+from services.database import DatabaseService
+from services.session_pool_service import SessionPoolService
+from services.session_service import SessionService
+from services.shard_lease import SHARD_COUNT, ShardLease
+from session_worker import run_sharded, run_tick
+
+
+class _LoggedAdjudication:
+    def __init__(self, db, owner):
+        self.db = db
+        self.owner = owner
+
+    def adjudicate(self, session_id):
+        self.db.insert("adjudication_log", {"session_id": session_id, "worker": self.owner})
+
+
+def _worker(url, owner, sharded, ticks):
+    db = DatabaseService(client=SyncPostgrestClient(url))
+    lease = ShardLease(db, owner=owner) if sharded else None
+    pool = SessionPoolService(db=db, shards=lease)
+    service = SessionService(db=db, adjudication_service=_LoggedAdjudication(db, owner), pool=pool, shards=lease)
+    if sharded:
+        run_sharded(service, pool, lease, poll_interval_seconds=0.01, ticks=ticks)
+    else:
+        for _ in range(ticks):
+            run_tick(service, pool)
+            time.sleep(0.01)
+
+
+def _fill(client, sessions, max_participants):
+    # Las sesiones se van llenando mientras los workers están en marcha.
+    for session in sessions:
+        for ticket in range(max_participants):
+            client.table("participants").insert({"session_id": session["id"], "ticket_number": ticket + 1}).execute()
+        time.sleep(0.002)
+
+
+def test_shard_leases_split_evenly_between_workers():
+    db = DatabaseService(client=FakeSupabaseClient())
+    leases = [ShardLease(db, owner=f"w{i}") for i in range(3)]
+    for _ in range(2):
+        for lease in leases:
+            lease.renew()
+
+    owned = [set(lease.shards) for lease in leases]
+    assert set().union(*owned) == set(range(SHARD_COUNT))
+    assert sum(len(s) for s in owned) == SHARD_COUNT
+    assert max(len(s) for s in owned) - min(len(s) for s in owned) <= 2
+
+    leases[0].release()
+    for lease in leases[1:]:
+        lease.renew()
+    assert set(leases[1].shards) | set(leases[2].shards) == set(range(SHARD_COUNT))
+
+
+@pytest.mark.parametrize("sharded", [True, False])
+def test_concurrent_worker_processes_adjudicate_each_session_once(sharded):
+    tables = make_session_tables(150, max_participants=3, full_ratio=0, expired_ratio=0.1)
+    tables["participants"] = []
+    client = FakeSupabaseClient(tables)
+    now = datetime.now(timezone.utc).isoformat()
+    pending = [s for s in tables["sessions"] if s["expiry_timestamp"] > now]
+
+    context = multiprocessing.get_context("fork")
+    with FakePostgrestServer(client) as url:
+        workers = [context.Process(target=_worker, args=(url, f"w{i}", sharded, 25)) for i in range(3)]
+        for worker in workers:
+            worker.start()
+        filler = threading.Thread(target=_fill, args=(client, pending, 3))
+        filler.start()
+        filler.join()
+        for worker in workers:
+            worker.join(timeout=60)
+            assert worker.exitcode == 0
+
+    log = client.tables["adjudication_log"]
+    per_session = Counter(row["session_id"] for row in log)
+    statuses = Counter(s["status"] for s in client.tables["sessions"])
+    assert statuses["complete"] == len(per_session)
+    assert set(per_session.values()) == {1}
+    assert statuses["expired"] + statuses["complete"] == len(tables["sessions"])
+    if sharded:
+        assert len({row["worker"] for row in log}) > 1
@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_postgrest_server import FakePostgrestServer
+from benchmarks.fake_supabase import FakeSupabaseClient
+from benchmarks.synthetic import make_session_tables
+from services import supabase_client
+from services.database import DatabaseService
+from services.supabase_client import PooledPostgrestClient
+
+
+def test_pooled_client_reuses_connections_across_threads():
+    with FakePostgrestServer(FakeSupabaseClient(make_session_tables(20))) as url:
+        client = PooledPostgrestClient(url, headers={}, pool_size=2)
+        db = DatabaseService(client=client)
+
+        db.fetch_all("sessions")
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: db.fetch_filtered("sessions", [("eq", "status", "open")]), range(40)))
+
+        metrics = client.metrics.snapshot()
+        assert metrics["requests"] == 41
+        assert metrics["connections"] <= 2
+        assert metrics["reused"] == 41 - metrics["connections"]
+
+        assert client.check_health()
+        before = client.metrics.snapshot()["connections"]
+        client.reset()
+        db.fetch_all("sessions")
+        assert client.metrics.snapshot()["connections"] == before + 1
+
+
+def test_services_share_one_process_wide_client(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("SUPABASE_KEY", "test-key")
+    monkeypatch.setattr(supabase_client, "_shared_client", None)
+
+    assert DatabaseService().client is DatabaseService().client
+    assert DatabaseService().client.session.headers["apikey"] == "test-key"
+
+
+def test_connection_keeps_supabase_client_and_exposes_pooled_one(monkeypatch):
+    from supabase import Client
+
+    monkeypatch.setenv("SUPABASE_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("SUPABASE_KEY", "aaa.bbb.ccc")  # create_client exige forma de JWT
+    connection = supabase_client.SupabaseConnection()
+
+    assert isinstance(connection.get_client(), Client)
+    assert connection.get_client() is connection.get_client()
+    assert isinstance(connection.get_postgrest_client(), PooledPostgrestClient)
+
+
+def test_reset_while_other_threads_query():
+    with FakePostgrestServer(FakeSupabaseClient(make_session_tables(20))) as url:
+        client = PooledPostgrestClient(url, headers={}, pool_size=2)
+        db = DatabaseService(client=client)
+
+        def query(i):
+            if i % 10 == 0:
+                client.reset()
+            return len(db.fetch_filtered("sessions", [("eq", "status", "open")]).data)
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            counts = list(executor.map(query, range(60)))
+        assert len(set(counts)) == 1
@@ -0,0 +1,121 @@
+from typing import Iterable, List, Optional, Sequence
+
+from .helpers import generate_uuid, current_timestamp, canonical_timestamp
+from .validators import is_valid_uuid, ensure_positive_number
+from .crypto import sha256
+from .logger import log
+
+from models.adjudication import Participant, TraceStep
+from src.adjudicator.primitives import (
+    closing_seed_fragments,
+    hash_fragments_to_int,
+    join_order_keys,
+    keys_in_order,
+    sort_by_keys,
+)
+# El módulo, no sus nombres: registry importa utils.logger (import circular).
+from src.adjudicator import registry
+
+
+def build_base_seed(
+    session_id: str,
+    closing_timestamp: str,
+    participant_ids_concat: str,
+    public_seed: Optional[str] = None,
+) -> str:
+    """
+    Construye la semilla base a partir de:
+    - session_id
+    - closing_timestamp
+    - concatenación de IDs de participantes (en orden determinista)
+    - opcionalmente una semilla pública (drand, etc.)
+
+    Esto refleja fielmente tu memoria técnica:
+    HASH = SHA256( session_id + timestamp_cierre + ids_participantes_concatenados [+ public_seed] )
+    """
+    components = [session_id, closing_timestamp, participant_ids_concat]
+    if public_seed:
+        components.append(public_seed)
+    return "|".join(components)
+
+
+def normalize_seed_to_int(base_seed: str) -> int:
+    """
+    SHA-256 de la semilla base → entero (base 16).
+    """
+    digest = sha256(base_seed)
+    return int(digest, 16)
+
+
+def stream_seed_to_int(
+    session_id: str,
+    closing_timestamp: str,
+    participant_ids: Iterable[str],
+    public_seed: Optional[str] = None,
+) -> int:
+    """
+    Equivalente a normalize_seed_to_int(build_base_seed(...)), pero sin
+    construir nunca la semilla base completa en memoria.
+
+    Alimenta un hashlib.sha256 incremental con los mismos bytes que
+    produciría "|".join(componentes).encode("utf-8"), recorriendo los IDs
+    por bloques, y convierte el digest binario con int.from_bytes (idéntico
+    a int(hexdigest, 16)).
+
+    La semilla base en texto (para la traza/auditoría) se sigue obteniendo
+    con build_base_seed cuando hace falta.
+    """
+    return hash_fragments_to_int(
+        closing_seed_fragments(session_id, closing_timestamp, participant_ids, public_seed)
+    )
+
+
+def canonical_sort_keys(participants: Sequence[Participant]) -> List[tuple]:
+    """
+    Claves precalculadas del orden canónico (join_timestamp, ticket_number,
+    participant_id), sin formatear una cadena por participante.
+    """
+    return join_order_keys(participants)
+
+
+def sort_participants_deterministically(participants: List[Participant]) -> List[Participant]:
+    """
+    Orden determinista de participantes.
+
+    Siguiendo tu criterio:
+    - Primero por join_timestamp (si existe)
+    - Luego por ticket_number
+    - Luego por participant_id
+
+    Eso garantiza que, dado el mismo conjunto de participantes,
+    cualquier implementación ordenará igual.
+    """
+    return sort_by_keys(participants, join_order_keys(participants))
+
+
+def participants_in_canonical_order(participants: Sequence[Participant]) -> bool:
+    """
+    Comprueba en O(N), sin reordenar, si la lista ya viene en el orden canónico
+    (p. ej. ORDER BY join_timestamp, ticket_number, participant_id en base de datos).
+    """
+    return keys_in_order(join_order_keys(participants))
+
+
+def order_participants(participants: List[Participant], presorted: bool = False) -> List[Participant]:
+    """
+    Devuelve los participantes en orden canónico (versión 1.0-closing-seed
+    del algoritmo, la "1.0" del worker).
+
+    Con presorted=True el llamante garantiza que ya vienen ordenados y solo se
+    verifica en O(N). Si la verificación falla, se avisa y se ordena igualmente,
+    de modo que el ganador nunca depende de que el contrato se cumpla.
+    """
+    return registry.get_algorithm(registry.ALGORITHM_V1_CLOSING_SEED).order(participants, presorted=presorted)
+
+
+def create_trace_step(step: int, description: str, value: str) -> TraceStep:
+    """
+    Crea un paso de traza legible y estructurado.
+    """
+    return TraceStep(step=step, description=description, value=value)
+
@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Optional, Union
 import uuid
 
 def generate_uuid() -> str:
@@ -12,3 +13,17 @@ def current_timestamp() -> str:
     ISO formatted timestamp.
     """
     return datetime.utcnow().isoformat()
+
+def canonical_timestamp(value: Union[str, datetime, None]) -> Optional[str]:
+    """
+    Timestamp in one fixed format: ISO 8601 in UTC with a +00:00 offset
+    (what PostgREST returns for timestamptz columns). Accepts datetimes, as
+    psycopg returns them, and ISO strings; naive values are taken as UTC.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
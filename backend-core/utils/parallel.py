@@ -0,0 +1,76 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, TypeVar
+import os
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Por debajo de este número de elementos, el coste de arrancar procesos y
+# serializar entradas supera al de procesarlos en el propio proceso.
+PARALLEL_BATCH_THRESHOLD = 32
+
+# Elementos enviados a cada proceso en una sola tarea (reduce el coste de IPC
+# cuando cada elemento es pequeño).
+DEFAULT_CHUNK_SIZE = 8
+
+
+def map_chunks(
+    worker: Callable[[List[T]], List[R]],
+    items: Iterable[T],
+    max_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    parallel_threshold: int = PARALLEL_BATCH_THRESHOLD,
+) -> Iterator[R]:
+    """
+    Aplica worker (lista de elementos → lista de resultados, uno por elemento)
+    sobre items y devuelve los resultados en streaming y en el orden de entrada.
+
+    - Con menos de parallel_threshold elementos, o un solo worker disponible,
+      se procesa en el propio proceso, elemento a elemento.
+    - Si no, se reparte en bloques de chunk_size sobre un pool de procesos
+      (max_workers, por defecto os.cpu_count()), con como mucho
+      2 * max_workers bloques en vuelo: la memoria no crece con el lote.
+
+    worker tiene que ser serializable con pickle (función de módulo o
+    functools.partial de una). Si un bloque falla, la excepción se propaga
+    en su posición, tras haber entregado los resultados anteriores.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size debe ser mayor que cero.")
+
+    workers = max_workers or os.cpu_count() or 1
+    iterator = iter(items)
+
+    # Mirar por adelantado solo lo necesario para decidir la estrategia.
+    head: List[T] = []
+    for item in iterator:
+        head.append(item)
+        if len(head) >= parallel_threshold:
+            break
+
+    if len(head) < parallel_threshold or workers <= 1:
+        for item in chain(head, iterator):
+            yield from worker([item])
+        return
+
+    def chunks() -> Iterator[List[T]]:
+        pending: List[T] = []
+        for item in chain(head, iterator):
+            pending.append(item)
+            if len(pending) >= chunk_size:
+                yield pending
+                pending = []
+        if pending:
+            yield pending
+
+    max_in_flight = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight: Deque = deque()
+        for chunk in chunks():
+            in_flight.append(executor.submit(worker, chunk))
+            if len(in_flight) >= max_in_flight:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
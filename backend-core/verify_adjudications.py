@@ -0,0 +1,144 @@
+"""
+Auditoría nocturna: verifica en paralelo todas las adjudicaciones de una
+exportación JSONL.
+
+Cada línea del fichero es un objeto con los datos de entrada y el resultado
+almacenado de una adjudicación:
+
+    {"input": {...AdjudicationInput...}, "result": {...AdjudicationResult...}, "engine": "api" | "worker"}
+
+Para cada línea se recalculan solo numeric_seed, winner_index, ganador y
+result_hash (sin traza), con la versión del algoritmo que declara el
+resultado. El parseo JSON y la verificación se hacen en los procesos del
+pool.
+
+El motor que produjo la adjudicación decide con qué modelos se lee la línea
+y qué significa la versión "1.0" (1.0-public-seed en la API, 1.0-closing-seed
+en el worker; ver registry.py). Lo indica el campo "engine" de la línea o,
+si no lo lleva, --source (por defecto, worker).
+
+Uso (desde backend-core/):
+
+    python verify_adjudications.py adjudicaciones_2025-01-01.jsonl [--workers 8]
+    python verify_adjudications.py exportacion_api.jsonl --source api
+
+Termina con código 1 si alguna adjudicación no verifica.
+"""
+
+import argparse
+import json
+import sys
+from functools import partial
+from typing import Iterator, List, Optional, Tuple
+
+from models import adjudication as worker_models
+from src.adjudicator import models as api_models
+from src.adjudicator.registry import API_ALIASES, WORKER_ALIASES, verify_result
+from utils.parallel import PARALLEL_BATCH_THRESHOLD, map_chunks
+
+# Las verificaciones son baratas: bloques más grandes amortizan mejor el IPC.
+VERIFY_CHUNK_SIZE = 64
+
+SOURCE_API = "api"
+SOURCE_WORKER = "worker"
+
+# Motor de origen → (modelo de entrada, modelo de resultado, alias de versión).
+RECORD_MODELS = {
+    SOURCE_API: (api_models.AdjudicationInput, api_models.AdjudicationResult, API_ALIASES),
+    SOURCE_WORKER: (worker_models.AdjudicationInput, worker_models.AdjudicationResult, WORKER_ALIASES),
+}
+
+
+def _verify_lines(
+    chunk: List[Tuple[int, str]], presorted: bool = False, source: str = SOURCE_WORKER
+) -> List[Tuple[int, Optional[str], bool, str]]:
+    """
+    Verifica un bloque de líneas (nº de línea, texto) → (nº de línea, session_id, ok, error).
+    source es el motor de las líneas que no llevan campo "engine".
+    """
+    outcomes = []
+    for line_number, line in chunk:
+        session_id = None
+        try:
+            record = json.loads(line)
+            engine = record.get("engine", source)
+            if engine not in RECORD_MODELS:
+                raise ValueError(f"Motor de origen desconocido: {engine!r} (usa uno de {sorted(RECORD_MODELS)}).")
+            input_model, result_model, aliases = RECORD_MODELS[engine]
+            input_data = input_model.model_validate(record["input"])
+            result = result_model.model_validate(record["result"])
+            session_id = result.session_id
+            outcomes.append((line_number, session_id, verify_result(input_data, result, presorted, aliases), ""))
+        except Exception as e:
+            outcomes.append((line_number, session_id, False, f"{type(e).__name__}: {e}"))
+    return outcomes
+
+
+def _read_lines(path: str) -> Iterator[Tuple[int, str]]:
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if line.strip():
+                yield line_number, line
+
+
+def verify_export(
+    path: str,
+    max_workers: Optional[int] = None,
+    chunk_size: int = VERIFY_CHUNK_SIZE,
+    presorted: bool = False,
+    source: str = SOURCE_WORKER,
+) -> dict:
+    """
+    Verifica todas las adjudicaciones de una exportación JSONL. source es el
+    motor de origen de las líneas sin campo "engine" ("api" o "worker").
+
+    Devuelve un resumen con el total, las verificadas y, para cada fallo,
+    la línea, la sesión y el motivo (vacío si simplemente no coincide).
+    """
+    total = 0
+    verified = 0
+    failures = []
+
+    if source not in RECORD_MODELS:
+        raise ValueError(f"Motor de origen desconocido: {source!r} (usa uno de {sorted(RECORD_MODELS)}).")
+    worker = partial(_verify_lines, presorted=presorted, source=source)
+    for line_number, session_id, ok, error in map_chunks(
+        worker, _read_lines(path), max_workers, chunk_size, PARALLEL_BATCH_THRESHOLD
+    ):
+        total += 1
+        if ok:
+            verified += 1
+        else:
+            failures.append({"line": line_number, "session_id": session_id, "error": error})
+
+    return {"total": total, "verified": verified, "failed": failures}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="exportación JSONL de adjudicaciones")
+    parser.add_argument("--workers", type=int, default=None, help="procesos del pool (por defecto: CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=VERIFY_CHUNK_SIZE)
+    parser.add_argument(
+        "--presorted",
+        action="store_true",
+        help="los participantes de la exportación ya están en orden canónico",
+    )
+    parser.add_argument(
+        "--source",
+        choices=sorted(RECORD_MODELS),
+        default=SOURCE_WORKER,
+        help='motor que produjo las líneas sin campo "engine" (por defecto: worker)',
+    )
+    args = parser.parse_args()
+
+    summary = verify_export(args.path, args.workers, args.chunk_size, args.presorted, args.source)
+    print(f"[AUDIT] {summary['verified']}/{summary['total']} adjudicaciones verificadas")
+    for failure in summary["failed"]:
+        print(f"[AUDIT] FALLO línea {failure['line']} sesión {failure['session_id']}: {failure['error'] or 'no coincide'}")
+
+    sys.exit(1 if summary["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()